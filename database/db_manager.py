@@ -1,10 +1,15 @@
 import os
 import sys
 import sqlite3
+import json
+import time
+import queue
 import shutil
 import logging
+import threading
+from concurrent.futures import Future
 from datetime import datetime
-from typing import List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -30,15 +35,175 @@ else:
     # При разработке база находится в папке /database/ рядом с db_manager.py
     DB_PATH = os.path.join(get_project_root(), "mtadmin.sqlite")
 
+# Время жизни кэша аппаратных данных хоста (сутки)
+HOST_FACTS_TTL: int = 24 * 60 * 60
+# Время жизни кэша определённой ОС хоста (неделя)
+OS_CACHE_TTL: int = 7 * 24 * 60 * 60
+# Допустимое расхождение времени загрузки хоста (секунды), при котором кэш считается актуальным
+BOOT_TIME_TOLERANCE: int = 60
+
+# Доступен ли полнотекстовый индекс connections_fts (SQLite может быть собран без FTS5)
+FTS_ENABLED: bool = False
+# Число совпадений, начиная с которого поиск выполняется обходом индекса сортировки
+SEARCH_SCAN_THRESHOLD: int = 2000
+
+# События изменения записей таблицы connections
+CONNECTION_INSERTED: str = "insert"
+CONNECTION_UPDATED: str = "update"
+CONNECTION_DELETED: str = "delete"
+
+ConnectionListener = Callable[[str, str, Optional[Tuple[str, str, str, str]]], None]
+_listeners: List[ConnectionListener] = []
+
+
+class ConnectionManager:
+    """
+    Общий для приложения менеджер соединений с SQLite.
+
+    - База работает в режиме WAL с synchronous=NORMAL: чтение не блокируется записью.
+    - Каждый поток читает через собственное долгоживущее соединение (кэш
+      подготовленных выражений sqlite3 сохраняется между вызовами).
+    - Все изменения выполняет единственный поток записи, поэтому GUI и фоновые
+      сборщики данных не получают «database is locked».
+    """
+
+    CACHED_STATEMENTS: int = 256
+    BUSY_TIMEOUT_MS: int = 5000
+    # Результат служебной операции записи, по которому поток записи закрывает своё соединение
+    _CLOSE_WRITER = object()
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._write_queue: "queue.Queue[Tuple[Callable[[sqlite3.Connection], Any], Future]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Все открытые соединения чтения (из любых потоков) – для закрытия при reset()
+        self._readers: List[sqlite3.Connection] = []
+        # Поколение соединений: увеличивается при reset(), устаревшие соединения переоткрываются
+        self._generation: int = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Открывает соединение с настройками WAL и кэшем подготовленных выражений."""
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=self.CACHED_STATEMENTS)
+        conn.execute(f"PRAGMA busy_timeout = {self.BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def reader(self) -> sqlite3.Connection:
+        """
+        Возвращает соединение для чтения, принадлежащее текущему потоку.
+
+        :return: Экземпляр sqlite3.Connection.
+        """
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is None or local.generation != self._generation or local.path != DB_PATH:
+            if conn is not None:
+                self._close_reader(conn)
+            conn = self._connect()
+            with self._lock:
+                self._readers.append(conn)
+            local.conn, local.generation, local.path = conn, self._generation, DB_PATH
+        return conn
+
+    def _close_reader(self, conn: sqlite3.Connection) -> None:
+        """Закрывает соединение чтения и убирает его из списка открытых."""
+        with self._lock:
+            if conn in self._readers:
+                self._readers.remove(conn)
+        conn.close()
+
+    def read(self, sql: str, params: tuple = (), one: bool = False) -> Any:
+        """
+        Выполняет запрос на чтение.
+
+        :param sql: SQL-запрос.
+        :param params: Параметры запроса.
+        :param one: Вернуть только первую строку.
+        :return: Строка (или None) при one=True, иначе список строк.
+        """
+        cursor = self.reader().execute(sql, params)
+        return cursor.fetchone() if one else cursor.fetchall()
+
+    def write(self, func: Callable[[sqlite3.Connection], Any], wait: bool = True) -> Any:
+        """
+        Передаёт изменение в поток записи. Функция выполняется внутри транзакции,
+        которая фиксируется после её успешного завершения.
+
+        :param func: Функция, принимающая соединение записи.
+        :param wait: Дождаться выполнения и вернуть результат (иначе вернуть Future).
+        :return: Результат func или Future.
+        :raises sqlite3.Error: Ошибка выполнения (при wait=True).
+        """
+        future: Future = Future()
+        with self._lock:
+            self._write_queue.put((func, future))
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._writer_loop, name="DBWriter", daemon=True)
+                self._writer.start()
+        return future.result() if wait else future
+
+    def execute(self, sql: str, params: tuple = ()) -> int:
+        """
+        Выполняет одиночный запрос на изменение через поток записи.
+
+        :return: Количество изменённых строк.
+        """
+        return self.write(lambda conn: conn.execute(sql, params).rowcount)
+
+    def reset(self) -> None:
+        """
+        Закрывает соединения (например, перед заменой файла базы при импорте).
+        Соединения будут открыты заново при следующем обращении.
+        """
+        self.write(lambda conn: self._CLOSE_WRITER)
+        with self._lock:
+            self._generation += 1
+            readers, self._readers = self._readers, []
+        # Соединения других потоков тоже закрываются: они переоткроются по смене поколения
+        for conn in readers:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.debug(f"Ошибка закрытия соединения с БД: {e}")
+        self._local.conn = None
+
+    def _writer_loop(self) -> None:
+        """Поток записи: выполняет изменения по очереди в одном соединении."""
+        conn: Optional[sqlite3.Connection] = None
+        generation, path = -1, None
+        while True:
+            func, future = self._write_queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if conn is None or generation != self._generation or path != DB_PATH:
+                    if conn is not None:
+                        conn.close()
+                    conn = self._connect()
+                    generation, path = self._generation, DB_PATH
+                with conn:
+                    result = func(conn)
+                if result is self._CLOSE_WRITER:
+                    conn.close()
+                    conn = None
+                future.set_result(result)
+            except Exception as e:
+                future.set_exception(e)
+
+
+# Общий менеджер соединений модуля
+_db = ConnectionManager()
+
 
 def init_db() -> None:
     """
     Инициализирует базу данных.
     Если база или таблица не существует, она будет создана.
     """
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
+    def create_tables(conn: sqlite3.Connection) -> None:
+        conn.execute('''
             CREATE TABLE IF NOT EXISTS connections (
                 ip TEXT PRIMARY KEY,
                 os TEXT,
@@ -46,7 +211,112 @@ def init_db() -> None:
                 rm TEXT
             )
         ''')
-        conn.commit()
+        # Индексы под сортировку таблиц подключений и поиск по префиксу даты
+        # (префиксный поиск по ip использует индекс первичного ключа)
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_connections_order
+            ON connections (COALESCE(last_connection, ''), ip)
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_connections_last_connection
+            ON connections (last_connection)
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS os_fingerprints (
+                ip TEXT PRIMARY KEY,
+                os TEXT,
+                detected_at REAL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS host_facts (
+                host TEXT PRIMARY KEY,
+                facts TEXT,
+                boot_time REAL,
+                updated_at REAL
+            )
+        ''')
+        return create_fts(conn)
+
+    def create_fts(conn: sqlite3.Connection) -> bool:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'connections_fts'"
+        ).fetchone() is not None
+        try:
+            conn.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS connections_fts
+                USING fts5(rm, ip, os, content='connections', content_rowid='rowid')
+            ''')
+            # Индекс из импортированной базы мог быть создан SQLite с FTS5, а текущий собран без него
+            conn.execute("SELECT rowid FROM connections_fts LIMIT 0")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 недоступен, поиск по подключениям будет без индекса: {e}")
+            # Триггеры индекса (например, из импортированной базы) сломали бы запись в connections
+            for trigger in ("connections_fts_ai", "connections_fts_ad", "connections_fts_au"):
+                conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            return False
+        # Триггеры синхронизируют индекс с таблицей connections
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS connections_fts_ai AFTER INSERT ON connections BEGIN
+                INSERT INTO connections_fts (rowid, rm, ip, os)
+                VALUES (new.rowid, new.rm, new.ip, new.os);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS connections_fts_ad AFTER DELETE ON connections BEGIN
+                INSERT INTO connections_fts (connections_fts, rowid, rm, ip, os)
+                VALUES ('delete', old.rowid, old.rm, old.ip, old.os);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS connections_fts_au AFTER UPDATE OF rm, ip, os ON connections BEGIN
+                INSERT INTO connections_fts (connections_fts, rowid, rm, ip, os)
+                VALUES ('delete', old.rowid, old.rm, old.ip, old.os);
+                INSERT INTO connections_fts (rowid, rm, ip, os)
+                VALUES (new.rowid, new.rm, new.ip, new.os);
+            END
+        ''')
+        if not exists:
+            # Индекс создан для уже заполненной базы – строим его по существующим записям
+            conn.execute("INSERT INTO connections_fts (connections_fts) VALUES ('rebuild')")
+        return True
+
+    global FTS_ENABLED
+    FTS_ENABLED = _db.write(create_tables)
+
+
+def subscribe(listener: ConnectionListener) -> None:
+    """
+    Подписывает обработчик на изменения записей connections.
+    Обработчик вызывается после фиксации изменения в потоке, который его выполнил,
+    с аргументами (событие, ip, запись (rm, ip, os, last_connection) или None при удалении).
+
+    :param listener: Функция-обработчик.
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def unsubscribe(listener: ConnectionListener) -> None:
+    """Отписывает обработчик изменений записей connections."""
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _publish(action: str, ip: str, row: Optional[Tuple[str, str, str, str]]) -> None:
+    """Передаёт событие изменения записи всем подписчикам."""
+    for listener in list(_listeners):
+        try:
+            listener(action, ip, row)
+        except Exception as e:
+            logger.error(f"Ошибка обработчика изменения записи {ip}: {e}")
+
+
+def _select_connection(conn: sqlite3.Connection, ip: str) -> Optional[Tuple[str, str, str, str]]:
+    """Возвращает запись (rm, ip, os, last_connection) внутри транзакции записи."""
+    return conn.execute('''
+        SELECT rm, ip, os, last_connection FROM connections WHERE ip = ?
+    ''', (ip,)).fetchone()
 
 
 def add_connection(ip: str, os_name: str, last_connection: datetime) -> None:
@@ -57,17 +327,43 @@ def add_connection(ip: str, os_name: str, last_connection: datetime) -> None:
     :param os_name: Имя операционной системы.
     :param last_connection: Время последнего подключения.
     """
+    def upsert(conn: sqlite3.Connection) -> Tuple[bool, Optional[Tuple[str, str, str, str]]]:
+        existed = _select_connection(conn, ip) is not None
+        conn.execute('''
+            INSERT INTO connections (ip, os, last_connection, rm)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(ip) DO UPDATE SET last_connection = excluded.last_connection
+        ''', (ip, os_name, last_connection.isoformat(), None))
+        return existed, _select_connection(conn, ip)
+
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO connections (ip, os, last_connection, rm)
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT(ip) DO UPDATE SET last_connection = excluded.last_connection
-            ''', (ip, os_name, last_connection.isoformat(), None))
-            conn.commit()
+        existed, row = _db.write(upsert)
     except sqlite3.IntegrityError as e:
         logger.error(f"IntegrityError при добавлении подключения для {ip}: {e}")
+        return
+    _publish(CONNECTION_UPDATED if existed else CONNECTION_INSERTED, ip, row)
+
+
+def add_discovered_host(ip: str, os_name: Optional[str]) -> bool:
+    """
+    Добавляет хост, найденный при сканировании сети, если его ещё нет в базе.
+    Время последнего подключения не заполняется: к хосту ещё не подключались.
+
+    :param ip: IP-адрес хоста.
+    :param os_name: Предполагаемая операционная система (или None).
+    :return: True, если запись добавлена, False – если хост уже был в базе.
+    """
+    try:
+        added = _db.execute('''
+            INSERT OR IGNORE INTO connections (ip, os, last_connection, rm)
+            VALUES (?, ?, NULL, NULL)
+        ''', (ip, os_name)) == 1
+    except sqlite3.Error as e:
+        logger.error(f"Ошибка добавления найденного хоста {ip}: {e}")
+        return False
+    if added:
+        _publish(CONNECTION_INSERTED, ip, (None, ip, os_name, None))
+    return added
 
 
 def get_all_connections() -> List[Tuple[str, str, str, str]]:
@@ -76,15 +372,99 @@ def get_all_connections() -> List[Tuple[str, str, str, str]]:
 
     :return: Список кортежей (rm, ip, os, last_connection)
     """
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT rm, ip, os, last_connection
-            FROM connections
-            ORDER BY last_connection DESC
-        ''')
-        rows = cursor.fetchall()
-    return rows
+    return _db.read('''
+        SELECT rm, ip, os, last_connection
+        FROM connections
+        ORDER BY last_connection DESC
+    ''')
+
+
+def connection_sort_key(row: Tuple[str, str, str, str]) -> Tuple[str, str]:
+    """
+    Ключ сортировки записи, совпадающий с порядком get_connections_page()
+    (записи упорядочены по убыванию ключа).
+
+    :param row: Кортеж (rm, ip, os, last_connection).
+    :return: Кортеж (last_connection или "", ip).
+    """
+    return row[3] or "", row[1]
+
+
+def _search_condition(search: str) -> Tuple[str, tuple]:
+    """
+    Строит условие поиска подключений: по словам РМ, IP и ОС (полнотекстовый индекс,
+    совпадение с началом слова), а также по началу IP-адреса и даты подключения.
+
+    :param search: Текст из поля поиска.
+    :return: Кортеж (SQL-условие, параметры).
+    """
+    upper = search + "\uffff"
+    conditions = ["(ip >= ? AND ip < ?)", "(last_connection >= ? AND last_connection < ?)"]
+    params: List[Any] = [search, upper, search, upper]
+    if not FTS_ENABLED:
+        pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        conditions.append("(rm LIKE ? ESCAPE '\\' OR ip LIKE ? ESCAPE '\\' OR os LIKE ? ESCAPE '\\')")
+        params += [pattern] * 3
+    elif any(ch.isalnum() for ch in search):
+        # Текст в кавычках – фраза из слов запроса, «*» – последнее слово может быть неполным
+        conditions.append("rowid IN (SELECT rowid FROM connections_fts WHERE connections_fts MATCH ?)")
+        params.append('"' + search.replace('"', '""') + '"*')
+    return "(" + " OR ".join(conditions) + ")", tuple(params)
+
+
+def get_connections_page(after: Optional[Tuple[str, str]] = None, limit: int = 200,
+                         search: str = "") -> List[Tuple[str, str, str, str]]:
+    """
+    Возвращает очередную страницу записей в порядке от последних подключений.
+    Используется постраничная выборка по ключу (а не OFFSET): добавление записей
+    между запросами не приводит к пропускам и повторам строк.
+
+    :param after: Ключ последней полученной записи (connection_sort_key) или None для первой страницы.
+    :param limit: Максимальное количество записей на странице.
+    :param search: Текст поиска (пустая строка – без фильтра).
+    :return: Список кортежей (rm, ip, os, last_connection)
+    """
+    conditions: List[str] = []
+    params: tuple = ()
+    indexed_by = ""
+    if after is not None:
+        conditions.append("(COALESCE(last_connection, ''), ip) < (?, ?)")
+        params += (after[0], after[1])
+    search = search.strip()
+    if search:
+        condition, search_params = _search_condition(search)
+        conditions.append(condition)
+        params += search_params
+        # Редкие совпадения выбираются по индексам поиска и сортируются, а при частых
+        # (например, одна цифра) быстрее идти по индексу сортировки до заполнения страницы
+        matches = _db.read(
+            f"SELECT count(*) FROM (SELECT 1 FROM connections WHERE {condition} LIMIT ?)",
+            search_params + (SEARCH_SCAN_THRESHOLD,), one=True
+        )[0]
+        if matches >= SEARCH_SCAN_THRESHOLD:
+            indexed_by = "INDEXED BY idx_connections_order"
+    where = "WHERE " + " AND ".join(conditions) if conditions else ""
+    return _db.read(f'''
+        SELECT rm, ip, os, last_connection
+        FROM connections {indexed_by}
+        {where}
+        ORDER BY COALESCE(last_connection, '') DESC, ip DESC
+        LIMIT ?
+    ''', params + (limit,))
+
+
+def connection_matches(ip: str, search: str) -> bool:
+    """
+    Проверяет, попадает ли запись с указанным IP-адресом под условие поиска.
+
+    :param ip: IP-адрес записи.
+    :param search: Текст поиска (пустая строка – любая существующая запись).
+    :return: True, если запись существует и удовлетворяет поиску.
+    """
+    condition, params = _search_condition(search.strip()) if search.strip() else ("1", ())
+    return _db.read(
+        f"SELECT 1 FROM connections WHERE ip = ? AND {condition}", (ip,) + params, one=True
+    ) is not None
 
 
 def update_rm(ip: str, new_rm: str) -> None:
@@ -94,14 +474,17 @@ def update_rm(ip: str, new_rm: str) -> None:
     :param ip: IP-адрес записи.
     :param new_rm: Новое значение для поля rm.
     """
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
+    def update(conn: sqlite3.Connection) -> Optional[Tuple[str, str, str, str]]:
+        conn.execute('''
             UPDATE connections
             SET rm = ?
             WHERE ip = ?
         ''', (new_rm, ip))
-        conn.commit()
+        return _select_connection(conn, ip)
+
+    row = _db.write(update)
+    if row is not None:
+        _publish(CONNECTION_UPDATED, ip, row)
 
 
 def delete_rm(ip: str) -> None:
@@ -110,23 +493,136 @@ def delete_rm(ip: str) -> None:
 
     :param ip: IP-адрес для удаления.
     """
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            DELETE FROM connections WHERE ip = ?
-        ''', (ip,))
-        conn.commit()
+    if _db.execute('''
+        DELETE FROM connections WHERE ip = ?
+    ''', (ip,)):
+        _publish(CONNECTION_DELETED, ip, None)
+
+
+def get_cached_os(ip: str, ttl: int = OS_CACHE_TTL) -> Optional[str]:
+    """
+    Возвращает ранее определённую ОС хоста, если запись не старше ttl.
+
+    :param ip: IP-адрес хоста.
+    :param ttl: Время жизни записи в секундах.
+    :return: Название ОС или None.
+    """
+    try:
+        row = _db.read('''
+            SELECT os FROM os_fingerprints
+            WHERE ip = ? AND detected_at >= ?
+        ''', (ip, time.time() - ttl), one=True)
+    except sqlite3.Error as e:
+        logger.error(f"Ошибка чтения кэша ОС для {ip}: {e}")
+        return None
+    return row[0] if row else None
+
+
+def save_os_fingerprint(ip: str, os_name: str) -> None:
+    """
+    Сохраняет определённую ОС хоста в кэш.
+
+    :param ip: IP-адрес хоста.
+    :param os_name: Название ОС.
+    """
+    try:
+        _db.execute('''
+            INSERT INTO os_fingerprints (ip, os, detected_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(ip) DO UPDATE SET
+                os = excluded.os,
+                detected_at = excluded.detected_at
+        ''', (ip, os_name, time.time()))
+    except sqlite3.Error as e:
+        logger.error(f"Ошибка сохранения кэша ОС для {ip}: {e}")
+
+
+def get_host_facts(host: str, boot_time: Optional[float] = None,
+                   ttl: int = HOST_FACTS_TTL) -> Optional[Dict[str, Any]]:
+    """
+    Возвращает сохранённые неизменяемые данные хоста (модель CPU, материнской платы,
+    количество ядер, MAC-адрес), если кэш актуален.
+    Кэш считается устаревшим, если истёк TTL или хост был перезагружен.
+
+    :param host: IP-адрес или имя хоста.
+    :param boot_time: Текущее время загрузки хоста (Unix-время) или None, если неизвестно.
+    :param ttl: Время жизни кэша в секундах.
+    :return: Словарь с данными или None, если кэш отсутствует или устарел.
+    """
+    try:
+        row = _db.read('''
+            SELECT facts, boot_time, updated_at
+            FROM host_facts
+            WHERE host = ?
+        ''', (host,), one=True)
+    except sqlite3.Error as e:
+        logger.error(f"Ошибка чтения кэша данных хоста {host}: {e}")
+        return None
+
+    if row is None:
+        return None
+    facts, cached_boot_time, updated_at = row
+    if time.time() - (updated_at or 0) > ttl:
+        return None
+    if boot_time is not None and cached_boot_time is not None \
+            and abs(boot_time - cached_boot_time) > BOOT_TIME_TOLERANCE:
+        return None
+    try:
+        return json.loads(facts)
+    except (TypeError, ValueError):
+        return None
+
+
+def save_host_facts(host: str, facts: Dict[str, Any], boot_time: Optional[float]) -> None:
+    """
+    Сохраняет неизменяемые данные хоста в кэш.
+
+    :param host: IP-адрес или имя хоста.
+    :param facts: Словарь с данными.
+    :param boot_time: Время загрузки хоста (Unix-время), с которым связаны данные.
+    """
+    try:
+        _db.execute('''
+            INSERT INTO host_facts (host, facts, boot_time, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(host) DO UPDATE SET
+                facts = excluded.facts,
+                boot_time = excluded.boot_time,
+                updated_at = excluded.updated_at
+        ''', (host, json.dumps(facts, ensure_ascii=False), boot_time, time.time()))
+    except sqlite3.Error as e:
+        logger.error(f"Ошибка сохранения кэша данных хоста {host}: {e}")
+
+
+def delete_host_facts(host: str) -> None:
+    """
+    Удаляет кэш неизменяемых данных хоста (например, после получения root-доступа).
+
+    :param host: IP-адрес или имя хоста.
+    """
+    try:
+        _db.execute('''
+            DELETE FROM host_facts WHERE host = ?
+        ''', (host,))
+    except sqlite3.Error as e:
+        logger.error(f"Ошибка удаления кэша данных хоста {host}: {e}")
 
 
 def export_db(export_path: str) -> bool:
     """
-    Экспортирует базу данных, копируя файл базы данных по указанному пути.
+    Экспортирует базу данных по указанному пути.
+    Используется онлайн-резервное копирование SQLite: в копию попадают и данные,
+    ещё не перенесённые из WAL-журнала в основной файл.
 
     :param export_path: Путь для сохранения копии базы данных.
     :return: True, если экспорт прошёл успешно, иначе False.
     """
     try:
-        shutil.copyfile(DB_PATH, export_path)
+        with sqlite3.connect(export_path) as target:
+            _db.reader().backup(target)
+            # Копия должна быть самодостаточным файлом без WAL-журнала
+            target.execute("PRAGMA journal_mode = DELETE")
+        target.close()
         logger.info(f"База данных экспортирована в {export_path}")
         return True
     except Exception as e:
@@ -143,8 +639,17 @@ def import_db(import_path: str) -> bool:
     :return: True, если импорт прошёл успешно, иначе False.
     """
     try:
+        # Закрываем соединения и удаляем WAL-файлы текущей базы перед заменой файла
+        _db.reset()
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(DB_PATH + suffix):
+                os.remove(DB_PATH + suffix)
         shutil.copyfile(import_path, DB_PATH)
-        logger.info(f"База данных импортирована из {import_path}")
+        # Импортированная база может быть без connections_fts или новых таблиц:
+        # создаём недостающее и заново определяем доступность полнотекстового поиска
+        init_db()
+        logger.info(f"База данных импортирована из {import_path} (полнотекстовый поиск: "
+                    f"{'включён' if FTS_ENABLED else 'недоступен'})")
         return True
     except Exception as e:
         logger.error(f"Ошибка импорта базы данных: {e}")
@@ -0,0 +1,113 @@
+import logging
+from typing import Callable, Optional
+
+from PySide6.QtCore import QPoint, QRect, QTimer
+from PySide6.QtWidgets import QLabel, QPushButton, QScrollArea, QVBoxLayout, QFrame, QWidget
+
+from notifications import Notification
+
+logger = logging.getLogger(__name__)
+
+
+class LazyBlock(QWidget):
+    """
+    Заглушка блока вкладки хоста. Настоящий блок (и его запросы к хосту)
+    создаётся, когда заглушка впервые попадает в видимую область QScrollArea
+    или пользователь нажимает «Загрузить». До этого блок не создаётся
+    и не отправляет на хост ни одного запроса.
+    """
+
+    # Высота заглушки: все заглушки не должны помещаться в видимую область сразу
+    PLACEHOLDER_HEIGHT: int = 140
+
+    def __init__(self, name: str, title: str, factory: Callable[[], QWidget],
+                 scroll_area: QScrollArea, parent: Optional[QWidget] = None) -> None:
+        """
+        :param name: Идентификатор блока (имя класса) – для журнала.
+        :param title: Название блока для заглушки.
+        :param factory: Функция, создающая блок.
+        :param scroll_area: Область прокрутки вкладки, в которой размещается блок.
+        :param parent: Родительский виджет.
+        """
+        super().__init__(parent)
+        self.name: str = name
+        self.factory = factory
+        self.scroll_area: QScrollArea = scroll_area
+        self.block: Optional[QWidget] = None
+        # После ошибки создания блок не пересоздаётся при прокрутке – только кнопкой
+        self.failed: bool = False
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.placeholder = QFrame()
+        self.placeholder.setObjectName("groupBox")  # Стилизация из styles.py
+        self.placeholder.setMinimumHeight(self.PLACEHOLDER_HEIGHT)
+        placeholder_layout = QVBoxLayout(self.placeholder)
+        self.placeholder_label = QLabel(f"⏳ {title}")
+        self.placeholder_label.setWordWrap(True)
+        load_button = QPushButton("▶ Загрузить")
+        load_button.setToolTip("Загрузить блок, не дожидаясь прокрутки до него")
+        load_button.clicked.connect(self.build)
+        placeholder_layout.addWidget(self.placeholder_label)
+        placeholder_layout.addWidget(load_button)
+        placeholder_layout.addStretch()
+        layout.addWidget(self.placeholder)
+
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.check_visible)
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        # Геометрия окончательно рассчитывается после показа
+        QTimer.singleShot(0, self.check_visible)
+
+    def moveEvent(self, event) -> None:
+        # Блок выше по вкладке изменил размер – заглушка могла попасть в видимую область
+        super().moveEvent(event)
+        self.check_visible()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self.check_visible()
+
+    def check_visible(self) -> None:
+        """Создаёт блок, если заглушка видна в области прокрутки."""
+        if self.block is not None or self.failed or not self.isVisible():
+            return
+        viewport = self.scroll_area.viewport()
+        if not viewport.isAncestorOf(self):
+            return
+        rect = QRect(self.mapTo(viewport, QPoint(0, 0)), self.size())
+        if rect.intersects(viewport.rect()):
+            self.build()
+
+    def build(self) -> None:
+        """Создаёт блок вместо заглушки (повторный вызов ничего не делает)."""
+        if self.block is not None:
+            return
+        try:
+            block = self.factory()
+        except Exception as e:
+            logger.exception(f"Ошибка в {self.name}: {e}")
+            self.failed = True
+            self.placeholder_label.setText(f"❌ Ошибка в {self.name}: {e}")
+            Notification(
+                "❌ Ошибка блока",
+                f"Ошибка в {self.name}: {e}",
+                "error",
+                duration=3000,
+                parent=self.window()
+            ).show_notification()
+            return
+
+        logger.debug(f"Блок {self.name} создан при первом показе")
+        self.block = block
+        self.scroll_area.verticalScrollBar().valueChanged.disconnect(self.check_visible)
+        self.layout().removeWidget(self.placeholder)
+        self.placeholder.deleteLater()
+        self.layout().addWidget(block)
+
+    def close_session(self) -> None:
+        """Останавливает фоновые операции созданного блока (если блок был создан)."""
+        if self.block is not None and hasattr(self.block, "close_session"):
+            self.block.close_session()
@@ -138,7 +138,7 @@ class AuthDialog(QDialog):
 
     def authenticate(self) -> None:
         """
-        Пытается установить SSH-сессию через SessionManager.
+        Пытается установить SSH-сессию через пул соединений SessionManager.
         Если аутентификация проходит успешно, данные кэшируются (если выбрано сохранение) и окно закрывается.
         В случае ошибки выводится соответствующее сообщение.
         """
@@ -153,7 +153,9 @@ class AuthDialog(QDialog):
             return
 
         try:
-            self.session_manager = SessionManager.get_instance(
+            # Сессия берётся из общего пула: если другая вкладка уже подключена
+            # к этому хосту под тем же пользователем, используется её соединение.
+            self.session_manager = SessionManager.acquire(
                 self.hostname, username, password, root_username, root_password
             )
             self.session_manager.connect()
@@ -165,6 +167,9 @@ class AuthDialog(QDialog):
             self.accept()  # Аутентификация успешна – закрываем диалог
         except Exception as e:
             logger.error(f"Ошибка аутентификации: {e}")
+            if self.session_manager:
+                self.session_manager.close_session()
+                self.session_manager = None
             QMessageBox.critical(self, "Ошибка", f"Не удалось подключиться:\n{e}")
 
     def get_credentials(self) -> tuple[str, str]:
@@ -1,10 +1,11 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QApplication, QScrollArea,
-    QMessageBox, QSpacerItem, QSizePolicy, QDialog, QFrame
+    QSpacerItem, QSizePolicy, QDialog, QFrame
 )
 from PySide6.QtCore import Qt
 import sys
 import logging
+from functools import partial
 
 # Импорт диалога аутентификации
 from linux_gui.gui.auth_block import AuthDialog
@@ -17,6 +18,7 @@ from linux_gui.gui.process_manager_block import ProcessManagerBlock
 from linux_gui.gui.scripts_block import ScriptsBlock
 
 from settings import load_settings
+from lazy_block import LazyBlock
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +28,17 @@ class LinuxWindow(QWidget):
     Главное окно для управления Linux/Unix-системой.
     Перед построением интерфейса запускается окно аутентификации.
     Если аутентификация не пройдена, выбрасывается исключение,
-    чтобы не создавать пустой GUI.
+    чтобы не создавать пустой GUI. Блоки создаются при первом показе
+    в области прокрутки (LazyBlock).
     """
+    # Названия блоков для заглушек (как в настройках компоновки)
+    BLOCK_TITLES = {
+        "SystemInfoBlock": "Информация о системе",
+        "CommandsBlock": "Управление хостом",
+        "NetworkBlock": "Сетевые настройки",
+        "ProcessManagerBlock": "Процессы",
+        "ScriptsBlock": "Библиотека скриптов",
+    }
 
     def __init__(self, ip: str) -> None:
         super().__init__()
@@ -101,37 +112,34 @@ class LinuxWindow(QWidget):
         settings = load_settings()
 
         default_order = [
-            ("SystemInfoBlock", SystemInfoBlock, [self.hostname]),
+            # Блоки работают через SSH-сессию этой вкладки: у разных вкладок
+            # одного хоста могут быть разные учётные записи
+            ("SystemInfoBlock", SystemInfoBlock, [self.hostname, self.session_manager]),
             ("CommandsBlock", CommandsBlock, [self.hostname, self.ip]),
-            ("NetworkBlock", NetworkBlock, [self.hostname]),
-            ("ProcessManagerBlock", ProcessManagerBlock, [self.hostname]),
-            ("ScriptsBlock", ScriptsBlock, [self.hostname]),
+            ("NetworkBlock", NetworkBlock, [self.hostname, self.session_manager]),
+            ("ProcessManagerBlock", ProcessManagerBlock, [self.hostname, self.session_manager]),
+            ("ScriptsBlock", ScriptsBlock, [self.hostname, self.session_manager]),
         ]
 
         layout_config = settings.get("layout_linux")
         if layout_config:
             # Создаем словарь: имя блока -> (класс, аргументы)
             block_mapping = {name: (cls, args) for name, cls, args in default_order}
-            for block in layout_config:
-                block_name = block.get("name")
-                visible = block.get("visible", True)
-                if visible and block_name in block_mapping:
-                    cls, args = block_mapping[block_name]
-                    try:
-                        block_instance = cls(*args)
-                        layout.addWidget(block_instance)
-                    except Exception as e:
-                        logger.exception(f"Ошибка в {block_name}: {e}")
-                        QMessageBox.critical(self, "Ошибка", f"Ошибка в {block_name}: {e}")
+            blocks = [
+                (block.get("name"), *block_mapping[block.get("name")])
+                for block in layout_config
+                if block.get("visible", True) and block.get("name") in block_mapping
+            ]
         else:
             # Если настроек нет – используем порядок по умолчанию
-            for block_name, block_class, args in default_order:
-                try:
-                    block_instance = block_class(*args)
-                    layout.addWidget(block_instance)
-                except Exception as e:
-                    logger.exception(f"Ошибка в {block_name}: {e}")
-                    QMessageBox.critical(self, "Ошибка", f"Ошибка в {block_name}: {e}")
+            blocks = default_order
+
+        for block_name, block_class, args in blocks:
+            # Блок создаётся при первом показе; ошибки создания выводит LazyBlock
+            layout.addWidget(LazyBlock(
+                block_name, self.BLOCK_TITLES.get(block_name, block_name),
+                partial(block_class, *args), self.scroll_area
+            ))
 
     def update_layout(self) -> None:
         """
@@ -147,6 +155,7 @@ class LinuxWindow(QWidget):
             item = layout.takeAt(0)
             widget = item.widget()
             if widget is not None:
+                self._close_block(widget)
                 widget.setParent(None)
                 widget.deleteLater()
         # Пересоздаем блоки по новым настройкам
@@ -154,14 +163,32 @@ class LinuxWindow(QWidget):
 
     def close_session(self) -> None:
         """
-        Закрывает SSH-сессию перед закрытием окна.
+        Останавливает фоновые операции блоков и возвращает SSH-сессию в пул соединений
+        перед закрытием окна. Повторный вызов ничего не делает.
         """
+        layout = self.content_widget.layout()
+        if layout is not None:
+            for i in range(layout.count()):
+                widget = layout.itemAt(i).widget()
+                if widget is not None:
+                    self._close_block(widget)
         if self.session_manager:
             try:
                 self.session_manager.close_session()
-                logger.info(f"SSH-сессия с {self.ip} закрыта.")
+                logger.info(f"SSH-сессия с {self.ip} освобождена.")
             except Exception as e:
                 logger.exception(f"Ошибка при закрытии SSH-сессии: {e}")
+            finally:
+                self.session_manager = None
+
+    @staticmethod
+    def _close_block(widget: QWidget) -> None:
+        """Останавливает фоновые операции блока, если они есть (например, онлайн-режим процессов)."""
+        if hasattr(widget, "close_session"):
+            try:
+                widget.close_session()
+            except Exception as e:
+                logger.exception(f"Ошибка при закрытии сессии блока {type(widget).__name__}: {e}")
 
     def closeEvent(self, event) -> None:
         """
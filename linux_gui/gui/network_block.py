@@ -1,13 +1,15 @@
 from PySide6.QtWidgets import (
     QGroupBox, QVBoxLayout, QLabel, QPushButton,
-    QTextEdit, QTreeWidget, QSizePolicy, QTreeWidgetItem
+    QTextEdit, QTreeWidget, QSizePolicy, QTreeWidgetItem,
+    QHBoxLayout, QCheckBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from linux_gui.session_manager import SessionManager
-from linux_gui.network import NetworkInfo
+from linux_gui.network import NetworkInfo, format_rate
+from linux_gui.gui.worker_pool import CancelToken, LinuxWorkerPool
 from notifications import Notification
 
 logger = logging.getLogger(__name__)
@@ -17,18 +19,31 @@ class NetworkBlock(QGroupBox):
     """
     Виджет для отображения информации о сети удалённого Linux-хоста.
 
-    Отображает краткое резюме (список интерфейсов с найденными IP) и полный вывод команды.
-    Обновление информации производится по нажатию кнопки.
+    Отображает краткое резюме (интерфейсы, состояние, MTU, IP-адреса и скорость
+    приёма/передачи) и полный вывод команды. Обновление информации производится
+    по нажатию кнопки или периодически в онлайн-режиме: скорость вычисляется
+    по счётчикам интерфейсов той же команды, без дополнительных запросов.
+    Запросы к хосту выполняются в общем пуле потоков (LinuxWorkerPool).
     """
-    def __init__(self, hostname: str, parent=None) -> None:
+
+    LIVE_INTERVAL_MS: int = 2000
+
+    def __init__(self, hostname: str, session: SessionManager, parent=None) -> None:
         """
         Инициализирует виджет сетевых настроек.
 
         :param hostname: имя или IP-адрес удалённого хоста.
+        :param session: SSH-сессия вкладки.
         :param parent: Родительский виджет (если имеется).
         """
         super().__init__("🌐 Сетевые настройки", parent)
         self.hostname: str = hostname
+        self.session: SessionManager = session
+        # Сохраняется между обновлениями – хранит счётчики для вычисления скорости
+        self.network_info: Optional[NetworkInfo] = None
+        self.live_timer = QTimer(self)
+        self.live_timer.setInterval(self.LIVE_INTERVAL_MS)
+        self.live_timer.timeout.connect(self.refresh_live)
         self.init_ui()
 
     def init_ui(self) -> None:
@@ -42,7 +57,7 @@ class NetworkBlock(QGroupBox):
 
         # QTreeWidget для отображения краткой информации по интерфейсам и IP-адресам
         self.network_tree = QTreeWidget()
-        self.network_tree.setHeaderLabels(["Интерфейс", "IP-адреса"])
+        self.network_tree.setHeaderLabels(["Интерфейс", "Состояние", "MTU", "IP-адреса", "⬇ Приём", "⬆ Передача"])
         self.network_tree.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
         layout.addWidget(self.network_tree)
 
@@ -51,11 +66,17 @@ class NetworkBlock(QGroupBox):
         self.network_info_text.setReadOnly(True)
         layout.addWidget(self.network_info_text)
 
-        # Кнопка обновления сетевой информации
+        # Кнопка обновления сетевой информации и переключатель онлайн-режима
+        buttons_layout = QHBoxLayout()
         self.refresh_button = QPushButton("🔄 Обновить данные сети")
         self.refresh_button.setToolTip("Нажмите для обновления сетевой информации")
         self.refresh_button.clicked.connect(self.refresh_network_info)
-        layout.addWidget(self.refresh_button)
+        self.live_checkbox = QCheckBox("⏱ Онлайн")
+        self.live_checkbox.setToolTip("Обновлять данные и скорость интерфейсов каждые 2 секунды")
+        self.live_checkbox.toggled.connect(self.toggle_live)
+        buttons_layout.addWidget(self.refresh_button)
+        buttons_layout.addWidget(self.live_checkbox)
+        layout.addLayout(buttons_layout)
 
         self.setLayout(layout)
 
@@ -65,11 +86,41 @@ class NetworkBlock(QGroupBox):
 
         :param interfaces: Словарь с информацией об интерфейсах.
         """
-        self.network_tree.clear()
+        # Существующие строки обновляются на месте, чтобы в онлайн-режиме сохранялось выделение
+        items = {
+            self.network_tree.topLevelItem(i).text(0): self.network_tree.topLevelItem(i)
+            for i in range(self.network_tree.topLevelItemCount())
+        }
+        for iface, item in items.items():
+            if iface not in interfaces:
+                self.network_tree.takeTopLevelItem(self.network_tree.indexOfTopLevelItem(item))
+
         for iface, data in interfaces.items():
-            ips = ", ".join(data.get("ips", [])) if data.get("ips") else "Нет IP"
-            item = QTreeWidgetItem([iface, ips])
-            self.network_tree.addTopLevelItem(item)
+            values = self._interface_columns(iface, data)
+            item = items.get(iface)
+            if item is None:
+                self.network_tree.addTopLevelItem(QTreeWidgetItem(values))
+                continue
+            for column, value in enumerate(values):
+                if item.text(column) != value:
+                    item.setText(column, value)
+
+    @staticmethod
+    def _interface_columns(iface: str, data: Dict[str, Any]) -> List[str]:
+        """Возвращает значения столбцов дерева для интерфейса."""
+        addresses = [
+            f"{addr['address']}/{addr['prefixlen']}" if addr.get("prefixlen") is not None else addr["address"]
+            for addr in data.get("addresses", [])
+        ]
+        mtu = data.get("mtu")
+        return [
+            iface,
+            data.get("state") or "—",
+            str(mtu) if mtu is not None else "—",
+            ", ".join(addresses) if addresses else "Нет IP",
+            format_rate(data.get("rx_rate")),
+            format_rate(data.get("tx_rate")),
+        ]
 
     def update_network_info_text(self, raw_output: str) -> None:
         """
@@ -82,46 +133,115 @@ class NetworkBlock(QGroupBox):
 
     def refresh_network_info(self) -> None:
         """
-        Обновляет сетевую информацию и отображает её:
+        Запускает обновление сетевой информации в общем пуле потоков и по готовности отображает её:
           - Краткое резюме по интерфейсам и IP-адресам отображается в QTreeWidget.
           - Полный вывод команды – в QTextEdit.
         При успешном обновлении выводится уведомление, в противном случае – сообщение об ошибке.
+        Повторное нажатие во время запроса присоединяется к нему.
+        """
+        self.refresh_button.setEnabled(False)
+        LinuxWorkerPool.instance().submit(
+            self.task_key, self.fetch_network_info, self.on_network_info, self.on_network_error
+        )
+
+    def on_network_info(self, net_info: Dict[str, Any]) -> None:
         """
-        try:
-            # Получаем SSH-клиент через SessionManager
-            session = SessionManager.get_instance(self.hostname, "", "").get_client()
-            network_info_obj = NetworkInfo(session)
-            net_info: Dict[str, Any] = network_info_obj.get_network_info()
-
-            raw_output: str = net_info.get("raw", "")
-            interfaces: Dict[str, Dict[str, Any]] = net_info.get("interfaces", {})
-
-            # Обновляем данные в интерфейсе
-            self.update_network_tree(interfaces)
-            self.update_network_info_text(raw_output)
-            if not interfaces:
-                Notification(
-                    "⚠ Нет сетевых интерфейсов",
-                    "Система не обнаружила активных сетевых подключений.",
-                    "warning",
-                    parent=self.window()
-                ).show_notification()
-                return
+        Отображает полученную сетевую информацию и выводит уведомление.
 
+        :param net_info: Результат NetworkInfo.get_network_info().
+        """
+        self.refresh_button.setEnabled(True)
+        interfaces = self.show_network_info(net_info)
+        if not interfaces:
             Notification(
-                "🌍 Обновление сети",
-                "Данные о сетевых интерфейсах успешно загружены.",
-                "success",
+                "⚠ Нет сетевых интерфейсов",
+                "Система не обнаружила активных сетевых подключений.",
+                "warning",
                 parent=self.window()
             ).show_notification()
+            return
+
+        Notification(
+            "🌍 Обновление сети",
+            "Данные о сетевых интерфейсах успешно загружены.",
+            "success",
+            parent=self.window()
+        ).show_notification()
+
+    def on_network_error(self, message: str) -> None:
+        """Сообщает об ошибке получения сетевой информации."""
+        self.refresh_button.setEnabled(True)
+        Notification(
+            "🚫 Ошибка сети",
+            f"Не удалось получить сетевую информацию.\nОшибка: `{message}`",
+            "error",
+            parent=self.window()
+        ).show_notification()
+
+    @property
+    def task_key(self) -> tuple:
+        """Ключ задачи блока в общем пуле потоков (свой для каждой SSH-сессии)."""
+        return (*self.session.key, "network")
+
+    def fetch_network_info(self, token: CancelToken) -> Dict[str, Any]:
+        """
+        Получает сетевую информацию с хоста (выполняется в потоке пула).
 
+        :param token: Токен отмены задачи.
+        :return: Результат NetworkInfo.get_network_info().
+        :raises Exception: При ошибке выполнения команды на хосте.
+        """
+        # Получаем SSH-клиент сессии вкладки
+        session = self.session.get_client()
+        if self.network_info is None or self.network_info.client is not session:
+            self.network_info = NetworkInfo(session)
+        return self.network_info.get_network_info()
 
-        except Exception as e:
-            logger.exception("Ошибка обновления сетевой информации")
-            Notification(
-                "🚫 Ошибка сети",
-                f"Не удалось получить сетевую информацию.\nОшибка: `{e}`",
-                "error",
-                parent=self.window()
-            ).show_notification()
+    def show_network_info(self, net_info: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Обновляет дерево и полный вывод по полученной сетевой информации.
 
+        :param net_info: Результат NetworkInfo.get_network_info().
+        :return: Словарь с информацией об интерфейсах.
+        """
+        raw_output: str = net_info.get("raw", "")
+        interfaces: Dict[str, Dict[str, Any]] = net_info.get("interfaces", {})
+
+        # Обновляем данные в интерфейсе
+        self.update_network_tree(interfaces)
+        self.update_network_info_text(raw_output)
+        return interfaces
+
+    def toggle_live(self, enabled: bool) -> None:
+        """Включает или выключает периодическое обновление данных сети."""
+        if enabled:
+            self.refresh_live()
+            self.live_timer.start()
+        else:
+            self.live_timer.stop()
+
+    def refresh_live(self) -> None:
+        """
+        Обновляет данные сети без уведомлений. Если предыдущий запрос ещё
+        выполняется, такт присоединяется к нему, и запросы не накапливаются.
+        """
+        LinuxWorkerPool.instance().submit(
+            self.task_key, self.fetch_network_info, self.show_network_info, self.on_live_error
+        )
+
+    def on_live_error(self, message: str) -> None:
+        """Выключает онлайн-режим при ошибке обновления."""
+        if not self.live_checkbox.isChecked():
+            return
+        self.live_checkbox.setChecked(False)
+        Notification(
+            "🚫 Ошибка онлайн-режима",
+            f"Обновление сетевой информации остановлено.\nОшибка: `{message}`",
+            "error",
+            parent=self.window()
+        ).show_notification()
+
+    def close_session(self) -> None:
+        """Останавливает онлайн-обновление и отменяет запрос при закрытии вкладки или перестроении блоков."""
+        self.live_timer.stop()
+        LinuxWorkerPool.instance().cancel(self.task_key)
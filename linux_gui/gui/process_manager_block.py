@@ -1,35 +1,92 @@
 from PySide6.QtWidgets import (
     QGroupBox, QVBoxLayout, QLabel, QPushButton,
-    QTreeWidget, QTreeWidgetItem, QLineEdit, QHBoxLayout,
-    QSizePolicy, QApplication
+    QTreeView, QLineEdit, QHBoxLayout,
+    QSizePolicy, QApplication, QCheckBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThread, QTimer, Signal
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from linux_gui.session_manager import SessionManager
 from linux_gui.process_manager import ProcessManager
+from linux_gui.gui.process_tree_model import ProcessTreeModel
+from linux_gui.gui.worker_pool import CancelToken, LinuxWorkerPool
 from notifications import Notification
 
 logger = logging.getLogger(__name__)
 
 
+class ProcessStreamThread(QThread):
+    """
+    Поток онлайн-наблюдения за процессами: получает с хоста только изменения
+    списка процессов и передаёт их сигналом diff_ready на каждом такте.
+    """
+    diff_ready = Signal(dict)
+    stream_failed = Signal(str)
+
+    def __init__(self, session: SessionManager, query: Optional[Dict[str, Any]] = None, parent=None) -> None:
+        """
+        :param session: SSH-сессия вкладки.
+        :param query: Условия отбора процессов на хосте (параметры ProcessManager.query_processes).
+        """
+        super().__init__(parent)
+        self.session: SessionManager = session
+        self.query: Dict[str, Any] = query or {}
+        self.manager: Optional[ProcessManager] = None
+        self._stopped: bool = False
+
+    def run(self) -> None:
+        try:
+            client = self.session.get_client()
+            self.manager = ProcessManager(client)
+            if self._stopped:
+                return
+            for diff in self.manager.stream_processes(query=self.query):
+                if self._stopped:
+                    break
+                self.diff_ready.emit(diff)
+        except Exception as e:
+            if not self._stopped:
+                logger.exception("Ошибка онлайн-наблюдения за процессами")
+                self.stream_failed.emit(str(e))
+
+    def stop(self) -> None:
+        """Останавливает наблюдение: удалённый цикл завершается вместе с каналом."""
+        self._stopped = True
+        if self.manager is not None:
+            self.manager.stop_stream()
+
+
 class ProcessManagerBlock(QGroupBox):
     """
     Виджет для отображения информации о процессах на удалённом Linux-хосте.
 
     Отображает список процессов в виде дерева, подобного htop, с возможностью
     поиска по строкам. Процессы отображаются в виде иерархической структуры
-    (с родительскими и дочерними процессами).
+    (с родительскими и дочерними процессами): дерево строится по PPID
+    в ProcessTreeModel, представление создаёт строки только для видимой области.
+    Поиск выполняется на хосте: при изменении условий поиска список
+    запрашивается заново и содержит не более FILTER_LIMIT процессов.
     """
 
-    def __init__(self, hostname: str, parent=None) -> None:
+    SEARCH_DEBOUNCE_MS: int = 250
+    # Максимальное количество процессов в результатах поиска (по убыванию CPU)
+    FILTER_LIMIT: int = 500
+
+    def __init__(self, hostname: str, session: SessionManager, parent=None) -> None:
         """
         :param hostname: Имя или IP-адрес удалённого хоста.
+        :param session: SSH-сессия вкладки.
         :param parent: Родительский виджет.
         """
         super().__init__("🛠️ Процессы", parent)
         self.hostname: str = hostname
+        self.session: SessionManager = session
+        self.stream_thread: Optional[ProcessStreamThread] = None
+        # Список процессов уже загружался – поиск запрашивает его заново
+        self.loaded: bool = False
+        # Онлайн-наблюдение перезапускается с новыми условиями поиска
+        self._restart_stream: bool = False
         self.init_ui()
 
     def init_ui(self) -> None:
@@ -45,24 +102,44 @@ class ProcessManagerBlock(QGroupBox):
         search_layout = QHBoxLayout()
         search_label = QLabel("🔎 Поиск:")
         self.search_field = QLineEdit()
-        self.search_field.setPlaceholderText("Введите текст для поиска...")
-        self.search_field.textChanged.connect(self.filter_table)
+        self.search_field.setPlaceholderText("Текст командной строки...")
+        self.user_field = QLineEdit()
+        self.user_field.setPlaceholderText("👤 Пользователь")
+        self.user_field.setMaximumWidth(150)
         search_layout.addWidget(search_label)
         search_layout.addWidget(self.search_field)
+        search_layout.addWidget(self.user_field)
         layout.addLayout(search_layout)
 
+        # Запрос к хосту выполняется после паузы в наборе, а не на каждый символ
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.filter_table)
+        self.search_field.textChanged.connect(self.search_timer.start)
+        self.user_field.textChanged.connect(self.search_timer.start)
+
         # Дерево процессов для отображения списка процессов в виде иерархии
-        self.process_tree = QTreeWidget()
-        self.process_tree.setHeaderLabels(["PID", "USER", "CPU%", "MEM%", "TIME", "COMMAND"])
+        self.process_model = ProcessTreeModel(self)
+        self.process_tree = QTreeView()
+        self.process_tree.setModel(self.process_model)
+        self.process_tree.setUniformRowHeights(True)
         self.process_tree.setSortingEnabled(True)
+        self.process_tree.sortByColumn(2, Qt.DescendingOrder)
         self.process_tree.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         layout.addWidget(self.process_tree)
 
-        # Кнопка обновления списка процессов
+        # Кнопка обновления списка процессов и переключатель онлайн-режима
+        buttons_layout = QHBoxLayout()
         self.refresh_button = QPushButton("🔄 Обновить процессы")
         self.refresh_button.setToolTip("Нажмите для обновления списка процессов")
         self.refresh_button.clicked.connect(self.refresh_processes)
-        layout.addWidget(self.refresh_button)
+        self.live_checkbox = QCheckBox("⏱ Онлайн")
+        self.live_checkbox.setToolTip("Обновлять список процессов непрерывно, передавая только изменения")
+        self.live_checkbox.toggled.connect(self.toggle_live)
+        buttons_layout.addWidget(self.refresh_button)
+        buttons_layout.addWidget(self.live_checkbox)
+        layout.addLayout(buttons_layout)
 
         self.setLayout(layout)
 
@@ -70,50 +147,118 @@ class ProcessManagerBlock(QGroupBox):
         """
         Обновляет список процессов.
 
-        Получает данные через ProcessManager, обновляет дерево процессов и
-        выводит уведомление об успешном обновлении или ошибке.
+        Запрос к хосту выполняется в общем пуле потоков (LinuxWorkerPool);
+        по готовности дерево процессов обновляется и выводится уведомление
+        об успешном обновлении или ошибке. Повторное нажатие во время запроса
+        присоединяется к нему.
         """
         # Деактивируем кнопку, чтобы избежать повторных запросов
         self.refresh_button.setEnabled(False)
         self.refresh_button.setText("🔄 Обновление...")
+        self.submit_query(self.on_processes_loaded, join=True)
 
-        try:
-            session = SessionManager.get_instance(self.hostname, "", "").get_client()
-            proc_manager = ProcessManager(session)
-            data = proc_manager.get_processes_info()
-            processes: List[Dict[str, Any]] = data.get("processes", [])
+    def submit_query(self, on_result, join: bool) -> None:
+        """
+        Запускает запрос процессов с текущими условиями поиска в общем пуле потоков.
 
-            self.populate_tree(processes)
+        :param on_result: Обработчик результата fetch_processes().
+        :param join: Присоединиться к выполняющемуся запросу вместо его отмены
+                     (при изменении условий поиска прежний результат не нужен).
+        """
+        pool = LinuxWorkerPool.instance()
+        if not join:
+            pool.cancel(self.task_key)
+        query = self.process_query()
+        pool.submit(
+            self.task_key, lambda token: self.fetch_processes(query, token),
+            on_result, self.on_processes_error
+        )
+
+    @property
+    def task_key(self) -> tuple:
+        """Ключ задачи блока в общем пуле потоков (свой для каждой SSH-сессии)."""
+        return (*self.session.key, "processes")
+
+    def fetch_processes(self, query: Dict[str, Any], token: CancelToken) -> Dict[str, Any]:
+        """
+        Запрашивает процессы с хоста (выполняется в потоке пула).
 
-            if not processes:
+        :param query: Условия отбора процессов (параметры ProcessManager.query_processes).
+        :param token: Токен отмены задачи.
+        :return: Словарь {"query": условия, "processes": [процессы]}.
+        :raises Exception: При ошибке выполнения запроса на хосте.
+        """
+        proc_manager = ProcessManager(self.session.get_client())
+        data = proc_manager.query_processes(**query)
+        return {"query": query, "processes": data.get("processes", [])}
+
+    def show_processes(self, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Заполняет дерево результатом запроса и восстанавливает кнопку обновления.
+
+        :param result: Результат fetch_processes().
+        :return: Список загруженных процессов.
+        """
+        self.restore_refresh_button()
+        processes: List[Dict[str, Any]] = result.get("processes", [])
+        self.populate_tree(processes)
+        self.loaded = True
+        if not processes and result.get("query"):
+            self.notify_not_found()
+        return processes
+
+    def on_processes_loaded(self, result: Dict[str, Any]) -> None:
+        """Отображает процессы, загруженные по кнопке «Обновить», и выводит уведомление."""
+        processes = self.show_processes(result)
+        if not processes:
+            if not result.get("query"):
                 Notification(
                     "⚠ Нет активных процессов",
                     "На удалённом хосте не найдено активных процессов.",
                     "warning",
                     parent=self.window()
                 ).show_notification()
-                return
-
-            Notification(
-                "🛠 Обновление процессов",
-                "Список активных процессов успешно загружен.",
-                "success",
-                parent=self.window()
-            ).show_notification()
+            return
+
+        Notification(
+            "🛠 Обновление процессов",
+            "Список активных процессов успешно загружен.",
+            "success",
+            parent=self.window()
+        ).show_notification()
+
+    def on_processes_error(self, message: str) -> None:
+        """Сообщает об ошибке загрузки процессов."""
+        self.restore_refresh_button()
+        Notification(
+            "🚫 Ошибка загрузки процессов",
+            f"Не удалось получить данные о процессах.\nОшибка: `{message}`",
+            "error",
+            parent=self.window()
+        ).show_notification()
+
+    def restore_refresh_button(self) -> None:
+        """Восстанавливает исходное состояние кнопки (в онлайн-режиме она остаётся неактивной)."""
+        self.refresh_button.setEnabled(self.stream_thread is None)
+        self.refresh_button.setText("🔄 Обновить процессы")
+
+    def process_query(self) -> Dict[str, Any]:
+        """
+        Формирует условия отбора процессов на хосте из полей поиска.
+        Введённый текст ищется буквально (без учёта регистра).
 
-        except Exception as e:
-            logger.exception("Ошибка обновления процессов")
-            Notification(
-                "🚫 Ошибка загрузки процессов",
-                f"Не удалось получить данные о процессах.\nОшибка: `{e}`",
-                "error",
-                parent=self.window()
-            ).show_notification()
-
-        finally:
-            # Восстанавливаем исходное состояние кнопки
-            self.refresh_button.setEnabled(True)
-            self.refresh_button.setText("🔄 Обновить процессы")
+        :return: Параметры ProcessManager.query_processes (пустой словарь – все процессы).
+        """
+        query: Dict[str, Any] = {}
+        command = self.search_field.text().strip()
+        user = self.user_field.text().strip()
+        if command:
+            query["command"] = ProcessManager.literal_pattern(command)
+        if user:
+            query["user"] = ProcessManager.literal_pattern(user)
+        if query:
+            query["limit"] = self.FILTER_LIMIT
+        return query
 
     def populate_tree(self, processes: List[Dict[str, Any]]) -> None:
         """
@@ -121,66 +266,100 @@ class ProcessManagerBlock(QGroupBox):
 
         :param processes: Список словарей с информацией о процессах.
         """
-        self.process_tree.clear()
-        process_map: Dict[str, QTreeWidgetItem] = {}  # Для построения иерархии процессов
-
-        for process in processes:
-            pid = process.get("PID", "")
-            ppid = process.get("PPID", "")
-            user = process.get("USER", "")
-            cpu = process.get("%CPU", "")
-            mem = process.get("%MEM", "")
-            time_str = process.get("TIME", "")
-            cmd = process.get("COMMAND", "")
-
-            item = QTreeWidgetItem([str(pid), user, str(cpu), str(mem), time_str, cmd])
-            # Центрируем столбцы с процентами
-            item.setTextAlignment(2, Qt.AlignCenter)
-            item.setTextAlignment(3, Qt.AlignCenter)
-
-            process_map[str(pid)] = item
-
-            # Если родительский процесс найден, добавляем как дочерний элемент
-            if ppid and str(ppid) in process_map:
-                process_map[str(ppid)].addChild(item)
-            else:
-                self.process_tree.addTopLevelItem(item)
-
-        # Применяем фильтрацию, если в поле поиска что-то введено
-        self.filter_table(self.search_field.text())
-
-    def filter_table(self, text: str) -> None:
-        """
-        Фильтрует дерево процессов по введённому тексту.
-
-        :param text: Строка для поиска.
-        """
-        filter_text = text.strip().lower()
-
-        if filter_text and all(self.process_tree.topLevelItem(i).isHidden()
-                               for i in range(self.process_tree.topLevelItemCount())):
-            Notification(
-                "🔎 Поиск процессов",
-                "По вашему запросу ничего не найдено.",
-                "warning",
-                parent=self.window()
-            ).show_notification()
-
-        def match_item(item: QTreeWidgetItem) -> bool:
-            """
-            Рекурсивно проверяет, содержит ли данный элемент или его дочерние элементы
-            текст фильтра.
-            """
-            for col in range(item.columnCount()):
-                if filter_text in item.text(col).lower():
-                    return True
-            # Рекурсивная проверка дочерних элементов
-            for i in range(item.childCount()):
-                if match_item(item.child(i)):
-                    return True
-            return False
-
-        # Применяем фильтр к каждому топ-уровневому элементу дерева
-        for i in range(self.process_tree.topLevelItemCount()):
-            item = self.process_tree.topLevelItem(i)
-            item.setHidden(not match_item(item))
+        self.process_model.set_processes(processes)
+
+    def toggle_live(self, enabled: bool) -> None:
+        """
+        Включает или выключает онлайн-режим. В онлайн-режиме с хоста передаются
+        только изменения, которые применяются к дереву без его перестроения.
+        """
+        if enabled:
+            if self.stream_thread is not None:
+                return
+            self.refresh_button.setEnabled(False)
+            self.start_stream()
+        else:
+            self._restart_stream = False
+            self.stop_live()
+
+    def start_stream(self) -> None:
+        """Запускает поток онлайн-наблюдения с текущими условиями поиска."""
+        # Первый такт содержит все процессы – начинаем с пустого дерева
+        self.process_model.set_processes([])
+        self.stream_thread = ProcessStreamThread(self.session, self.process_query())
+        # Результат обычного запроса, завершившегося позже, не должен заменить онлайн-данные
+        LinuxWorkerPool.instance().cancel(self.task_key)
+        self.restore_refresh_button()
+        self.stream_thread.diff_ready.connect(self.apply_diff)
+        self.stream_thread.stream_failed.connect(self.on_stream_failed)
+        self.stream_thread.finished.connect(self.on_stream_finished)
+        self.stream_thread.start()
+
+    def stop_live(self) -> None:
+        """Останавливает онлайн-режим (без ожидания завершения потока)."""
+        if self.stream_thread is not None:
+            self.stream_thread.stop()
+
+    def on_stream_failed(self, message: str) -> None:
+        """Сообщает об ошибке онлайн-наблюдения."""
+        Notification(
+            "🚫 Ошибка онлайн-режима",
+            f"Наблюдение за процессами остановлено.\nОшибка: `{message}`",
+            "error",
+            parent=self.window()
+        ).show_notification()
+
+    def on_stream_finished(self) -> None:
+        """
+        Возвращает блок в обычный режим после завершения потока наблюдения
+        или перезапускает наблюдение, если изменились условия поиска.
+        """
+        self.stream_thread = None
+        if self._restart_stream and self.live_checkbox.isChecked():
+            self._restart_stream = False
+            self.start_stream()
+            return
+        self._restart_stream = False
+        self.refresh_button.setEnabled(True)
+        self.live_checkbox.blockSignals(True)
+        self.live_checkbox.setChecked(False)
+        self.live_checkbox.blockSignals(False)
+
+    def apply_diff(self, diff: Dict[str, Any]) -> None:
+        """
+        Применяет изменения списка процессов к модели построчно:
+        выделение, раскрытые узлы и позиция прокрутки сохраняются.
+
+        :param diff: Словарь {"changed": [процессы], "exited": [PID]}.
+        """
+        self.process_model.apply_diff(diff)
+
+    def close_session(self) -> None:
+        """Останавливает онлайн-наблюдение и отменяет запросы при закрытии вкладки или перестроении блоков."""
+        LinuxWorkerPool.instance().cancel(self.task_key)
+        if self.stream_thread is not None:
+            self.stream_thread.stop()
+            # Закрытие канала прерывает чтение – поток завершается почти сразу
+            self.stream_thread.wait(3000)
+
+    def filter_table(self) -> None:
+        """
+        Применяет условия поиска: список процессов запрашивается с хоста заново,
+        в онлайн-режиме наблюдение перезапускается с новыми условиями.
+        """
+        if self.stream_thread is not None:
+            self._restart_stream = True
+            self.stream_thread.stop()
+            return
+        if not self.loaded:
+            return
+        self.submit_query(self.show_processes, join=False)
+
+    def notify_not_found(self) -> None:
+        """Сообщает, что по условиям поиска процессы не найдены."""
+        Notification(
+            "🔎 Поиск процессов",
+            "По вашему запросу ничего не найдено.",
+            "warning",
+            parent=self.window()
+        ).show_notification()
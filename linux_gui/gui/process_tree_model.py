@@ -0,0 +1,314 @@
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+logger = logging.getLogger(__name__)
+
+# Корень дерева: процессы без известного родителя (PID 0 в ps не выводится)
+ROOT_PID = 0
+
+
+class ProcessTreeModel(QAbstractItemModel):
+    """
+    Модель дерева процессов для QTreeView.
+
+    Индекс «родитель → дочерние процессы» строится за один проход по списку ps
+    по столбцу PPID, поэтому порядок строк ps не важен. Представление запрашивает
+    строки только у раскрытых узлов и только для видимой области, так что
+    для хоста с десятками тысяч процессов не создаётся ни одного виджета на строку.
+    Поиск выполняется на хосте (ProcessManager.query_processes), модель
+    отображает уже отобранные процессы.
+    Изменения онлайн-режима применяются построчно: выделение и раскрытые
+    узлы сохраняются.
+    """
+
+    COLUMNS: Tuple[Tuple[str, str], ...] = (
+        ("PID", "PID"), ("USER", "USER"), ("%CPU", "CPU%"),
+        ("%MEM", "MEM%"), ("TIME", "TIME"), ("COMMAND", "COMMAND"),
+    )
+    NUMERIC_FIELDS = ("PID", "%CPU", "%MEM")
+    CENTERED_FIELDS = ("%CPU", "%MEM")
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._processes: Dict[int, Dict[str, str]] = {}
+        self._parent_of: Dict[int, int] = {}
+        self._children: Dict[int, List[int]] = {ROOT_PID: []}
+        self._row_of: Dict[int, int] = {}
+        self._sort_column: int = 2
+        self._sort_order: Qt.SortOrder = Qt.DescendingOrder
+
+    # --- QAbstractItemModel ---
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        siblings = self._children.get(self._pid_of_index(parent), [])
+        if 0 <= row < len(siblings) and 0 <= column < len(self.COLUMNS):
+            return self.createIndex(row, column, siblings[row])
+        return QModelIndex()
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        return self._index_of(self._parent_of.get(index.internalId(), ROOT_PID))
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        return len(self._children.get(self._pid_of_index(parent), []))
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return len(self.COLUMNS)
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return parent.column() <= 0 and bool(self._children.get(self._pid_of_index(parent)))
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        field = self.COLUMNS[index.column()][0]
+        if role == Qt.DisplayRole:
+            process = self._processes.get(index.internalId())
+            return process.get(field, "") if process else None
+        if role == Qt.TextAlignmentRole and field in self.CENTERED_FIELDS:
+            return int(Qt.AlignCenter)
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section][1]
+        return None
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder) -> None:
+        """Сортирует процессы внутри каждого родителя, сохраняя выделение и раскрытые узлы."""
+        self._sort_column = column
+        self._sort_order = order
+        self._resort()
+
+    # --- Данные ---
+
+    def set_processes(self, processes: Iterable[Dict[str, str]]) -> None:
+        """
+        Заменяет список процессов и перестраивает дерево.
+
+        :param processes: Процессы в формате ProcessManager (с полями PID и PPID).
+        """
+        self.beginResetModel()
+        self._processes = {}
+        for process in processes:
+            pid = self._pid(process)
+            if pid is not None:
+                self._processes[pid] = process
+        self._build()
+        self.endResetModel()
+
+    def apply_diff(self, diff: Dict[str, Any]) -> None:
+        """
+        Применяет изменения онлайн-режима: удаляет завершившиеся процессы,
+        добавляет новые и обновляет изменившиеся, не перестраивая дерево.
+
+        :param diff: Словарь {"changed": [процессы], "exited": [PID]}.
+        """
+        changed = [p for p in diff.get("changed", []) if self._pid(p) is not None]
+        exited = [int(pid) for pid in diff.get("exited", []) if str(pid).strip().isdigit()]
+        if not self._processes:
+            # Первый такт содержит все процессы
+            self.set_processes(changed)
+            return
+
+        sort_field = self.COLUMNS[self._sort_column][0]
+        resort = False
+        new: List[int] = []
+        updated: List[int] = []
+        # Завершившиеся процессы убираются из дерева до удаления их данных:
+        # перенос их потомков сортирует строки по данным ещё не удалённых соседей
+        for pid in exited:
+            if pid in self._parent_of:
+                self._remove(pid)
+        for pid in exited:
+            self._processes.pop(pid, None)
+        for process in changed:
+            pid = self._pid(process)
+            old = self._processes.get(pid)
+            if old is None:
+                new.append(pid)
+            else:
+                updated.append(pid)
+                resort = resort or old.get(sort_field) != process.get(sort_field)
+            self._processes[pid] = process
+
+        for pid in self._parents_first(new):
+            self._insert(pid)
+        last_column = len(self.COLUMNS) - 1
+        for pid in updated:
+            if pid not in self._parent_of:
+                continue
+            new_parent = self._effective_parent(pid)
+            if new_parent != self._parent_of[pid]:
+                self._move(pid, new_parent)
+            else:
+                index = self._index_of(pid)
+                self.dataChanged.emit(index, index.siblingAtColumn(last_column))
+        if resort:
+            self._resort()
+
+    def process_count(self) -> int:
+        """Возвращает количество процессов в дереве."""
+        return len(self._parent_of)
+
+    # --- Построение дерева ---
+
+    @staticmethod
+    def _pid(process: Dict[str, str]) -> Optional[int]:
+        pid = str(process.get("PID", "")).strip()
+        return int(pid) if pid.isdigit() and int(pid) != ROOT_PID else None
+
+    @staticmethod
+    def _pid_of_index(index: QModelIndex) -> int:
+        return index.internalId() if index.isValid() else ROOT_PID
+
+    def _index_of(self, pid: int) -> QModelIndex:
+        if pid == ROOT_PID:
+            return QModelIndex()
+        return self.createIndex(self._row_of[pid], 0, pid)
+
+    def _ppid(self, pid: int) -> int:
+        ppid = str(self._processes[pid].get("PPID", "")).strip()
+        return int(ppid) if ppid.isdigit() else ROOT_PID
+
+    def _build(self) -> None:
+        """
+        Строит индекс «родитель → дочерние процессы» за один проход.
+        Процессы, родитель которых не попал в выборку, отображаются в корне.
+        """
+        self._parent_of = {}
+        self._children = {ROOT_PID: []}
+        for pid in self._processes:
+            ppid = self._ppid(pid)
+            parent = ppid if ppid in self._processes and ppid != pid else ROOT_PID
+            self._parent_of[pid] = parent
+            self._children.setdefault(parent, []).append(pid)
+        self._break_cycles()
+        for siblings in self._children.values():
+            siblings.sort(key=self._sort_key, reverse=self._sort_order == Qt.DescendingOrder)
+        self._row_of = {}
+        for siblings in self._children.values():
+            self._update_rows(siblings)
+
+    def _break_cycles(self) -> None:
+        """Переносит в корень процессы, зациклившиеся по PPID (возможно при смене PID между снимками)."""
+        reachable: Set[int] = set()
+        stack = [ROOT_PID]
+        while stack:
+            for child in self._children.get(stack.pop(), []):
+                reachable.add(child)
+                stack.append(child)
+        for pid in set(self._parent_of) - reachable:
+            self._children[self._parent_of[pid]].remove(pid)
+            self._parent_of[pid] = ROOT_PID
+            self._children[ROOT_PID].append(pid)
+
+    def _sort_key(self, pid: int) -> Tuple[Any, int]:
+        field = self.COLUMNS[self._sort_column][0]
+        value = self._processes[pid].get(field, "")
+        if field in self.NUMERIC_FIELDS:
+            try:
+                return float(value), pid
+            except ValueError:
+                return float("-inf"), pid
+        return str(value).lower(), pid
+
+    def _update_rows(self, siblings: List[int]) -> None:
+        for row, pid in enumerate(siblings):
+            self._row_of[pid] = row
+
+    def _insert_position(self, siblings: List[int], pid: int) -> int:
+        key = self._sort_key(pid)
+        descending = self._sort_order == Qt.DescendingOrder
+        for row, sibling in enumerate(siblings):
+            sibling_key = self._sort_key(sibling)
+            if (sibling_key < key) if descending else (sibling_key > key):
+                return row
+        return len(siblings)
+
+    def _effective_parent(self, pid: int) -> int:
+        """Родитель в дереве: PPID, если он есть в дереве и не является потомком процесса."""
+        parent = self._ppid(pid)
+        if parent not in self._parent_of or parent == pid:
+            return ROOT_PID
+        ancestor = parent
+        while ancestor != ROOT_PID:
+            if ancestor == pid:
+                return ROOT_PID
+            ancestor = self._parent_of[ancestor]
+        return parent
+
+    def _parents_first(self, pids: List[int]) -> List[int]:
+        """Упорядочивает новые процессы так, чтобы родитель добавлялся раньше потомков."""
+        pending = set(pids)
+        ordered: List[int] = []
+        for pid in pids:
+            chain: List[int] = []
+            while pid in pending:
+                pending.discard(pid)
+                chain.append(pid)
+                pid = self._ppid(pid)
+            ordered.extend(reversed(chain))
+        return ordered
+
+    def _insert(self, pid: int) -> None:
+        parent = self._effective_parent(pid)
+        siblings = self._children.setdefault(parent, [])
+        row = self._insert_position(siblings, pid)
+        self.beginInsertRows(self._index_of(parent), row, row)
+        siblings.insert(row, pid)
+        self._parent_of[pid] = parent
+        self._update_rows(siblings)
+        self.endInsertRows()
+
+    def _remove(self, pid: int) -> None:
+        # Дочерние процессы завершившегося процесса переносятся в корень до следующего снимка
+        for child in list(self._children.get(pid, [])):
+            self._move(child, ROOT_PID)
+        parent = self._parent_of[pid]
+        siblings = self._children[parent]
+        row = self._row_of[pid]
+        self.beginRemoveRows(self._index_of(parent), row, row)
+        del siblings[row]
+        del self._parent_of[pid]
+        del self._row_of[pid]
+        self._children.pop(pid, None)
+        self._update_rows(siblings)
+        self.endRemoveRows()
+
+    def _move(self, pid: int, new_parent: int) -> None:
+        old_parent = self._parent_of[pid]
+        old_siblings = self._children[old_parent]
+        new_siblings = self._children.setdefault(new_parent, [])
+        old_row = self._row_of[pid]
+        new_row = self._insert_position(new_siblings, pid)
+        if not self.beginMoveRows(self._index_of(old_parent), old_row, old_row,
+                                  self._index_of(new_parent), new_row):
+            return
+        del old_siblings[old_row]
+        new_siblings.insert(new_row, pid)
+        self._parent_of[pid] = new_parent
+        self._update_rows(old_siblings)
+        self._update_rows(new_siblings)
+        self.endMoveRows()
+
+    def _resort(self) -> None:
+        """Пересортировывает все уровни дерева с обновлением сохранённых индексов (выделения)."""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        targets = [(index.internalId(), index.column()) for index in persistent]
+        reverse = self._sort_order == Qt.DescendingOrder
+        for siblings in self._children.values():
+            siblings.sort(key=self._sort_key, reverse=reverse)
+            self._update_rows(siblings)
+        new_indexes = [
+            self.createIndex(self._row_of[pid], column, pid) if pid in self._row_of else QModelIndex()
+            for pid, column in targets
+        ]
+        self.changePersistentIndexList(persistent, new_indexes)
+        self.layoutChanged.emit()
@@ -12,8 +12,10 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QUrl, Signal
 from PySide6.QtGui import QDesktopServices, QAction, QFontMetrics, QColor, QPainter
 
-from linux_gui.scripts import ScriptsManager
+from linux_gui.scripts import ScriptsManager, run_script_ssh
+from linux_gui.session_manager import SessionManager
 from notifications import Notification
+from script_fanout_dialog import ScriptFanOutDialog
 
 logger = logging.getLogger(__name__)
 
@@ -74,13 +76,15 @@ class ScriptsBlock(QWidget):
     """
     script_executed = Signal(str, str)
 
-    def __init__(self, hostname: str, parent=None) -> None:
+    def __init__(self, hostname: str, session: SessionManager, parent=None) -> None:
         """
         :param hostname: Имя или IP-адрес удалённого хоста.
+        :param session: SSH-сессия вкладки (её учётные данные используются для запуска на хостах).
         :param parent: Родительский виджет.
         """
         super().__init__(parent)
         self.hostname: str = hostname
+        self.session: SessionManager = session
         self.manager: ScriptsManager = ScriptsManager(hostname)
         self._init_ui()
         self.load_scripts()
@@ -210,6 +214,8 @@ class ScriptsBlock(QWidget):
         menu = QMenu()
         item = self.scripts_list.itemAt(pos)
         if item:
+            run_on_hosts_action = QAction("🖧 Запустить на хостах...", self)
+            run_on_hosts_action.triggered.connect(lambda: self.run_on_hosts(item))
             copy_action = QAction("📋 Копировать содержимое", self)
             copy_action.triggered.connect(lambda: self.copy_script_content(item))
             edit_file_action = QAction("📝 Редактировать скрипт", self)
@@ -220,6 +226,8 @@ class ScriptsBlock(QWidget):
             edit_tags_action.triggered.connect(lambda: self.edit_tags_dialog(item))
             delete_action = QAction("❌ Удалить", self)
             delete_action.triggered.connect(lambda: self.delete_script_dialog(item))
+            menu.addAction(run_on_hosts_action)
+            menu.addSeparator()
             menu.addAction(copy_action)
             menu.addAction(edit_file_action)
             menu.addSeparator()
@@ -415,3 +423,48 @@ class ScriptsBlock(QWidget):
             logger.exception("Ошибка открытия скрипта в редакторе")
             Notification("Ошибка", "Не удалось открыть скрипт в редакторе", "error",
                          parent=self.window()).show_notification()
+
+    def run_on_hosts(self, item: QListWidgetItem) -> None:
+        """
+        Открывает окно параллельного запуска скрипта на нескольких Linux-хостах.
+        Подключение к хостам выполняется с учётными данными текущей SSH-сессии вкладки;
+        соединения берутся из общего пула SSH-соединений.
+
+        :param item: Выбранный элемент списка со скриптом.
+        """
+        script = item.data(Qt.UserRole)
+        script_path = script.get("path")
+        current = self.session
+        if not current.username:
+            Notification("Ошибка", "Нет SSH-сессии с учётными данными для подключения к хостам", "error",
+                         parent=self.window()).show_notification()
+            return
+        credentials = (current.username, current.password, current.root_username,
+                       current.root_password, current.port)
+
+        def runner(hostname: str, on_output, cancel) -> int:
+            session = SessionManager.acquire(hostname, *credentials)
+            try:
+                return run_script_ssh(session, script_path, on_output, cancel)
+            finally:
+                session.close_session()
+
+        dialog = ScriptFanOutDialog(script["name"], "Linux", self.hostname, runner, parent=self)
+        dialog.run_finished.connect(lambda results, name=script["name"]: self.on_hosts_run_finished(name, results))
+        dialog.show()
+
+    def on_hosts_run_finished(self, script_name: str, results: dict) -> None:
+        """
+        Сообщает о результате запуска на нескольких хостах сигналом script_executed.
+
+        :param script_name: Имя скрипта.
+        :param results: Результаты по хостам: {хост: (код возврата, длительность, ошибка)}.
+        """
+        failed = [host for host, (code, _, error) in results.items() if error or code != 0]
+        status = f"error: {len(failed)} из {len(results)} хостов" if failed else "success"
+        self.script_executed.emit(script_name, status)
+
+    def close_session(self) -> None:
+        """Останавливает запуски скриптов на хостах (вызывается при закрытии вкладки)."""
+        for dialog in self.findChildren(ScriptFanOutDialog):
+            dialog.stop_run()
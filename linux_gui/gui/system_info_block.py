@@ -97,11 +97,14 @@ class SystemInfoBlock(QWidget):
     и кнопку обновления. При необходимости отображается кнопка для запроса root‑доступа.
     """
 
-    def __init__(self, hostname: str, parent: QWidget | None = None) -> None:
+    def __init__(self, hostname: str, session: SessionManager, parent: QWidget | None = None) -> None:
         super().__init__(parent)
         self.hostname: str = hostname
-        # Изначально создаём SystemInfo без root-доступа
-        self.system_info: SystemInfo = SystemInfo(hostname)
+        self.session: SessionManager = session
+        # SSH-сессия с root-учётными данными, полученная через request_root_access()
+        self.root_session: SessionManager | None = None
+        # Изначально данные собираются через сессию вкладки
+        self.system_info: SystemInfo = SystemInfo(hostname, session=session)
         self.timer: QTimer = QTimer(self)
         self.timer.timeout.connect(self.safe_update)
         self.thread: QThread | None = None
@@ -291,8 +294,8 @@ class SystemInfoBlock(QWidget):
                 logger.error("❌ Ошибка: не удалось получить root-учётные данные.")
                 return
             root_username, root_password = credentials
-            # Пересоздаём менеджер с root-доступом
-            session = SessionManager.get_instance(
+            # Открываем отдельную сессию с root-доступом (удерживается блоком до закрытия вкладки)
+            session = SessionManager.acquire(
                 self.hostname,
                 root_username,
                 root_password,
@@ -302,6 +305,7 @@ class SystemInfoBlock(QWidget):
             try:
                 session.connect()
             except Exception as e:
+                session.close_session()
                 logger.exception("Ошибка подключения с root-доступом")
                 Notification(
                     "🔑 Ошибка root-доступа",
@@ -312,7 +316,10 @@ class SystemInfoBlock(QWidget):
 
                 return
             # Обновляем SystemInfo с новыми данными
-            self.system_info = SystemInfo(self.hostname, root_username, root_password)
+            if self.root_session is not None:
+                self.root_session.close_session()
+            self.root_session = session
+            self.system_info = SystemInfo(self.hostname, root_username, root_password, session=session)
             logger.info("✅ Root-доступ успешно получен, обновляем данные...")
             self.safe_update()
 
@@ -442,3 +449,10 @@ class SystemInfoBlock(QWidget):
             item.setTextAlignment(Qt.AlignCenter)
             item.setFlags(item.flags() & ~Qt.ItemIsEditable)
             self.disk_table.setItem(row, col, item)
+
+    def close_session(self) -> None:
+        """Останавливает автообновление и освобождает root-сессию блока (при закрытии вкладки)."""
+        self.timer.stop()
+        if self.root_session is not None:
+            self.root_session.close_session()
+            self.root_session = None
@@ -0,0 +1,165 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Set
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+logger = logging.getLogger(__name__)
+
+
+class CancelToken:
+    """
+    Токен отмены задачи. Задача может проверять его между этапами работы;
+    результат отменённой задачи не передаётся получателям.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Отменяет задачу."""
+        self._event.set()
+
+    def is_cancelled(self) -> bool:
+        """Возвращает True, если задача отменена."""
+        return self._event.is_set()
+
+
+class WorkerTask(QObject):
+    """
+    Задача общего пула. Все запросы с одинаковым ключом, поступившие
+    во время её выполнения, получают один и тот же результат.
+    """
+    succeeded = Signal(object)  # Результат функции задачи
+    failed = Signal(str)  # Текст ошибки
+    # Завершение в рабочем потоке: (задача, успех, результат или текст ошибки);
+    # доставляется пулу в GUI-поток очередью сигналов
+    completed = Signal(object, bool, object)
+
+    def __init__(self, key: Hashable, func: Callable[[CancelToken], Any]) -> None:
+        super().__init__()
+        self.key: Hashable = key
+        self.func = func
+        self.token = CancelToken()
+        # Подключённые обработчики: повторный запрос того же блока не подключает их второй раз
+        self._result_callbacks: Set[Callable[[Any], None]] = set()
+        self._error_callbacks: Set[Callable[[str], None]] = set()
+
+    def add_callbacks(self, on_result: Optional[Callable[[Any], None]] = None,
+                      on_error: Optional[Callable[[str], None]] = None) -> None:
+        """
+        Подключает обработчики результата и ошибки. Каждый обработчик
+        подключается к задаче один раз, сколько бы запросов к ней ни присоединилось.
+
+        :param on_result: Обработчик результата.
+        :param on_error: Обработчик текста ошибки.
+        """
+        if on_result is not None and on_result not in self._result_callbacks:
+            self._result_callbacks.add(on_result)
+            self.succeeded.connect(on_result)
+        if on_error is not None and on_error not in self._error_callbacks:
+            self._error_callbacks.add(on_error)
+            self.failed.connect(on_error)
+
+    def cancel(self) -> None:
+        """Отменяет задачу: результат не будет передан получателям."""
+        self.token.cancel()
+
+    def is_cancelled(self) -> bool:
+        """Возвращает True, если задача отменена."""
+        return self.token.is_cancelled()
+
+
+class _TaskRunnable(QRunnable):
+    """Выполняет функцию задачи в потоке пула."""
+
+    def __init__(self, task: WorkerTask) -> None:
+        super().__init__()
+        self.task = task
+
+    def run(self) -> None:
+        if self.task.is_cancelled():
+            self.task.completed.emit(self.task, False, "Задача отменена")
+            return
+        try:
+            result = self.task.func(self.task.token)
+        except Exception as e:
+            logger.exception(f"❌ Ошибка фоновой задачи {self.task.key}: {e}")
+            self.task.completed.emit(self.task, False, str(e))
+            return
+        self.task.completed.emit(self.task, True, result)
+
+
+class LinuxWorkerPool(QObject):
+    """
+    Общий пул потоков для блокирующих SSH-запросов блоков Linux-хоста.
+
+    Функция задачи выполняется в потоке пула и получает CancelToken; результат
+    передаётся в GUI-поток сигналами WorkerTask.succeeded/failed. Повторный
+    запрос с тем же ключом, пока задача выполняется (например, повторное нажатие
+    кнопки «Обновить»), не запускает новую задачу, а присоединяется к текущей.
+    """
+
+    MAX_THREADS: int = 4
+
+    _instance: Optional["LinuxWorkerPool"] = None
+
+    def __init__(self, max_threads: int = MAX_THREADS, parent=None) -> None:
+        super().__init__(parent)
+        # Отдельный пул: глобальный используется подключением и RDP
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max_threads)
+        self._tasks: Dict[Hashable, WorkerTask] = {}
+
+    @classmethod
+    def instance(cls) -> "LinuxWorkerPool":
+        """Возвращает общий пул (создаётся в GUI-потоке при первом обращении)."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def submit(self, key: Hashable, func: Callable[[CancelToken], Any],
+               on_result: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[str], None]] = None) -> WorkerTask:
+        """
+        Запускает задачу или присоединяется к выполняющейся задаче с тем же ключом.
+
+        :param key: Ключ задачи, например (hostname, "network").
+        :param func: Функция, выполняемая в потоке пула; принимает CancelToken.
+        :param on_result: Обработчик результата (вызывается в GUI-потоке).
+        :param on_error: Обработчик текста ошибки (вызывается в GUI-потоке).
+        :return: Задача, которую можно отменить.
+        """
+        task = self._tasks.get(key)
+        if task is None or task.is_cancelled():
+            task = WorkerTask(key, func)
+            task.completed.connect(self._finish)
+            self._tasks[key] = task
+            self.thread_pool.start(_TaskRunnable(task))
+        else:
+            logger.debug(f"🔁 Запрос {key} присоединён к выполняющейся задаче")
+        task.add_callbacks(on_result, on_error)
+        return task
+
+    def is_running(self, key: Hashable) -> bool:
+        """Возвращает True, если задача с ключом выполняется и не отменена."""
+        task = self._tasks.get(key)
+        return task is not None and not task.is_cancelled()
+
+    def cancel(self, key: Hashable) -> None:
+        """Отменяет выполняющуюся задачу с ключом (если есть)."""
+        task = self._tasks.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def _finish(self, task: WorkerTask, ok: bool, value: Any) -> None:
+        """Передаёт результат задачи получателям (в GUI-потоке)."""
+        # Задача снимается до вызова обработчиков: запрос из обработчика запускает новую
+        if self._tasks.get(task.key) is task:
+            del self._tasks[task.key]
+        if task.is_cancelled():
+            return
+        if ok:
+            task.succeeded.emit(value)
+        else:
+            task.failed.emit(str(value))
@@ -1,19 +1,31 @@
 import re
+import json
+import time
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Одна команда для данных и счётчиков: JSON-вывод iproute2 (ip -j), а на хостах
+# со старым iproute2, не поддерживающим -j, – текстовый вывод той же команды.
+NETWORK_COMMAND = "ip -j -s addr show 2>/dev/null || ip -s addr show"
+
 
 class NetworkInfo:
     """
     Класс для получения сетевой информации удалённого Linux-хоста через SSH.
 
-    Использует команду 'ip addr show' для получения сведений об интерфейсах и IP-адресах.
+    Использует команду 'ip -j -s addr show' (JSON-вывод с адресами, MTU, состоянием
+    и счётчиками интерфейсов); если iproute2 на хосте не поддерживает JSON,
+    разбирается текстовый вывод 'ip -s addr show'.
 
     Метод get_network_info() возвращает словарь с двумя ключами:
       - "raw": полный вывод команды.
-      - "interfaces": словарь, где ключ — имя интерфейса, а значение — список найденных IP-адресов.
+      - "interfaces": словарь, где ключ — имя интерфейса, а значение — сведения об интерфейсе.
+
+    Скорость приёма/передачи вычисляется по разнице счётчиков между вызовами
+    get_network_info() одного объекта, поэтому для наблюдения за скоростью
+    объект следует сохранять между обновлениями.
     """
 
     def __init__(self, client: Any) -> None:
@@ -23,6 +35,8 @@ class NetworkInfo:
         :param client: SSHClient, полученный через SessionManager.
         """
         self.client = client
+        # Предыдущие значения счётчиков: интерфейс -> (время, rx_bytes, tx_bytes)
+        self._previous: Dict[str, Tuple[float, int, int]] = {}
 
     def get_network_info(self) -> Dict[str, Any]:
         """
@@ -32,8 +46,17 @@ class NetworkInfo:
           {
               "raw": <полный вывод команды>,
               "interfaces": {
-                  "eth0": {"ips": ["192.168.1.100", ...]},
-                  "lo": {"ips": ["127.0.0.1"]},
+                  "eth0": {
+                      "ips": ["192.168.1.100", ...],
+                      "addresses": [{"family": "inet", "address": "192.168.1.100", "prefixlen": 24}, ...],
+                      "mtu": 1500,
+                      "state": "UP",
+                      "mac": "52:54:00:12:34:56",
+                      "rx_bytes": 123456,
+                      "tx_bytes": 654321,
+                      "rx_rate": 1024.0,   # байт/с, None при первом замере
+                      "tx_rate": 512.0
+                  },
                   ...
               }
           }
@@ -41,40 +64,175 @@ class NetworkInfo:
         """
         try:
             # Выполняем команду для получения информации об интерфейсах
-            stdin, stdout, stderr = self.client.exec_command("ip addr show")
+            stdin, stdout, stderr = self.client.exec_command(NETWORK_COMMAND)
             output = stdout.read().decode()
             error = stderr.read().decode()
 
             if error:
-                logger.error("Ошибка при выполнении команды 'ip addr show': %s", error)
+                logger.error("Ошибка при выполнении команды '%s': %s", NETWORK_COMMAND, error)
                 raise Exception(error)
 
-            interfaces: Dict[str, Dict[str, Any]] = {}
-            current_interface: str | None = None
+            sampled_at = time.monotonic()
+            if output.lstrip().startswith("["):
+                interfaces = self._parse_json(output)
+                raw = json.dumps(json.loads(output), indent=2, ensure_ascii=False)
+            else:
+                interfaces = self._parse_text(output)
+                raw = output
 
-            # Компилируем регулярные выражения для поиска интерфейсных строк и строк с IP-адресом
-            interface_pattern = re.compile(r'^\d+:\s+(\S+):')
-            ip_pattern = re.compile(r'inet\s+([\d\.]+)/\d+')
+            self._update_rates(interfaces, sampled_at)
+            return {"raw": raw, "interfaces": interfaces}
 
-            for line in output.splitlines():
-                line = line.strip()
+        except Exception as e:
+            logger.error("Ошибка получения сетевой информации: %s", e)
+            raise e
 
-                # Если строка соответствует описанию интерфейса (например, "2: enp0s3: <BROADCAST,...")
-                interface_match = interface_pattern.match(line)
-                if interface_match:
-                    current_interface = interface_match.group(1)
-                    interfaces[current_interface] = {"ips": []}
+    @staticmethod
+    def _new_interface() -> Dict[str, Any]:
+        """Возвращает сведения об интерфейсе со значениями по умолчанию."""
+        return {
+            "ips": [], "addresses": [], "mtu": None, "state": None, "mac": None,
+            "rx_bytes": None, "tx_bytes": None, "rx_rate": None, "tx_rate": None,
+        }
+
+    def _parse_json(self, output: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Разбирает JSON-вывод 'ip -j -s addr show'.
+
+        :param output: Вывод команды.
+        :return: Словарь сведений об интерфейсах.
+        """
+        interfaces: Dict[str, Dict[str, Any]] = {}
+        for link in json.loads(output):
+            name = link.get("ifname")
+            if not name:
+                continue
+            interface = self._new_interface()
+            interface["mtu"] = link.get("mtu")
+            interface["state"] = link.get("operstate")
+            interface["mac"] = link.get("address")
+            for addr in link.get("addr_info", []):
+                address = addr.get("local")
+                if not address:
                     continue
+                family = addr.get("family")
+                interface["addresses"].append(
+                    {"family": family, "address": address, "prefixlen": addr.get("prefixlen")}
+                )
+                if family == "inet":
+                    interface["ips"].append(address)
+            # stats64 – в новых версиях iproute2, stats – в старых
+            stats = link.get("stats64") or link.get("stats") or {}
+            interface["rx_bytes"] = stats.get("rx", {}).get("bytes")
+            interface["tx_bytes"] = stats.get("tx", {}).get("bytes")
+            interfaces[name] = interface
+        return interfaces
+
+    def _parse_text(self, output: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Разбирает текстовый вывод 'ip -s addr show' (для iproute2 без поддержки JSON).
 
-                # Если уже найден текущий интерфейс и строка содержит IP-адрес
-                if current_interface and line.startswith("inet "):
-                    ip_match = ip_pattern.search(line)
-                    if ip_match:
-                        ip_address = ip_match.group(1)
-                        interfaces[current_interface]["ips"].append(ip_address)
+        :param output: Вывод команды.
+        :return: Словарь сведений об интерфейсах.
+        """
+        interfaces: Dict[str, Dict[str, Any]] = {}
+        current_interface: str | None = None
+        # Счётчик, значение которого находится в следующей строке ("rx_bytes"/"tx_bytes")
+        pending_counter: str | None = None
+
+        # Компилируем регулярные выражения для поиска интерфейсных строк и строк с IP-адресом
+        interface_pattern = re.compile(r'^\d+:\s+([^:@\s]+)(?:@\S+)?:')
+        mtu_pattern = re.compile(r'\bmtu\s+(\d+)')
+        state_pattern = re.compile(r'\bstate\s+(\S+)')
+        link_pattern = re.compile(r'^link/\S+\s+([0-9a-fA-F:]+)')
+        ip_pattern = re.compile(r'^(inet6?)\s+([0-9a-fA-F\.:]+)/(\d+)')
+
+        for line in output.splitlines():
+            line = line.strip()
+
+            # Если строка соответствует описанию интерфейса (например, "2: enp0s3: <BROADCAST,...")
+            interface_match = interface_pattern.match(line)
+            if interface_match:
+                current_interface = interface_match.group(1)
+                interface = interfaces[current_interface] = self._new_interface()
+                mtu_match = mtu_pattern.search(line)
+                state_match = state_pattern.search(line)
+                interface["mtu"] = int(mtu_match.group(1)) if mtu_match else None
+                interface["state"] = state_match.group(1) if state_match else None
+                pending_counter = None
+                continue
+
+            if not current_interface:
+                continue
+            interface = interfaces[current_interface]
+
+            # Строка значений после заголовка "RX: bytes packets ..." / "TX: bytes packets ..."
+            if pending_counter:
+                values = line.split()
+                if values and values[0].isdigit():
+                    interface[pending_counter] = int(values[0])
+                pending_counter = None
+                continue
+            if line.startswith("RX:"):
+                pending_counter = "rx_bytes"
+                continue
+            if line.startswith("TX:"):
+                pending_counter = "tx_bytes"
+                continue
+
+            link_match = link_pattern.match(line)
+            if link_match:
+                interface["mac"] = link_match.group(1)
+                continue
+
+            ip_match = ip_pattern.match(line)
+            if ip_match:
+                family, address, prefixlen = ip_match.groups()
+                interface["addresses"].append(
+                    {"family": family, "address": address, "prefixlen": int(prefixlen)}
+                )
+                if family == "inet":
+                    interface["ips"].append(address)
+
+        return interfaces
+
+    def _update_rates(self, interfaces: Dict[str, Dict[str, Any]], sampled_at: float) -> None:
+        """
+        Вычисляет скорость приёма/передачи (байт/с) по разнице с предыдущим замером
+        и сохраняет текущие счётчики для следующего.
 
-            return {"raw": output, "interfaces": interfaces}
+        :param interfaces: Сведения об интерфейсах текущего замера.
+        :param sampled_at: Время замера (time.monotonic()).
+        """
+        previous, self._previous = self._previous, {}
+        for name, interface in interfaces.items():
+            rx_bytes, tx_bytes = interface["rx_bytes"], interface["tx_bytes"]
+            if rx_bytes is None or tx_bytes is None:
+                continue
+            self._previous[name] = (sampled_at, rx_bytes, tx_bytes)
+            if name not in previous:
+                continue
+            previous_at, previous_rx, previous_tx = previous[name]
+            elapsed = sampled_at - previous_at
+            # Уменьшение счётчика – переполнение или пересоздание интерфейса: скорость неизвестна
+            if elapsed <= 0 or rx_bytes < previous_rx or tx_bytes < previous_tx:
+                continue
+            interface["rx_rate"] = (rx_bytes - previous_rx) / elapsed
+            interface["tx_rate"] = (tx_bytes - previous_tx) / elapsed
+
+
+def format_rate(rate: Optional[float]) -> str:
+    """
+    Форматирует скорость передачи данных для отображения.
 
-        except Exception as e:
-            logger.error("Ошибка получения сетевой информации: %s", e)
-            raise e
+    :param rate: Скорость в байтах в секунду (None – неизвестна).
+    :return: Строка вида "12.3 КБ/с" или "—".
+    """
+    if rate is None:
+        return "—"
+    units: List[str] = ["Б/с", "КБ/с", "МБ/с", "ГБ/с"]
+    for unit in units[:-1]:
+        if rate < 1024:
+            return f"{rate:.1f} {unit}"
+        rate /= 1024
+    return f"{rate:.1f} {units[-1]}"
@@ -1,16 +1,79 @@
 import logging
-from typing import List, Dict, Any
+import re
+import shlex
+import threading
+from typing import List, Dict, Any, Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
+# Явный формат ps: PID первым (по нему сравниваются снимки), PPID – для построения дерева.
+# Заголовки отключены («=»), команда – последний столбец, так как может содержать пробелы.
+PS_FORMAT = "pid=,ppid=,user=,pcpu=,pmem=,time=,args="
+PS_FIELDS = ("PID", "PPID", "USER", "%CPU", "%MEM", "TIME", "COMMAND")
+STREAM_TICK_MARKER = "@@MTADMIN:TICK@@"
+
+# Ключи сортировки запроса и соответствующие им ключи "ps --sort"
+PS_SORT_KEYS = {
+    "cpu": "-pcpu", "mem": "-pmem", "pid": "pid",
+    "user": "user", "time": "-time", "command": "args",
+}
+
+# Отбор процессов на хосте: условия передаются через переменные окружения
+# (в отличие от "awk -v", ENVIRON не обрабатывает «\» в регулярных выражениях).
+# Регулярные выражения – ERE, без учёта регистра; после limit строк awk завершается.
+PS_FILTER_SCRIPT = r"""awk '
+BEGIN {
+  user = tolower(ENVIRON["MTADMIN_PS_USER"]); command = tolower(ENVIRON["MTADMIN_PS_COMMAND"])
+  min_cpu = ENVIRON["MTADMIN_PS_MIN_CPU"] + 0; min_mem = ENVIRON["MTADMIN_PS_MIN_MEM"] + 0
+  limit = ENVIRON["MTADMIN_PS_LIMIT"] + 0
+}
+{
+  args = $0
+  for (i = 1; i <= 6; i++) sub(/^[ 	]*[^ 	]+/, "", args)
+  sub(/^[ 	]+/, "", args)
+  if (user != "" && tolower($3) !~ user) next
+  if (command != "" && tolower(args) !~ command) next
+  if ($4 + 0 < min_cpu || $5 + 0 < min_mem) next
+  print
+  if (limit > 0 && ++count >= limit) exit
+}'"""
+
+# Удалённый цикл: на каждом такте снимок ps сравнивается с предыдущим (по PID),
+# и передаются только новые/изменившиеся строки («+строка») и завершившиеся PID («-PID»).
+# Снимки хранятся во временных файлах на хосте и удаляются при закрытии канала;
+# сама оболочка цикла и её дочерние процессы (ps, awk, sleep) в снимки не попадают.
+STREAM_SCRIPT = r"""
+prev=$(mktemp) || exit 1
+cur=$(mktemp) || exit 1
+trap 'rm -f "$prev" "$cur"' EXIT
+trap 'exit 0' HUP INT TERM PIPE
+while :; do
+  {ps_command} > "$cur"
+  awk -v prev="$prev" -v self="$$" '
+    $1 == self || $2 == self {{ next }}
+    FILENAME == prev {{ old[$1] = $0; next }}
+    {{ seen[$1] = 1; if (old[$1] != $0) print "+" $0 }}
+    END {{ for (pid in old) if (!(pid in seen)) print "-" pid }}
+  ' "$prev" "$cur" || exit 1
+  echo "{marker}"
+  tmp=$prev; prev=$cur; cur=$tmp
+  sleep {interval}
+done
+"""
+
 
 class ProcessManager:
     """
     Класс для получения информации о процессах на удалённом Linux-хосте через SSH.
-    Использует команду "ps aux --sort=-%cpu" для получения списка процессов,
-    аналогичного выводу htop.
+    Использует команду "ps -eo" с явным набором столбцов (включая PPID для
+    построения дерева процессов), аналогичного выводу htop. Отбор, сортировка и
+    ограничение количества процессов (query_processes) выполняются на хосте,
+    по сети передаются только подходящие строки. В онлайн-режиме (stream_processes)
+    с хоста передаются только изменения списка между тактами.
     """
 
+    STREAM_INTERVAL: float = 2.0
+
     def __init__(self, client: Any) -> None:
         """
         Инициализирует объект ProcessManager.
@@ -18,26 +81,24 @@ class ProcessManager:
         :param client: SSHClient, полученный через SessionManager.
         """
         self.client = client
+        self._stream_channel: Optional[Any] = None
+        self._stream_lock = threading.Lock()
 
     def get_processes_info(self) -> Dict[str, Any]:
         """
-        Получает информацию о процессах с удалённого хоста.
-        Используется команда "ps aux --sort=-%cpu".
+        Получает информацию обо всех процессах удалённого хоста
+        (по убыванию загрузки CPU).
 
         :return: Словарь вида:
             {
                 "raw": <полный вывод команды>,
                 "processes": [
                     {
-                        "USER": ...,
                         "PID": ...,
+                        "PPID": ...,
+                        "USER": ...,
                         "%CPU": ...,
                         "%MEM": ...,
-                        "VSZ": ...,
-                        "RSS": ...,
-                        "TTY": ...,
-                        "STAT": ...,
-                        "START": ...,
                         "TIME": ...,
                         "COMMAND": ...
                     },
@@ -46,52 +107,164 @@ class ProcessManager:
             }
         :raises Exception: При возникновении ошибок выполнения команды.
         """
+        return self.query_processes()
+
+    def query_processes(self, user: Optional[str] = None, command: Optional[str] = None,
+                        sort: str = "cpu", limit: Optional[int] = None,
+                        min_cpu: Optional[float] = None, min_mem: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Получает процессы, отобранные на удалённом хосте в конвейере ps | awk.
+
+        :param user: Регулярное выражение (ERE, без учёта регистра) для имени пользователя.
+        :param command: Регулярное выражение (ERE, без учёта регистра) для командной строки.
+        :param sort: Ключ сортировки из PS_SORT_KEYS.
+        :param limit: Максимальное количество процессов (первые по сортировке).
+        :param min_cpu: Минимальная загрузка CPU (%).
+        :param min_mem: Минимальное использование памяти (%).
+        :return: Словарь того же вида, что и get_processes_info().
+        :raises Exception: При некорректных параметрах или ошибках выполнения команды.
+        """
         try:
-            stdin, stdout, stderr = self.client.exec_command("ps aux --sort=-%cpu")
-            output = stdout.read().decode()
-            error_output = stderr.read().decode()
+            command_line = self._ps_command(user, command, sort, limit, min_cpu, min_mem)
+            stdin, stdout, stderr = self.client.exec_command(command_line)
+            output = stdout.read().decode(errors="replace")
+            error_output = stderr.read().decode(errors="replace")
             if error_output.strip():
-                raise Exception(f"Ошибка при выполнении команды ps aux: {error_output}")
+                raise Exception(f"Ошибка при выполнении команды ps: {error_output}")
             processes = self._parse_ps_output(output)
             return {"raw": output, "processes": processes}
         except Exception as e:
             logger.exception("Ошибка получения информации о процессах: %s", e)
             raise
 
-    def _parse_ps_output(self, output: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def literal_pattern(text: str) -> str:
         """
-        Парсит вывод команды ps aux и возвращает список процессов в виде словарей.
+        Экранирует текст для поиска подстроки через регулярное выражение ERE
+        (параметры user и command в query_processes).
 
-        Предполагается, что первая строка – заголовок со столбцами:
-          USER, PID, %CPU, %MEM, VSZ, RSS, TTY, STAT, START, TIME, COMMAND
+        :param text: Искомый текст.
+        :return: Регулярное выражение, совпадающее с текстом буквально.
+        """
+        return re.sub(r"([\\.^$|?*+()\[\]{}])", r"\\\1", text)
 
-        :param output: Вывод команды ps aux.
-        :return: Список словарей с данными о процессах.
+    @staticmethod
+    def _ps_command(user: Optional[str] = None, command: Optional[str] = None,
+                    sort: str = "cpu", limit: Optional[int] = None,
+                    min_cpu: Optional[float] = None, min_mem: Optional[float] = None) -> str:
         """
-        lines = output.strip().splitlines()
-        if not lines:
-            return []
+        Формирует команду ps с отбором процессов на хосте (параметры – как у query_processes).
+        Без условий отбора возвращается команда ps без awk.
+
+        :return: Строка команды для выполнения в оболочке хоста.
+        :raises Exception: При неизвестном ключе сортировки или некорректных числовых параметрах.
+        """
+        if sort not in PS_SORT_KEYS:
+            raise Exception(f"Неизвестный ключ сортировки процессов: {sort}")
+        ps_command = f"ps -eo {PS_FORMAT} --sort={PS_SORT_KEYS[sort]}"
+
+        environment: Dict[str, str] = {}
+        if user:
+            environment["MTADMIN_PS_USER"] = user
+        if command:
+            environment["MTADMIN_PS_COMMAND"] = command
+        try:
+            if limit is not None:
+                if int(limit) <= 0:
+                    raise ValueError(limit)
+                environment["MTADMIN_PS_LIMIT"] = str(int(limit))
+            if min_cpu:
+                environment["MTADMIN_PS_MIN_CPU"] = str(float(min_cpu))
+            if min_mem:
+                environment["MTADMIN_PS_MIN_MEM"] = str(float(min_mem))
+        except ValueError:
+            raise Exception(f"Некорректные параметры отбора процессов: limit={limit}, "
+                            f"min_cpu={min_cpu}, min_mem={min_mem}")
+        if not environment:
+            return ps_command
+
+        assignments = " ".join(f"{name}={shlex.quote(value)}" for name, value in environment.items())
+        return f"{ps_command} | {assignments} {PS_FILTER_SCRIPT}"
 
+    def _parse_ps_output(self, output: str) -> List[Dict[str, str]]:
+        """
+        Парсит вывод ps в формате PS_FORMAT (без строки заголовка).
+
+        :param output: Вывод команды ps.
+        :return: Список словарей с данными о процессах.
+        """
         processes: List[Dict[str, str]] = []
-        # Первая строка – заголовок, пропускаем её
-        for line in lines[1:]:
-            # Разбиваем строку на 11 частей: первые 10 столбцов фиксированы, оставшееся – команда.
-            parts = line.split(None, 10)
-            if len(parts) < 11:
-                logger.debug("Пропущена строка с недостаточным количеством столбцов: %s", line)
-                continue
-            process = {
-                "USER": parts[0],
-                "PID": parts[1],
-                "%CPU": parts[2],
-                "%MEM": parts[3],
-                "VSZ": parts[4],
-                "RSS": parts[5],
-                "TTY": parts[6],
-                "STAT": parts[7],
-                "START": parts[8],
-                "TIME": parts[9],
-                "COMMAND": parts[10]
-            }
-            processes.append(process)
+        for line in output.splitlines():
+            process = self._parse_ps_line(line)
+            if process:
+                processes.append(process)
         return processes
+
+    def stream_processes(self, interval: float = STREAM_INTERVAL,
+                         query: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Запускает на хосте цикл наблюдения за процессами и выдаёт изменения по тактам.
+        По сети передаются только новые/изменившиеся процессы и PID завершившихся;
+        первый такт содержит все процессы. Генератор завершается после stop_stream()
+        или закрытия соединения.
+
+        :param interval: Интервал между снимками (секунды).
+        :param query: Условия отбора процессов на хосте – параметры query_processes().
+        :return: Итератор словарей {"changed": [процессы], "exited": [PID]}.
+        :raises Exception: Если не удалось запустить команду на хосте.
+        """
+        ps_command = self._ps_command(**(query or {}))
+        script = STREAM_SCRIPT.format(ps_command=ps_command, marker=STREAM_TICK_MARKER, interval=interval)
+        channel = self.client.get_transport().open_session()
+        with self._stream_lock:
+            self._stream_channel = channel
+        try:
+            channel.exec_command(script)
+            changed: List[Dict[str, str]] = []
+            exited: List[str] = []
+            for raw_line in channel.makefile("rb"):
+                line = raw_line.decode(errors="replace").rstrip("\n")
+                if line == STREAM_TICK_MARKER:
+                    yield {"changed": changed, "exited": exited}
+                    changed, exited = [], []
+                elif line.startswith("+"):
+                    process = self._parse_ps_line(line[1:])
+                    if process:
+                        changed.append(process)
+                elif line.startswith("-"):
+                    exited.append(line[1:].strip())
+            with self._stream_lock:
+                stopped = self._stream_channel is not channel
+            # Канал, закрытый через stop_stream(), – штатное завершение
+            if not stopped and channel.recv_exit_status() != 0:
+                error_output = channel.makefile_stderr("rb").read().decode(errors="replace")
+                raise Exception(f"Ошибка наблюдения за процессами: {error_output.strip()}")
+        finally:
+            self.stop_stream()
+
+    def stop_stream(self) -> None:
+        """Останавливает stream_processes(): закрывает канал, удалённый цикл завершается."""
+        with self._stream_lock:
+            channel, self._stream_channel = self._stream_channel, None
+        if channel is not None:
+            try:
+                channel.close()
+            except Exception as e:
+                logger.debug("Ошибка закрытия канала наблюдения за процессами: %s", e)
+
+    @staticmethod
+    def _parse_ps_line(line: str) -> Optional[Dict[str, str]]:
+        """
+        Парсит строку вывода ps в формате PS_FORMAT.
+
+        :param line: Строка вывода ps (в онлайн-режиме – без префикса «+»).
+        :return: Словарь с полями PS_FIELDS или None для пустой/некорректной строки.
+        """
+        parts = line.split(None, len(PS_FIELDS) - 1)
+        if len(parts) < len(PS_FIELDS) - 1 or not parts[0].isdigit():
+            if line.strip():
+                logger.debug("Пропущена строка с недостаточным количеством столбцов: %s", line)
+            return None
+        if len(parts) < len(PS_FIELDS):
+            parts.append("")  # У процесса нет командной строки
+        return dict(zip(PS_FIELDS, parts))
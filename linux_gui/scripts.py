@@ -1,14 +1,34 @@
+import codecs
+import hashlib
+import io
 import json
+import posixpath
+import shlex
 import shutil
 import sys
+import time
+import uuid
 import logging
+import threading
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional, Tuple
 
 import pyperclip  # Для копирования в буфер обмена
 
 logger = logging.getLogger(__name__)
 
+# Параметры чтения вывода скрипта из SSH-канала
+CHANNEL_CHUNK_SIZE = 32768
+CHANNEL_POLL_INTERVAL = 0.1
+
+# Кэш скриптов на удалённом хосте (относительно домашнего каталога пользователя SSH):
+# файл <sha256>.sh загружается по SFTP один раз на хост для каждой версии скрипта
+REMOTE_CACHE_DIR = ".cache/mtadmin/scripts"
+
+# SHA-256 локальных скриптов: путь -> ((mtime_ns, размер), хэш)
+_digest_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_digest_lock = threading.Lock()
+
 
 def get_project_root() -> Path:
     """
@@ -169,3 +189,177 @@ class ScriptsManager:
         except Exception as e:
             logger.error(f"Ошибка при открытии скрипта: {e}")
             raise e
+
+
+def script_digest(script_path: str) -> str:
+    """
+    Возвращает SHA-256 содержимого скрипта. Хэш вычисляется заново только после
+    изменения файла – при запуске на сотнях хостов файл читается один раз.
+
+    :param script_path: Путь к скрипту.
+    :return: SHA-256 в шестнадцатеричном виде.
+    """
+    stat = Path(script_path).stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _digest_lock:
+        cached = _digest_cache.get(script_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+    digest = hashlib.sha256(Path(script_path).read_bytes()).hexdigest()
+    with _digest_lock:
+        _digest_cache[script_path] = (signature, digest)
+    return digest
+
+
+def stage_script(session, script_path: str) -> str:
+    """
+    Размещает скрипт в кэше удалённого хоста (REMOTE_CACHE_DIR/<sha256>.sh) по SFTP.
+    Если файл с таким хэшем уже есть, загрузка пропускается; изменённый скрипт получает
+    новый хэш и загружается на хост ровно один раз. Загрузка идёт во временный файл
+    с последующим переименованием, поэтому одновременные запуски не видят недописанный скрипт.
+
+    :param session: SessionManager хоста.
+    :param script_path: Путь к локальному скрипту.
+    :return: Путь к скрипту на хосте (относительно домашнего каталога).
+    :raises Exception: при ошибке SFTP.
+    """
+    digest = script_digest(script_path)
+    local_size = Path(script_path).stat().st_size
+    remote_path = posixpath.join(REMOTE_CACHE_DIR, f"{digest}.sh")
+    sftp = session.get_client().open_sftp()
+    try:
+        try:
+            if sftp.stat(remote_path).st_size == local_size:
+                logger.debug(f"Скрипт {digest[:12]} уже есть на {session.hostname}, загрузка пропущена")
+                return remote_path
+        except IOError:
+            pass
+
+        # mkdir -p по SFTP: создаём недостающие каталоги по очереди
+        current = ""
+        for part in REMOTE_CACHE_DIR.split("/"):
+            current = posixpath.join(current, part)
+            try:
+                sftp.stat(current)
+            except IOError:
+                try:
+                    sftp.mkdir(current, mode=0o700)
+                except IOError:
+                    # Каталог мог создать параллельный запуск – иначе это настоящая ошибка
+                    sftp.stat(current)
+
+        # Загружается ровно то содержимое, по которому вычислен хэш (файл мог измениться)
+        content = Path(script_path).read_bytes()
+        actual_digest = hashlib.sha256(content).hexdigest()
+        if actual_digest != digest:
+            digest = actual_digest
+            remote_path = posixpath.join(REMOTE_CACHE_DIR, f"{digest}.sh")
+        temp_path = f"{remote_path}.part-{uuid.uuid4().hex}"
+        sftp.putfo(io.BytesIO(content), temp_path)
+        sftp.chmod(temp_path, 0o700)
+        try:
+            sftp.posix_rename(temp_path, remote_path)
+        except IOError:
+            # Сервер без posix-rename: обычное переименование не заменяет существующий файл –
+            # значит, тот же скрипт уже загрузил параллельный запуск
+            try:
+                sftp.rename(temp_path, remote_path)
+            except IOError:
+                sftp.remove(temp_path)
+        logger.info(f"📤 Скрипт {Path(script_path).name} ({digest[:12]}) загружен на {session.hostname}")
+        return remote_path
+    finally:
+        sftp.close()
+
+
+def run_script_ssh(session, script_path: str,
+                   on_output: Callable[[str, str], None],
+                   cancel: threading.Event) -> int:
+    """
+    Выполняет скрипт библиотеки на удалённом хосте в отдельном канале SSH-соединения сессии
+    (соединение берётся из пула и используется совместно с блоками вкладки).
+    Скрипт размещается в кэше хоста по SHA-256 содержимого (stage_script) и запускается из него,
+    вывод передаётся по мере поступления: on_output("stdout" | "stderr", текст).
+
+    Канал открывается без терминала, поэтому закрытие канала не завершает скрипт на хосте.
+    Оболочка сначала выводит свой PID (OpenSSH запускает команду в отдельной группе процессов,
+    PID оболочки совпадает с её идентификатором), при отмене группе отправляется SIGTERM.
+
+    :param session: SessionManager хоста.
+    :param script_path: Путь к .sh скрипту.
+    :param on_output: Обработчик вывода (вызывается в потоке выполнения).
+    :param cancel: Событие отмены; при установке скрипт на хосте завершается, канал закрывается.
+    :return: Код возврата скрипта.
+    :raises Exception: при ошибке подключения, выполнения или отмене.
+    """
+    remote_path = stage_script(session, script_path)
+    if cancel.is_set():
+        raise Exception("Выполнение остановлено")
+    channel = session.get_client().get_transport().open_session()
+    pid: Optional[str] = None
+    try:
+        channel.exec_command(f'echo "$$"; exec bash {shlex.quote(remote_path)}')
+        channel.shutdown_write()
+        # Многобайтовый символ может разделиться между порциями вывода
+        decoders = {
+            "stdout": codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            "stderr": codecs.getincrementaldecoder("utf-8")(errors="replace"),
+        }
+        # Первая строка stdout – PID оболочки, до неё вывод накапливается
+        pid_buffer = b""
+        while True:
+            if cancel.is_set():
+                _terminate_remote_script(session, pid)
+                raise Exception("Выполнение остановлено")
+            # Код возврата приходит после вывода: проверяем его до чтения, чтобы не потерять хвост
+            finished = channel.exit_status_ready()
+            received = False
+            if channel.recv_ready():
+                data = channel.recv(CHANNEL_CHUNK_SIZE)
+                if pid is None:
+                    pid_buffer += data
+                    line, separator, data = pid_buffer.partition(b"\n")
+                    if separator:
+                        pid = line.strip().decode(errors="replace")
+                    else:
+                        data = b""
+                on_output("stdout", decoders["stdout"].decode(data))
+                received = True
+            if channel.recv_stderr_ready():
+                on_output("stderr", decoders["stderr"].decode(channel.recv_stderr(CHANNEL_CHUNK_SIZE)))
+                received = True
+            if not received:
+                if finished:
+                    break
+                time.sleep(CHANNEL_POLL_INTERVAL)
+        for stream, decoder in decoders.items():
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                on_output(stream, tail)
+        return channel.recv_exit_status()
+    finally:
+        channel.close()
+
+
+def _terminate_remote_script(session, pid: Optional[str]) -> None:
+    """
+    Завершает выполняющийся скрипт на хосте: SIGTERM группе процессов оболочки
+    (вместе с дочерними процессами скрипта), а если группа не найдена – самой оболочке.
+
+    :param session: SessionManager хоста.
+    :param pid: PID оболочки скрипта (None или не число – скрипт ещё не запущен).
+    """
+    if not pid or not pid.isdigit():
+        return
+    try:
+        channel = session.get_client().get_transport().open_session()
+        try:
+            channel.exec_command(f"kill -TERM -- -{pid} 2>/dev/null || kill -TERM {pid}")
+            deadline = time.monotonic() + 5
+            while not channel.exit_status_ready() and time.monotonic() < deadline:
+                time.sleep(CHANNEL_POLL_INTERVAL)
+        finally:
+            channel.close()
+        logger.info(f"⏹ Скрипт (PID {pid}) на {session.hostname} остановлен")
+    except Exception as e:
+        logger.error(f"Не удалось остановить скрипт (PID {pid}) на {session.hostname}: {e}")
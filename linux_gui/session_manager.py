@@ -1,16 +1,19 @@
 import paramiko
 import logging
-from typing import Optional
+import threading
+from typing import Dict, List, Optional, Tuple
 import time
 
 logger = logging.getLogger(__name__)
 
+# Ключ пула: (хост, порт, пользователь)
+PoolKey = Tuple[str, int, str]
 
-class SessionManager:
-    _instance: Optional["SessionManager"] = None
 
+class SessionManager:
     def __init__(self, hostname: str, username: str, password: str,
-                 root_username: Optional[str] = None, root_password: Optional[str] = None) -> None:
+                 root_username: Optional[str] = None, root_password: Optional[str] = None,
+                 port: int = 22) -> None:
         """
         Инициализирует SessionManager для работы с SSH-соединением.
 
@@ -19,63 +22,118 @@ class SessionManager:
         :param password: Пароль пользователя.
         :param root_username: (Опционально) Имя пользователя для получения root-доступа.
         :param root_password: (Опционально) Пароль для получения root-доступа.
+        :param port: Порт SSH (по умолчанию 22).
         """
         self.hostname: str = hostname
         self.username: str = username
         self.password: str = password
+        self.port: int = port
         self.root_username: Optional[str] = root_username
         self.root_password: Optional[str] = root_password
         self.client: Optional[paramiko.SSHClient] = None
         self.root_session: Optional[paramiko.SSHClient] = None  # Будет хранить сессию с правами root
+        self.last_used: float = time.monotonic()
+        self._connect_lock = threading.Lock()
+
+    @property
+    def key(self) -> PoolKey:
+        """Ключ сессии в пуле соединений."""
+        return self.hostname, self.port, self.username
 
     @classmethod
     def get_instance(cls, hostname: str, username: str, password: str,
-                     root_username: Optional[str] = None, root_password: Optional[str] = None) -> "SessionManager":
+                     root_username: Optional[str] = None, root_password: Optional[str] = None,
+                     port: int = 22) -> "SessionManager":
+        """
+        Возвращает сессию из пула соединений для (hostname, port, username).
+        Если username пуст, возвращается последняя использованная сессия хоста
+        (с любыми учётными данными). Блоки вкладки так сессию не ищут – они
+        получают SSH-сессию своей вкладки при создании.
+
+        :return: Экземпляр SessionManager.
+        """
+        return SSHConnectionPool.get_pool().get_session(
+            hostname, username, password, root_username, root_password, port
+        )
+
+    @classmethod
+    def acquire(cls, hostname: str, username: str, password: str,
+                root_username: Optional[str] = None, root_password: Optional[str] = None,
+                port: int = 22) -> "SessionManager":
         """
-        Возвращает синглтон-экземпляр SessionManager.
-        Если экземпляр ещё не создан, создаёт новый.
+        Берёт сессию из пула с увеличением счётчика ссылок.
+        Каждому вызову acquire() должен соответствовать вызов close_session().
 
         :return: Экземпляр SessionManager.
         """
-        if cls._instance is None:
-            cls._instance = cls(hostname, username, password, root_username, root_password)
-        return cls._instance
+        return SSHConnectionPool.get_pool().acquire(
+            hostname, username, password, root_username, root_password, port
+        )
+
+    def is_alive(self) -> bool:
+        """
+        Проверяет, что SSH-транспорт открыт и отвечает.
+
+        :return: True, если соединение живо.
+        """
+        if self.client is None:
+            return False
+        transport = self.client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        try:
+            transport.send_ignore()
+            return True
+        except Exception as e:
+            logger.debug(f"Проверка SSH-соединения с {self.hostname} не пройдена: {e}")
+            return False
 
     def connect(self) -> paramiko.SSHClient:
         """
-        Устанавливает SSH-соединение с удалённым хостом, если оно ещё не установлено.
+        Устанавливает SSH-соединение с удалённым хостом, если оно ещё не установлено
+        или ранее установленное соединение разорвано.
         При наличии root-учётных данных пытается получить root-доступ.
 
         :return: Экземпляр paramiko.SSHClient.
         :raises Exception: При ошибке подключения.
         """
-        if self.client is not None:
-            return self.client
+        with self._connect_lock:
+            self.last_used = time.monotonic()
+            if self.client is not None:
+                if self.is_alive():
+                    return self.client
+                logger.warning(f"SSH-соединение с {self.hostname} разорвано, переподключаемся...")
+                self._close_client()
 
-        try:
-            logger.info(f"Устанавливаем SSH-соединение с {self.hostname} (пользователь: {self.username})")
-            self.client = paramiko.SSHClient()
-            self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            self.client.connect(
-                hostname=self.hostname,
-                username=self.username,
-                password=self.password,
-                look_for_keys=False,
-                allow_agent=False
-            )
-            logger.info("SSH-соединение установлено успешно.")
+            try:
+                logger.info(f"Устанавливаем SSH-соединение с {self.hostname}:{self.port} "
+                            f"(пользователь: {self.username})")
+                self.client = paramiko.SSHClient()
+                self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+                self.client.connect(
+                    hostname=self.hostname,
+                    port=self.port,
+                    username=self.username,
+                    password=self.password,
+                    look_for_keys=False,
+                    allow_agent=False
+                )
+                transport = self.client.get_transport()
+                if transport is not None:
+                    transport.set_keepalive(SSHConnectionPool.KEEPALIVE_INTERVAL)
+                logger.info("SSH-соединение установлено успешно.")
 
-            if self.root_username and self.root_password:
-                logger.info("Обнаружены root-учётные данные, пробуем получить root-доступ...")
-                self.enable_root_session()
-            else:
-                logger.warning("Root-учётные данные НЕ переданы, работаем без root-доступа.")
+                if self.root_username and self.root_password:
+                    logger.info("Обнаружены root-учётные данные, пробуем получить root-доступ...")
+                    self.enable_root_session()
+                else:
+                    logger.warning("Root-учётные данные НЕ переданы, работаем без root-доступа.")
 
-            return self.client
-        except Exception as e:
-            logger.error(f"Не удалось установить SSH-соединение: {e}")
-            self.client = None
-            raise e
+                return self.client
+            except Exception as e:
+                logger.error(f"Не удалось установить SSH-соединение: {e}")
+                self.client = None
+                raise e
 
     def enable_root_session(self) -> None:
         """
@@ -151,7 +209,7 @@ class SessionManager:
             else:
                 full_command = command
 
-            stdin, stdout, stderr = self.client.exec_command(full_command)
+            stdin, stdout, stderr = self.get_client().exec_command(full_command)
             output = stdout.read().decode().strip()
             error = stderr.read().decode().strip()
 
@@ -166,20 +224,270 @@ class SessionManager:
     def get_client(self) -> paramiko.SSHClient:
         """
         Возвращает текущий SSH-клиент.
-        Если соединение ещё не установлено, выполняет подключение.
+        Если соединение ещё не установлено или разорвано, выполняет подключение.
 
         :return: Экземпляр paramiko.SSHClient.
         """
-        if self.client is None:
+        self.last_used = time.monotonic()
+        if self.client is None or not self.is_alive():
             self.connect()
         return self.client
 
     def close_session(self) -> None:
         """
-        Закрывает SSH-сессию и сбрасывает синглтон-экземпляр SessionManager.
+        Освобождает сессию в пуле соединений.
+        Соединение остаётся «тёплым» для других вкладок и закрывается пулом
+        после простоя дольше SSHConnectionPool.IDLE_TIMEOUT.
         """
+        SSHConnectionPool.get_pool().release(self)
+
+    def _close_client(self) -> None:
+        """Закрывает SSH-клиент без участия пула."""
         if self.client:
-            self.client.close()
-            self.client = None
-            self.root_session = None
-            SessionManager._instance = None
+            try:
+                self.client.close()
+            except Exception as e:
+                logger.debug(f"Ошибка при закрытии SSH-клиента {self.hostname}: {e}")
+        self.client = None
+        self.root_session = None
+
+
+class SSHConnectionPool:
+    """
+    Пул SSH-соединений, общий для всех вкладок приложения.
+
+    Сессии хранятся по ключу (хост, порт, пользователь) и переиспользуются,
+    поэтому повторное открытие вкладки с тем же хостом не требует нового
+    TCP-подключения, обмена ключами и аутентификации.
+    Для каждого хоста ограничено число одновременных сессий; неиспользуемые
+    сессии закрываются после простоя, мёртвые соединения отбрасываются
+    (фоновым потоком обслуживания раз в MAINTENANCE_INTERVAL секунд).
+    """
+
+    MAX_SESSIONS_PER_HOST: int = 4
+    IDLE_TIMEOUT: float = 10 * 60  # 600 секунд
+    KEEPALIVE_INTERVAL: int = 30
+    MAINTENANCE_INTERVAL: float = 60
+
+    _pool: Optional["SSHConnectionPool"] = None
+    _pool_lock = threading.Lock()
+
+    def __init__(self, max_sessions_per_host: int = MAX_SESSIONS_PER_HOST,
+                 idle_timeout: float = IDLE_TIMEOUT,
+                 maintenance_interval: float = MAINTENANCE_INTERVAL) -> None:
+        self.max_sessions_per_host: int = max_sessions_per_host
+        self.idle_timeout: float = idle_timeout
+        self.maintenance_interval: float = maintenance_interval
+        self._sessions: Dict[PoolKey, SessionManager] = {}
+        self._refs: Dict[PoolKey, int] = {}
+        # Сессии, вытесненные из пула сменой учётных данных, но ещё используемые вкладками:
+        # id(сессии) -> (сессия, счётчик ссылок). Закрываются при последнем release().
+        self._retired: Dict[int, Tuple[SessionManager, int]] = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._maintenance_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def get_pool(cls) -> "SSHConnectionPool":
+        """Возвращает общий для приложения пул соединений."""
+        with cls._pool_lock:
+            if cls._pool is None:
+                cls._pool = cls()
+                cls._pool._start_maintenance()
+            return cls._pool
+
+    def get_session(self, hostname: str, username: str, password: str,
+                    root_username: Optional[str] = None, root_password: Optional[str] = None,
+                    port: int = 22) -> SessionManager:
+        """
+        Возвращает сессию для (hostname, port, username) без изменения счётчика ссылок.
+        Если username пуст, возвращает последнюю использованную сессию хоста.
+        При смене пароля выдаётся новая сессия; прежняя закрывается, когда её
+        освободят все удерживающие её вкладки.
+
+        :return: Экземпляр SessionManager (соединение устанавливается лениво).
+        """
+        with self._lock:
+            self.evict_idle()
+            if not username:
+                session = self.find(hostname, port)
+                if session is not None:
+                    session.last_used = time.monotonic()
+                    return session
+                # Сессии для хоста ещё нет – возвращаем пустую, как и раньше
+                return SessionManager(hostname, username, password, root_username, root_password, port)
+
+            key: PoolKey = (hostname, port, username)
+            session = self._sessions.get(key)
+            if session is not None and session.password != password:
+                # Учётные данные изменились – новым вызовам нужна отдельная сессия.
+                # Сессию, которую ещё держат вкладки, не закрываем до её release().
+                logger.info(f"Учётные данные для {key} изменились, создаём новую SSH-сессию.")
+                if self._refs.get(key, 0) > 0:
+                    self._retire(key)
+                else:
+                    self._discard(key)
+                session = None
+
+            if session is None:
+                self._ensure_capacity(hostname)
+                session = SessionManager(hostname, username, password, root_username, root_password, port)
+                self._sessions[key] = session
+                self._refs.setdefault(key, 0)
+            elif root_password and session.root_password != root_password:
+                session.root_username = root_username
+                session.root_password = root_password
+                if session.client is not None:
+                    session.enable_root_session()
+
+            session.last_used = time.monotonic()
+            return session
+
+    def acquire(self, hostname: str, username: str, password: str,
+                root_username: Optional[str] = None, root_password: Optional[str] = None,
+                port: int = 22) -> SessionManager:
+        """
+        Возвращает сессию и увеличивает счётчик ссылок на неё.
+        Сессия с ненулевым счётчиком не закрывается по простою.
+        """
+        with self._lock:
+            session = self.get_session(hostname, username, password, root_username, root_password, port)
+            self._refs[session.key] = self._refs.get(session.key, 0) + 1
+            return session
+
+    def release(self, session: SessionManager) -> None:
+        """
+        Уменьшает счётчик ссылок на сессию. Соединение не закрывается сразу,
+        а остаётся в пуле до истечения IDLE_TIMEOUT.
+        """
+        with self._lock:
+            key = session.key
+            if self._sessions.get(key) is not session:
+                retired = self._retired.pop(id(session), None)
+                if retired is not None and retired[1] > 1:
+                    # Сессию со старыми учётными данными ещё держат другие вкладки
+                    self._retired[id(session)] = (session, retired[1] - 1)
+                    return
+                # Сессия не из пула (или уже вытеснена) – просто закрываем её
+                session._close_client()
+                return
+            self._refs[key] = max(0, self._refs.get(key, 0) - 1)
+            session.last_used = time.monotonic()
+            self.evict_idle()
+
+    def find(self, hostname: str, port: Optional[int] = None) -> Optional[SessionManager]:
+        """
+        Ищет последнюю использованную сессию для хоста.
+
+        :param hostname: Имя или IP-адрес хоста.
+        :param port: Порт SSH (None – любой).
+        :return: SessionManager или None.
+        """
+        with self._lock:
+            candidates = [
+                s for (host, p, _), s in self._sessions.items()
+                if host == hostname and (port is None or p == port)
+            ]
+            if not candidates:
+                return None
+            return max(candidates, key=lambda s: s.last_used)
+
+    def evict_idle(self) -> None:
+        """
+        Закрывает сессии без ссылок, простаивающие дольше idle_timeout,
+        а также сессии с разорванным транспортом.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for key, session in list(self._sessions.items()):
+                if self._refs.get(key, 0) > 0:
+                    continue
+                idle = now - session.last_used
+                if idle > self.idle_timeout:
+                    logger.info(f"Закрываем простаивающую SSH-сессию {key} ({idle:.0f} с)")
+                    self._discard(key)
+
+    def health_check(self) -> List[PoolKey]:
+        """
+        Проверяет все соединения пула и закрывает разорванные.
+        Сессии со ссылками остаются в пуле и переподключатся при следующем обращении.
+
+        :return: Список ключей сессий, у которых обнаружен разрыв.
+        """
+        with self._lock:
+            sessions = list(self._sessions.items())
+        # Проверка идёт по сети, поэтому выполняется вне блокировки пула
+        dead: List[PoolKey] = [
+            key for key, session in sessions
+            if session.client is not None and not session.is_alive()
+        ]
+        with self._lock:
+            for key in dead:
+                session = self._sessions.get(key)
+                if session is None:
+                    continue
+                if self._refs.get(key, 0) > 0:
+                    session._close_client()
+                else:
+                    self._discard(key)
+        if dead:
+            logger.warning(f"Обнаружены разорванные SSH-сессии: {dead}")
+        return dead
+
+    def close_all(self) -> None:
+        """Закрывает все соединения пула (например, при выходе из приложения)."""
+        self._stop.set()
+        with self._lock:
+            for key in list(self._sessions):
+                self._discard(key)
+            for session, _ in self._retired.values():
+                session._close_client()
+            self._retired.clear()
+
+    def _start_maintenance(self) -> None:
+        """Запускает фоновый поток закрытия простаивающих и разорванных сессий."""
+        self._maintenance_thread = threading.Thread(
+            target=self._maintenance_loop, name="SSHConnectionPool", daemon=True
+        )
+        self._maintenance_thread.start()
+
+    def _maintenance_loop(self) -> None:
+        while not self._stop.wait(self.maintenance_interval):
+            try:
+                self.evict_idle()
+                self.health_check()
+            except Exception as e:
+                logger.error(f"Ошибка обслуживания пула SSH-сессий: {e}")
+
+    def _ensure_capacity(self, hostname: str) -> None:
+        """
+        Освобождает место под новую сессию хоста, вытесняя самую давнюю сессию без ссылок.
+
+        :raises Exception: Если лимит сессий хоста исчерпан активными сессиями.
+        """
+        host_keys = [key for key in self._sessions if key[0] == hostname]
+        if len(host_keys) < self.max_sessions_per_host:
+            return
+        idle_keys = [key for key in host_keys if self._refs.get(key, 0) == 0]
+        if not idle_keys:
+            raise Exception(
+                f"Превышен лимит SSH-сессий для {hostname} ({self.max_sessions_per_host})"
+            )
+        oldest = min(idle_keys, key=lambda k: self._sessions[k].last_used)
+        logger.info(f"Лимит SSH-сессий для {hostname} достигнут, вытесняем {oldest}")
+        self._discard(oldest)
+
+    def _retire(self, key: PoolKey) -> None:
+        """
+        Убирает сессию из пула, не закрывая её: соединение закроется,
+        когда его освободят все вкладки, которые его удерживают.
+        """
+        session = self._sessions.pop(key)
+        self._retired[id(session)] = (session, self._refs.pop(key, 0))
+
+    def _discard(self, key: PoolKey) -> None:
+        """Удаляет сессию из пула и закрывает её соединение."""
+        session = self._sessions.pop(key, None)
+        self._refs.pop(key, None)
+        if session is not None:
+            session._close_client()
@@ -1,12 +1,49 @@
 import time
 import re
+import shlex
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from linux_gui.session_manager import SessionManager
+from database import db_manager
 import paramiko  # для типизации SSHClient
 
 logger = logging.getLogger(__name__)
 
+# Маркер начала секции в выводе пакетного скрипта: @@MTADMIN:<имя секции>@@
+SECTION_MARKER = re.compile(r"^@@MTADMIN:(\w+)@@$")
+
+# Фрагменты пакетного скрипта: все данные собираются за одно SSH-выполнение (один канал).
+# Неизменяемые данные (ядра, MAC, модели CPU и платы) запрашиваются только при отсутствии кэша.
+# {run_root} подставляется функцией, выполняющей команду с правами root.
+BATCH_SCRIPT_HEAD = """\
+{run_root}
+echo '@@MTADMIN:stat1@@'; grep '^cpu ' /proc/stat
+"""
+
+BATCH_SCRIPT_STATIC = """\
+echo '@@MTADMIN:nproc@@'; nproc
+echo '@@MTADMIN:mac@@'
+iface=$(ip route 2>/dev/null | awk '/^default/ {{for (i = 1; i < NF; i++) if ($i == "dev") {{print $(i + 1); exit}}}}')
+[ -z "$iface" ] && iface=$(ls /sys/class/net | grep -v '^lo$' | head -n 1)
+[ -n "$iface" ] && cat "/sys/class/net/$iface/address"
+echo '@@MTADMIN:uid@@'; id -u
+echo '@@MTADMIN:cpu_model@@'; run_root dmidecode -s processor-version 2>/dev/null
+echo '@@MTADMIN:board@@'; run_root dmidecode -s baseboard-product-name 2>/dev/null
+"""
+
+BATCH_SCRIPT_DYNAMIC = """\
+echo '@@MTADMIN:meminfo@@'; cat /proc/meminfo
+echo '@@MTADMIN:df@@'; df -B1 --output=target,size,avail,pcent -x tmpfs -x devtmpfs 2>/dev/null
+echo '@@MTADMIN:uptime@@'; cut -d' ' -f1 /proc/uptime
+echo '@@MTADMIN:btime@@'; awk '/^btime/ {{print $2}}' /proc/stat
+sleep 0.1
+echo '@@MTADMIN:stat2@@'; grep '^cpu ' /proc/stat
+"""
+
+# Ключи неизменяемых данных хоста, сохраняемых в кэше БД
+STATIC_KEYS = ("Cores", "MAC_Address", "CPU_Model", "Motherboard_Model")
+ROOT_REQUIRED = "Ошибка: требуется root-доступ"
+
 
 class SystemInfo:
     """
@@ -20,7 +57,9 @@ class SystemInfo:
         username: str = "",
         password: str = "",
         port: int = 22,
-        timeout: int = 10
+        timeout: int = 10,
+        batched: bool = True,
+        session: Optional[SessionManager] = None
     ) -> None:
         """
         Инициализация параметров подключения.
@@ -30,12 +69,28 @@ class SystemInfo:
         :param password: Пароль для SSH.
         :param port: Порт SSH (по умолчанию 22).
         :param timeout: Таймаут подключения в секундах.
+        :param batched: Собирать данные одним пакетным скриптом (один SSH-канал)
+                        вместо отдельной команды на каждую метрику.
+        :param session: SSH-сессия вкладки; если не задана, сессия берётся из пула
+                        по hostname, username и password.
         """
         self.hostname: str = hostname
         self.username: str = username
         self.password: str = password
         self.port: int = port
         self.timeout: int = timeout
+        self.batched: bool = batched
+        self.session: Optional[SessionManager] = session
+
+    def get_session(self) -> SessionManager:
+        """
+        Возвращает SSH-сессию, через которую собираются данные.
+
+        :return: Экземпляр SessionManager.
+        """
+        if self.session is not None:
+            return self.session
+        return SessionManager.get_instance(self.hostname, self.username, self.password)
 
     def get_client(self) -> paramiko.SSHClient:
         """
@@ -44,7 +99,7 @@ class SystemInfo:
 
         :return: Экземпляр paramiko.SSHClient для выполнения команд.
         """
-        session = SessionManager.get_instance(self.hostname, self.username, self.password)
+        session = self.get_session()
         client = session.get_client()
         if session.root_session:
             logger.debug("🔑 Использую root-сессию для выполнения команд")
@@ -59,39 +114,52 @@ class SystemInfo:
         :return: Словарь с данными о системе.
         """
         try:
-            session = SessionManager.get_instance(self.hostname, self.username, self.password)
+            session = self.get_session()
             session.connect()  # Переподключаемся, если соединение закрыто
             client = session.get_client()
             logger.debug("✅ Успешно подключились к SSH-серверу, начинаем сбор данных...")
 
+            if self.batched:
+                try:
+                    return self.get_system_info_batched(client, session.root_password)
+                except Exception as e:
+                    logger.warning(f"⚠️ Пакетный сбор данных не удался ({e}), "
+                                   f"переходим к сбору отдельными командами")
+
             cpu_usage: int = self.get_cpu_usage(client)
             logger.debug(f"✅ CPU Load: {cpu_usage}%")
 
-            cores: int = self.get_cpu_cores(client)
-            logger.debug(f"✅ Ядер: {cores}")
-
             mem_used, mem_total, mem_used_percent = self.get_memory_info(client)
             logger.debug(f"✅ RAM: {mem_used_percent}% использовано из {mem_total:.1f} GB")
 
             disks: List[Dict[str, Any]] = self.get_disks_info(client)
             logger.debug(f"✅ Дисков найдено: {len(disks)}")
 
-            mac_address: str = self.get_mac_address(client)
-            logger.debug(f"✅ MAC-адрес: {mac_address}")
-
-            extended_info: Dict[str, Any] = self.get_extended_info(client)
-            logger.debug(f"✅ CPU Model: {extended_info.get('CPU_Model')}")
-            logger.debug(f"✅ Motherboard Model: {extended_info.get('Motherboard_Model')}")
-            logger.debug(f"✅ Uptime: {extended_info.get('Uptime')}")
+            boot_time: Optional[float] = self.get_boot_time(client)
+            facts = self.get_cached_facts(boot_time, session.root_password)
+            if facts is None:
+                extended_info: Dict[str, Any] = self.get_extended_info(client)
+                facts = {
+                    "Cores": self.get_cpu_cores(client),
+                    "MAC_Address": self.get_mac_address(client),
+                    "CPU_Model": extended_info.get("CPU_Model", "N/A"),
+                    "Motherboard_Model": extended_info.get("Motherboard_Model", "N/A"),
+                }
+                db_manager.save_host_facts(self.hostname, facts, boot_time)
+                uptime = extended_info.get("Uptime", "N/A")
+            else:
+                uptime = self.get_uptime(client)
+            logger.debug(f"✅ Аппаратные данные: {facts}")
+            logger.debug(f"✅ Uptime: {uptime}")
 
             info: Dict[str, Any] = {
-                "CPU": {"Load": cpu_usage, "Cores": cores},
+                "CPU": {"Load": cpu_usage, "Cores": facts["Cores"]},
                 "RAM": {"UsedPercent": mem_used_percent, "TotalGB": round(mem_total, 1)},
                 "Disks": disks,
-                "MAC_Address": mac_address,
-                "CPU_Model": extended_info.get("CPU_Model", "N/A"),
-                "Motherboard_Model": extended_info.get("Motherboard_Model", "N/A"),
-                "Uptime": extended_info.get("Uptime", "N/A"),
+                "MAC_Address": facts["MAC_Address"],
+                "CPU_Model": facts["CPU_Model"],
+                "Motherboard_Model": facts["Motherboard_Model"],
+                "Uptime": uptime,
             }
             logger.debug("✅ Данные о системе успешно собраны.")
             return info
@@ -111,23 +179,42 @@ class SystemInfo:
         # Первое чтение
         stdin, stdout, stderr = client.exec_command(cmd)
         first_line = stdout.read().decode()
-        values = first_line.strip().split()
-        if len(values) < 5:
-            return 0
-        total1 = sum(int(val) for val in values[1:])
-        idle1 = int(values[4])
 
         time.sleep(0.1)
 
         # Второе чтение
         stdin, stdout, stderr = client.exec_command(cmd)
         second_line = stdout.read().decode()
-        values2 = second_line.strip().split()
-        total2 = sum(int(val) for val in values2[1:])
-        idle2 = int(values2[4])
+        return self._calc_cpu_usage(first_line, second_line)
+
+    @staticmethod
+    def _parse_cpu_stat(line: str) -> Optional[Tuple[int, int]]:
+        """
+        Разбирает строку 'cpu ...' из /proc/stat.
+
+        :param line: Строка из /proc/stat.
+        :return: Кортеж (общее время, время простоя) или None, если строка некорректна.
+        """
+        values = line.strip().split()
+        if len(values) < 5:
+            return None
+        try:
+            return sum(int(val) for val in values[1:]), int(values[4])
+        except ValueError:
+            return None
 
-        delta_total = total2 - total1
-        delta_idle = idle2 - idle1
+    def _calc_cpu_usage(self, first_line: str, second_line: str) -> int:
+        """
+        Вычисляет загрузку CPU по двум последовательным снимкам /proc/stat.
+
+        :return: Загруженность CPU в процентах.
+        """
+        first = self._parse_cpu_stat(first_line)
+        second = self._parse_cpu_stat(second_line)
+        if first is None or second is None:
+            return 0
+        delta_total = second[0] - first[0]
+        delta_idle = second[1] - first[1]
         if delta_total == 0:
             return 0
         usage = 100.0 * (delta_total - delta_idle) / delta_total
@@ -158,7 +245,15 @@ class SystemInfo:
         cmd = "cat /proc/meminfo"
         stdin, stdout, stderr = client.exec_command(cmd)
         meminfo = stdout.read().decode()
+        return self._parse_meminfo(meminfo)
 
+    @staticmethod
+    def _parse_meminfo(meminfo: str) -> tuple:
+        """
+        Разбирает содержимое /proc/meminfo.
+
+        :return: Кортеж (использовано_КБ, общий_объём_в_GB, процент_использования).
+        """
         total_match = re.search(r'^MemTotal:\s+(\d+)\s+kB', meminfo, re.MULTILINE)
         avail_match = re.search(r'^MemAvailable:\s+(\d+)\s+kB', meminfo, re.MULTILINE)
         if total_match and avail_match:
@@ -179,10 +274,19 @@ class SystemInfo:
         :param client: SSHClient для выполнения команды.
         :return: Список словарей с информацией о разделах.
         """
-        disks: List[Dict[str, Any]] = []
         cmd = "df -B1 --output=target,size,avail,pcent -x tmpfs -x devtmpfs"
         stdin, stdout, stderr = client.exec_command(cmd)
         output = stdout.read().decode()
+        return self._parse_df(output)
+
+    @staticmethod
+    def _parse_df(output: str) -> List[Dict[str, Any]]:
+        """
+        Разбирает вывод df -B1 --output=target,size,avail,pcent.
+
+        :return: Список словарей с информацией о разделах.
+        """
+        disks: List[Dict[str, Any]] = []
         lines = output.splitlines()
         if not lines or len(lines) < 2:
             return disks
@@ -219,6 +323,169 @@ class SystemInfo:
             disks.append(disk_info)
         return disks
 
+    def get_system_info_batched(self, client: paramiko.SSHClient,
+                                root_password: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Собирает все метрики одним пакетным скриптом: вместо ~10 отдельных
+        exec_command открывается один SSH-канал, а вывод разбирается по секциям.
+        Неизменяемые данные берутся из кэша БД; если хост был перезагружен,
+        они запрашиваются повторно.
+
+        :param client: SSHClient для выполнения скрипта.
+        :param root_password: Пароль для sudo (нужен для dmidecode без root-прав).
+        :return: Словарь с данными о системе в том же формате, что и get_system_info().
+        :raises Exception: Если скрипт не удалось выполнить или вывод не содержит секций.
+        """
+        facts = self.get_cached_facts(root_password=root_password)
+        sections = self._run_batch(client, root_password, static=facts is None)
+        boot_time = self._parse_float(sections.get("btime"))
+
+        if facts is None:
+            facts = self._parse_static_sections(sections)
+            db_manager.save_host_facts(self.hostname, facts, boot_time)
+        elif self.get_cached_facts(boot_time, root_password) is None:
+            logger.info(f"🔄 Хост {self.hostname} был перезагружен, обновляем аппаратные данные")
+            static_sections = self._run_batch(client, root_password, dynamic=False)
+            facts = self._parse_static_sections(static_sections)
+            db_manager.save_host_facts(self.hostname, facts, boot_time)
+
+        info = self.parse_batch_output(sections, facts)
+        logger.debug(f"✅ Данные о системе собраны пакетно: {info}")
+        return info
+
+    def _run_batch(self, client: paramiko.SSHClient, root_password: Optional[str],
+                   static: bool = True, dynamic: bool = True) -> Dict[str, str]:
+        """
+        Выполняет пакетный скрипт и возвращает его вывод, разбитый на секции.
+
+        :raises Exception: Если вывод не содержит секций.
+        """
+        script = self.build_batch_script(root_password, static=static, dynamic=dynamic)
+        stdin, stdout, stderr = client.exec_command(script, timeout=self.timeout)
+        output = stdout.read().decode(errors="replace")
+        sections = self.parse_sections(output)
+        if not sections:
+            raise Exception("Пакетный скрипт не вернул данных")
+        return sections
+
+    def get_cached_facts(self, boot_time: Optional[float] = None,
+                         root_password: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает неизменяемые данные хоста из кэша БД.
+        Кэш, собранный без root-доступа, игнорируется, если root-пароль уже известен.
+
+        :param boot_time: Текущее время загрузки хоста (Unix-время).
+        :param root_password: Пароль для sudo.
+        :return: Словарь с данными или None, если их нужно запросить заново.
+        """
+        facts = db_manager.get_host_facts(self.hostname, boot_time)
+        if not facts or any(key not in facts for key in STATIC_KEYS):
+            return None
+        if root_password and ROOT_REQUIRED in (facts["CPU_Model"], facts["Motherboard_Model"]):
+            return None
+        return facts
+
+    @staticmethod
+    def build_batch_script(root_password: Optional[str] = None,
+                           static: bool = True, dynamic: bool = True) -> str:
+        """
+        Формирует пакетный скрипт сбора данных.
+        Команды dmidecode выполняются от root: напрямую, через sudo с паролем
+        или через sudo -n (если пароль не передан).
+
+        :param root_password: Пароль для sudo.
+        :param static: Включать запрос неизменяемых данных (ядра, MAC, dmidecode).
+        :param dynamic: Включать запрос нагрузки, памяти, дисков и uptime.
+        :return: Текст shell-скрипта.
+        """
+        if root_password:
+            sudo = f"printf '%s\\n' {shlex.quote(root_password)} | sudo -S -p '' \"$@\""
+        else:
+            sudo = "sudo -n \"$@\""
+        run_root = f'run_root() {{ if [ "$(id -u)" -eq 0 ]; then "$@"; else {sudo}; fi; }}'
+        script = BATCH_SCRIPT_HEAD.format(run_root=run_root)
+        if static:
+            script += BATCH_SCRIPT_STATIC.format()
+        if dynamic:
+            script += BATCH_SCRIPT_DYNAMIC.format()
+        return script
+
+    @staticmethod
+    def parse_sections(output: str) -> Dict[str, str]:
+        """
+        Разбивает вывод пакетного скрипта на секции за один проход.
+
+        :param output: Полный вывод скрипта.
+        :return: Словарь {имя секции: текст секции}.
+        """
+        sections: Dict[str, List[str]] = {}
+        current: Optional[List[str]] = None
+        for line in output.splitlines():
+            match = SECTION_MARKER.match(line.strip())
+            if match:
+                current = sections.setdefault(match.group(1), [])
+            elif current is not None:
+                current.append(line)
+        return {name: "\n".join(lines).strip() for name, lines in sections.items()}
+
+    def parse_batch_output(self, sections: Dict[str, str],
+                           facts: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Преобразует секции пакетного вывода в словарь с данными о системе.
+
+        :param sections: Результат parse_sections().
+        :param facts: Неизменяемые данные хоста; если не переданы, берутся из секций.
+        :return: Словарь с данными о системе.
+        """
+        if facts is None:
+            facts = self._parse_static_sections(sections)
+        cpu_usage = self._calc_cpu_usage(sections.get("stat1", ""), sections.get("stat2", ""))
+        mem_used, mem_total, mem_used_percent = self._parse_meminfo(sections.get("meminfo", ""))
+        disks = self._parse_df(sections.get("df", ""))
+
+        uptime_seconds = self._parse_float(sections.get("uptime"))
+        uptime = f"{round(uptime_seconds / 3600, 1)} часов" if uptime_seconds is not None else "Ошибка"
+
+        return {
+            "CPU": {"Load": cpu_usage, "Cores": facts["Cores"]},
+            "RAM": {"UsedPercent": mem_used_percent, "TotalGB": round(mem_total, 1)},
+            "Disks": disks,
+            "MAC_Address": facts["MAC_Address"],
+            "CPU_Model": facts["CPU_Model"],
+            "Motherboard_Model": facts["Motherboard_Model"],
+            "Uptime": uptime,
+        }
+
+    def _parse_static_sections(self, sections: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Извлекает неизменяемые данные хоста из секций пакетного вывода.
+
+        :return: Словарь с ключами Cores, MAC_Address, CPU_Model, Motherboard_Model.
+        """
+        try:
+            cores = int(sections.get("nproc", ""))
+        except ValueError:
+            cores = 0
+        return {
+            "Cores": cores,
+            "MAC_Address": sections.get("mac") or "Интерфейсы не найдены",
+            "CPU_Model": self._clean_sudo_output(sections.get("cpu_model", "")) or ROOT_REQUIRED,
+            "Motherboard_Model": self._clean_sudo_output(sections.get("board", "")) or ROOT_REQUIRED,
+        }
+
+    @staticmethod
+    def _parse_float(value: Optional[str]) -> Optional[float]:
+        """Преобразует строку в число; возвращает None, если это невозможно."""
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _clean_sudo_output(output: str) -> str:
+        """Удаляет из вывода возможные приглашения sudo для ввода пароля."""
+        return re.sub(r"^\s*\S+\s*\[sudo\] пароль для root:\s*", "", output, flags=re.MULTILINE).strip()
+
     def get_mac_address(self, client: paramiko.SSHClient) -> str:
         """
         Получает MAC-адрес основного (дефолтного) сетевого интерфейса.
@@ -253,6 +520,29 @@ class SystemInfo:
         mac_address = stdout.read().decode().strip()
         return mac_address
 
+    def get_boot_time(self, client: paramiko.SSHClient) -> Optional[float]:
+        """
+        Получает время загрузки системы (строка btime из /proc/stat).
+
+        :param client: SSHClient для выполнения команд.
+        :return: Время загрузки в Unix-формате или None.
+        """
+        stdin, stdout, stderr = client.exec_command("awk '/^btime/ {print $2}' /proc/stat")
+        return self._parse_float(stdout.read().decode().strip())
+
+    def get_uptime(self, client: paramiko.SSHClient) -> str:
+        """
+        Получает время работы системы в часах.
+
+        :param client: SSHClient для выполнения команд.
+        :return: Строка вида "X часов" или "Ошибка".
+        """
+        stdin, stdout, stderr = client.exec_command("cut -d' ' -f1 /proc/uptime")
+        uptime_seconds = self._parse_float(stdout.read().decode().strip())
+        if uptime_seconds is None:
+            return "Ошибка"
+        return f"{round(uptime_seconds / 3600, 1)} часов"
+
     def get_extended_info(self, client: paramiko.SSHClient) -> Dict[str, Any]:
         """
         Получает расширенную информацию: модель процессора, материнской платы и время работы системы (uptime).
@@ -268,7 +558,7 @@ class SystemInfo:
         is_root: bool = (user_id == "0")
         logger.debug(f"👤 UID пользователя: {user_id} (Root: {is_root})")
 
-        session = SessionManager.get_instance(self.hostname, self.username, self.password)
+        session = self.get_session()
         root_password: Optional[str] = session.root_password if session.root_password else None
 
         if not is_root and not root_password:
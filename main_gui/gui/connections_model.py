@@ -0,0 +1,254 @@
+import bisect
+import logging
+from typing import Any, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt, Signal
+
+from database import db_manager
+
+logger = logging.getLogger(__name__)
+
+# Поля записи в порядке, возвращаемом db_manager: (rm, ip, os, last_connection)
+CONNECTION_FIELDS: Tuple[str, ...] = ("rm", "ip", "os", "last_connection")
+
+
+class ConnectionEvents(QObject):
+    """
+    Переносит события изменения записей из db_manager в GUI-поток:
+    изменения из фоновых потоков доставляются моделям через очередь сигналов Qt.
+    """
+    # (событие, ip, запись или None)
+    changed = Signal(str, str, object)
+
+    _instance: Optional["ConnectionEvents"] = None
+
+    @classmethod
+    def instance(cls) -> "ConnectionEvents":
+        """Возвращает общий объект событий, подписанный на db_manager (создаётся в GUI-потоке)."""
+        if cls._instance is None:
+            cls._instance = cls()
+            db_manager.subscribe(cls._instance.changed.emit)
+        return cls._instance
+
+
+class ConnectionsTableModel(QAbstractTableModel):
+    """
+    Модель таблицы подключений, загружающая записи из базы постранично.
+
+    В памяти хранятся только уже прокрученные страницы: представление (QTableView)
+    запрашивает следующую через canFetchMore()/fetchMore(), когда пользователь
+    доходит до конца загруженных строк. Строки упорядочены по убыванию
+    db_manager.connection_sort_key (сначала последние подключения).
+    Изменения записей в базе применяются к модели построчно (ConnectionEvents).
+    """
+
+    # Пользователь изменил номер РМ: (ip, новый РМ)
+    rm_changed = Signal(str, str)
+
+    PAGE_SIZE: int = 200
+
+    def __init__(self, columns: Sequence[Tuple[str, str]], editable: Sequence[str] = (),
+                 page_size: int = PAGE_SIZE, parent=None) -> None:
+        """
+        :param columns: Отображаемые столбцы: пары (поле из CONNECTION_FIELDS, заголовок).
+        :param editable: Поля, доступные для редактирования (поддерживается только "rm").
+        :param page_size: Количество записей, загружаемых за один запрос.
+        """
+        super().__init__(parent)
+        self._columns: List[Tuple[int, str]] = [
+            (CONNECTION_FIELDS.index(field), title) for field, title in columns
+        ]
+        self._editable = {CONNECTION_FIELDS.index(field) for field in editable}
+        self.page_size: int = page_size
+        self._rows: List[tuple] = []
+        self._cursor: Optional[Tuple[str, str]] = None
+        self._exhausted: bool = False
+        self._search: str = ""
+        # После clear() показываются только записи с ключом больше этого
+        self._floor: Optional[Tuple[str, str]] = None
+        ConnectionEvents.instance().changed.connect(self.apply_change)
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        value = self._rows[index.row()][self._columns[index.column()][0]]
+        return value if value is not None else ""
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self._columns[section][1]
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        if self._columns[index.column()][0] in self._editable:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.EditRole) -> bool:
+        """Сохраняет новый номер РМ в базу данных и в загруженную строку."""
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        field = self._columns[index.column()][0]
+        if field not in self._editable or field != CONNECTION_FIELDS.index("rm"):
+            return False
+
+        row = self._rows[index.row()]
+        new_rm = str(value).strip()
+        if (row[field] or "") == new_rm:
+            return False
+        ip = row[1]
+        # Строка модели обновится событием db_manager, как и в других таблицах
+        db_manager.update_rm(ip, new_rm)
+        self.rm_changed.emit(ip, new_rm)
+        return True
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        """Загружает следующую страницу записей из базы данных."""
+        if parent.isValid() or self._exhausted:
+            return
+        try:
+            page = db_manager.get_connections_page(self._cursor, self.page_size, self._search)
+        except Exception as e:
+            logger.error(f"❌ Ошибка загрузки страницы подключений: {e}")
+            self._exhausted = True
+            return
+
+        if len(page) < self.page_size:
+            self._exhausted = True
+        if not page:
+            return
+        self._cursor = db_manager.connection_sort_key(page[-1])
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    # --- Управление данными ---
+
+    def reload(self) -> None:
+        """Сбрасывает загруженные строки и загружает первую страницу заново."""
+        self.beginResetModel()
+        self._rows = []
+        self._cursor = None
+        self._exhausted = False
+        self._floor = None
+        self.endResetModel()
+        self.fetchMore()
+
+    def set_search(self, text: str) -> None:
+        """
+        Задаёт текст поиска: фильтрация выполняется запросом к базе данных,
+        модель перезагружается с первой страницы.
+
+        :param text: Текст поиска (пустая строка – все записи).
+        """
+        text = text.strip()
+        if text == self._search:
+            return
+        self._search = text
+        self.reload()
+
+    def clear(self) -> None:
+        """
+        Очищает модель без повторной загрузки из базы данных.
+        В очищенной модели появляются только новые подключения.
+        """
+        top = self._rows[0] if self._rows else next(iter(db_manager.get_connections_page(None, 1)), None)
+        self.beginResetModel()
+        self._rows = []
+        self._cursor = None
+        self._exhausted = True
+        self._floor = db_manager.connection_sort_key(top) if top else None
+        self.endResetModel()
+
+    def apply_change(self, action: str, ip: str, row_data: Optional[tuple]) -> None:
+        """
+        Применяет событие изменения записи из db_manager к одной строке.
+
+        :param action: Событие (db_manager.CONNECTION_INSERTED/UPDATED/DELETED).
+        :param ip: IP-адрес записи.
+        :param row_data: Новая запись или None при удалении.
+        """
+        if action == db_manager.CONNECTION_DELETED or row_data is None:
+            self.remove_ip(ip)
+        else:
+            self.upsert(row_data)
+
+    def row_data(self, row: int) -> tuple:
+        """
+        Возвращает запись строки.
+
+        :param row: Номер строки.
+        :return: Кортеж (rm, ip, os, last_connection).
+        """
+        return self._rows[row]
+
+    def find_ip(self, ip: str) -> int:
+        """
+        Ищет загруженную строку по IP-адресу.
+
+        :return: Номер строки или -1, если строка не загружена.
+        """
+        for row, row_data in enumerate(self._rows):
+            if row_data[1] == ip:
+                return row
+        return -1
+
+    def upsert(self, row_data: tuple) -> None:
+        """
+        Добавляет или обновляет одну запись, сохраняя порядок строк.
+        Если запись попадает за пределы загруженных страниц, она будет
+        получена при прокрутке обычным fetchMore().
+
+        :param row_data: Кортеж (rm, ip, os, last_connection).
+        """
+        row_data = tuple(row_data)
+        key = db_manager.connection_sort_key(row_data)
+        matches = not self._search or db_manager.connection_matches(row_data[1], self._search)
+        row = self.find_ip(row_data[1])
+        if row >= 0 and matches and db_manager.connection_sort_key(self._rows[row]) == key:
+            # Позиция строки не меняется – обновляем её на месте
+            self._rows[row] = row_data
+            self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+            return
+
+        self.remove_ip(row_data[1])
+        if not matches or (self._floor is not None and key <= self._floor):
+            return
+        if not self._exhausted and (self._cursor is None or key < self._cursor):
+            return
+
+        # Строки упорядочены по убыванию ключа: позиция вставки – число строк с большим ключом
+        keys = [db_manager.connection_sort_key(row) for row in reversed(self._rows)]
+        position = len(self._rows) - bisect.bisect_right(keys, key)
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._rows.insert(position, row_data)
+        self.endInsertRows()
+
+    def remove_ip(self, ip: str) -> bool:
+        """
+        Удаляет загруженную строку с указанным IP-адресом (база данных не изменяется).
+
+        :return: True, если строка была удалена.
+        """
+        row = self.find_ip(ip)
+        if row < 0:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self.endRemoveRows()
+        return True
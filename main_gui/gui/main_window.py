@@ -3,6 +3,7 @@ import os
 import logging
 import zipfile
 import shutil
+import tempfile
 import base64
 from functools import partial
 from PySide6.QtWidgets import (
@@ -330,9 +331,14 @@ class MainWindow(QMainWindow):
                     db_path = os.path.join(PROJECT_ROOT, "mtadmin.sqlite")
                 else:
                     db_path = os.path.join(PROJECT_ROOT, "database", "mtadmin.sqlite")
-                if os.path.exists(db_path):
+                if os.path.exists(db_manager.DB_PATH):
+                    # База работает в режиме WAL: копируем снимок через db_manager, а не сам файл
                     arcname = os.path.relpath(db_path, PROJECT_ROOT)
-                    zipf.write(db_path, arcname=arcname)
+                    with tempfile.TemporaryDirectory() as tmp_dir:
+                        snapshot_path = os.path.join(tmp_dir, "mtadmin.sqlite")
+                        if not db_manager.export_db(snapshot_path):
+                            raise Exception("не удалось создать копию базы данных")
+                        zipf.write(snapshot_path, arcname=arcname)
                     exported_count += 1
 
                 if os.path.exists(SCRIPTS_FOLDER):
@@ -371,10 +377,22 @@ class MainWindow(QMainWindow):
             return
 
         try:
+            if getattr(sys, 'frozen', False):
+                db_path = os.path.join(PROJECT_ROOT, "mtadmin.sqlite")
+            else:
+                db_path = os.path.join(PROJECT_ROOT, "database", "mtadmin.sqlite")
+            db_arcname = os.path.relpath(db_path, PROJECT_ROOT).replace(os.sep, "/")
+
             with zipfile.ZipFile(import_path, 'r') as zipf:
                 if os.path.exists(SCRIPTS_FOLDER):
                     shutil.rmtree(SCRIPTS_FOLDER)
-                zipf.extractall(PROJECT_ROOT)
+                members = zipf.namelist()
+                zipf.extractall(PROJECT_ROOT, members=[name for name in members if name != db_arcname])
+                # Файл базы заменяем через db_manager: он закрывает соединения и WAL-журнал
+                if db_arcname in members:
+                    with tempfile.TemporaryDirectory() as tmp_dir:
+                        if not db_manager.import_db(zipf.extract(db_arcname, tmp_dir)):
+                            raise Exception("не удалось заменить базу данных")
             QMessageBox.information(self, "Импорт данных",
                                     "Импорт данных успешно завершён.\nДля применения изменений перезапустите программу.")
         except Exception as e:
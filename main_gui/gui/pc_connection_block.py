@@ -1,16 +1,21 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
-    QPushButton, QGroupBox, QSizePolicy, QApplication
+    QPushButton, QGroupBox, QSizePolicy, QLabel
 )
 from PySide6.QtGui import QKeyEvent, QFont
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QObject, QRunnable, QThreadPool
 import socket
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Any, Dict
 
 from main_gui import utils
 from database import db_manager
 from notifications import Notification  # и функцию set_notifications_enabled, если потребуется
 
+logger = logging.getLogger(__name__)
+
 
 class IPLineEdit(QLineEdit):
     """
@@ -110,6 +115,71 @@ class IPLineEdit(QLineEdit):
             self.setStyleSheet("")
 
 
+class ConnectWorker(QRunnable, QObject):
+    """
+    Фоновая подготовка подключения: разрешение имени, проверка доступности,
+    определение ОС и обратный DNS-запрос без блокировки GUI.
+
+    Ping выполняется один раз: его TTL используется при определении ОС вместе
+    с проверкой портов (или ОС берётся из кэша). Обратный DNS-запрос выполняется
+    параллельно с ping.
+    """
+    progress = Signal(str)  # Текст текущего этапа
+    failed = Signal(str, str)  # (заголовок, сообщение)
+    succeeded = Signal(dict)  # {"ip", "os", "pc_name", "input"}
+
+    def __init__(self, input_text: str) -> None:
+        QRunnable.__init__(self)
+        QObject.__init__(self)
+        self.input_text = input_text
+
+    def run(self) -> None:
+        try:
+            self._run_pipeline()
+        except Exception as e:
+            logger.exception(f"Ошибка подготовки подключения к {self.input_text}: {e}")
+            self.failed.emit("❌ Ошибка подключения", str(e))
+
+    def _run_pipeline(self) -> None:
+        """Последовательно выполняет этапы подключения и сообщает о каждом из них."""
+        if utils.is_valid_ip(self.input_text):
+            ip_address = self.input_text
+        else:
+            self.progress.emit("🌍 Определение IP-адреса...")
+            try:
+                ip_address = socket.gethostbyname(self.input_text)
+            except socket.gaierror:
+                self.failed.emit(
+                    "🌍 Ошибка DNS",
+                    "Система не смогла определить IP-адрес по имени ПК.\nПроверьте корректность имени."
+                )
+                return
+
+        self.progress.emit(f"📡 Проверка доступности {ip_address}...")
+        executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            ping_future = executor.submit(utils.ping_ip, ip_address)
+            name_future = executor.submit(utils.get_pc_name, ip_address)
+            reachable, output = ping_future.result()
+            if not reachable:
+                self.failed.emit(
+                    "🚫 Нет ответа",
+                    "Удалённое устройство не отвечает.\nПроверьте его подключение к сети."
+                )
+                return
+            self.progress.emit("🧭 Определение ОС...")
+            # Для известных хостов ОС берётся из кэша; TTL ping используется как дополнительный признак.
+            # Если определить ОС не удалось, возвращаем "Неизвестно"
+            os_name = utils.detect_os(ip_address, ttl=utils.parse_ttl(output)) or "Неизвестно"
+            self.progress.emit("🔎 Определение имени ПК...")
+            pc_name = name_future.result() or self.input_text
+        finally:
+            # Не ждём обратного DNS-запроса, если хост недоступен
+            executor.shutdown(wait=False)
+
+        self.succeeded.emit({"ip": ip_address, "os": os_name, "pc_name": pc_name, "input": self.input_text})
+
+
 class PCConnectionBlock(QWidget):
     """
     Блок подключения к ПК. Проверяет корректность введённых данных,
@@ -125,6 +195,9 @@ class PCConnectionBlock(QWidget):
         # Явно объявляем атрибуты для корректного анализа типов
         self.ip_input: IPLineEdit | None = None
         self.connect_button: QPushButton | None = None
+        self.status_label: QLabel | None = None
+        self.worker: ConnectWorker | None = None
+        self.threadpool = QThreadPool.globalInstance()
 
         self.init_ui()
 
@@ -158,16 +231,23 @@ class PCConnectionBlock(QWidget):
 
         connection_group.setLayout(group_layout)
         main_layout.addWidget(connection_group)
+
+        # Статус текущего этапа подключения
+        self.status_label = QLabel("")
+        self.status_label.setVisible(False)
+        main_layout.addWidget(self.status_label)
         self.setLayout(main_layout)
 
     def connect_to_pc(self) -> None:
         """
-        Обрабатывает попытку подключения к ПК и показывает уведомления об успехе или ошибке.
+        Проверяет ввод и запускает подготовку подключения в фоновом потоке.
+        Ход выполнения отображается под полем ввода, GUI при этом не блокируется.
         """
         if self.connect_button is None or self.ip_input is None:
             return  # защита от ошибок, если интерфейс не инициализирован
+        if self.worker is not None:
+            return  # подключение уже выполняется
 
-        self.connect_button.setEnabled(False)
         input_text = self.ip_input.text().strip()
         parent_window = self.window()
 
@@ -180,28 +260,10 @@ class PCConnectionBlock(QWidget):
                 duration=3000,
                 parent=parent_window
             ).show_notification()
-
-            self.connect_button.setEnabled(True)
             return
 
         # Различаем корректный IP и корректное имя ПК.
-        if utils.is_valid_ip(input_text):
-            ip_address = input_text
-        elif utils.is_valid_hostname(input_text):
-            try:
-                ip_address = socket.gethostbyname(input_text)
-            except socket.gaierror:
-                Notification(
-                    "🌍 Ошибка DNS",
-                    "Система не смогла определить IP-адрес по имени ПК.\nПроверьте корректность имени.",
-                    "error",
-                    duration=3500,
-                    parent=parent_window
-                ).show_notification()
-
-                self.connect_button.setEnabled(True)
-                return
-        else:
+        if not utils.is_valid_ip(input_text) and not utils.is_valid_hostname(input_text):
             # Если ввод не является полным IP и не корректным именем ПК – возможно, это неполный ввод.
             Notification(
                 "⚠ Неверный формат",
@@ -210,49 +272,56 @@ class PCConnectionBlock(QWidget):
                 duration=3500,
                 parent=parent_window
             ).show_notification()
-
-            self.connect_button.setEnabled(True)
             return
 
-        # Устанавливаем курсор ожидания, так как операция может занять некоторое время
-        QApplication.setOverrideCursor(Qt.WaitCursor)
-        try:
-            reachable, _ = utils.ping_ip(ip_address)
-            if not reachable:
-                Notification(
-                    "🚫 Нет ответа",
-                    "Удалённое устройство не отвечает.\nПроверьте его подключение к сети.",
-                    "error",
-                    duration=4000,
-                    parent=parent_window
-                ).show_notification()
-
-                return
-
-            now = datetime.now()
-            current_time_str = now.strftime("%Y-%m-%d %H:%M:%S")
-            # Если определить ОС не удалось, возвращаем "Неизвестно"
-            os_name = utils.detect_os(ip_address) or "Неизвестно"
-
-            if self.recent_connections_block:
-                self.recent_connections_block.add_connection(ip_address, current_time_str)
-
-            db_manager.add_connection(ip_address, os_name, now)
-
-            if self.wp_map_block:
-                print("Обновляем таблицу 'Карта РМ' после подключения")
-                self.wp_map_block.refresh_table()
-
-            Notification(
-                "🔗 Подключение установлено",
-                f"Вы успешно подключились к `{ip_address}`.\nОС: `{os_name}`",
-                "success",
-                duration=3500,
-                parent=parent_window
-            ).show_notification()
+        self.connect_button.setEnabled(False)
+        self.worker = ConnectWorker(input_text)
+        self.worker.progress.connect(self.on_connect_progress)
+        self.worker.failed.connect(self.on_connect_failed)
+        self.worker.succeeded.connect(self.on_connect_succeeded)
+        self.threadpool.start(self.worker)
+
+    def on_connect_progress(self, message: str) -> None:
+        """Отображает текущий этап подключения."""
+        self.status_label.setText(message)
+        self.status_label.setVisible(True)
+
+    def on_connect_failed(self, title: str, message: str) -> None:
+        """Показывает ошибку подключения и возвращает блок в исходное состояние."""
+        self._finish_connect()
+        Notification(title, message, "error", duration=4000, parent=self.window()).show_notification()
+
+    def on_connect_succeeded(self, result: Dict[str, Any]) -> None:
+        """
+        Логирует подключение в базу, обновляет связанные виджеты и открывает вкладку ПК.
 
-            pc_name = utils.get_pc_name(ip_address) or input_text
-            self.connection_successful.emit(os_name, pc_name, ip_address)
-        finally:
-            QApplication.restoreOverrideCursor()
-            self.connect_button.setEnabled(True)
+        :param result: Словарь {"ip", "os", "pc_name", "input"} от ConnectWorker.
+        """
+        self._finish_connect()
+        ip_address = result["ip"]
+        os_name = result["os"]
+
+        now = datetime.now()
+
+        # Таблицы подключений обновят одну строку по событию db_manager
+        db_manager.add_connection(ip_address, os_name, now)
+
+        if self.recent_connections_block:
+            self.recent_connections_block.add_connection(ip_address, now.isoformat())
+
+        Notification(
+            "🔗 Подключение установлено",
+            f"Вы успешно подключились к `{ip_address}`.\nОС: `{os_name}`",
+            "success",
+            duration=3500,
+            parent=self.window()
+        ).show_notification()
+
+        self.connection_successful.emit(os_name, result["pc_name"], ip_address)
+
+    def _finish_connect(self) -> None:
+        """Сбрасывает состояние после завершения фоновой подготовки подключения."""
+        self.worker = None
+        self.status_label.setVisible(False)
+        self.status_label.setText("")
+        self.connect_button.setEnabled(True)
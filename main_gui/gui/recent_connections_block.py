@@ -1,18 +1,22 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QLineEdit, QPushButton, QTableWidget, QTableWidgetItem, QGroupBox, QHeaderView, QSizePolicy
+    QLineEdit, QPushButton, QTableView, QGroupBox, QHeaderView, QSizePolicy
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QModelIndex, QTimer
 from notifications import Notification
+from main_gui.gui.connections_model import ConnectionsTableModel
 
 
 class RecentConnectionsBlock(QWidget):
+    # Задержка перед выполнением поиска после последнего нажатия клавиши (мс)
+    SEARCH_DEBOUNCE_MS: int = 250
+
     def __init__(self, pc_connection_block=None) -> None:
         super().__init__()
         self.pc_connection_block = pc_connection_block
         self.init_ui()
         self.clear_button.clicked.connect(self.clear_connections)
-        self.connections_table.itemDoubleClicked.connect(self.on_item_double_clicked)
+        self.connections_table.doubleClicked.connect(self.on_item_double_clicked)
         self.refresh_table()  # Загружаем данные при старте
 
     def init_ui(self) -> None:
@@ -33,16 +37,23 @@ class RecentConnectionsBlock(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setObjectName("inputField")
         self.search_input.setPlaceholderText("Введите IP или дату")
-        self.search_input.textChanged.connect(self.filter_connections)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.filter_connections)
+        self.search_input.textChanged.connect(self.search_timer.start)
 
         search_layout.addWidget(search_label)
         search_layout.addWidget(self.search_input)
         group_layout.addLayout(search_layout)
 
-        # 📋 Таблица подключений
-        self.connections_table = QTableWidget(0, 2)
+        # 📋 Таблица подключений (строки подгружаются из базы по мере прокрутки)
+        self.connections_model = ConnectionsTableModel(
+            [("ip", "💻 IP"), ("last_connection", "📅 Дата")], parent=self
+        )
+        self.connections_table = QTableView()
         self.connections_table.setObjectName("connectionsTable")
-        self.connections_table.setHorizontalHeaderLabels(["💻 IP", "📅 Дата"])
+        self.connections_table.setModel(self.connections_model)
         self.connections_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.connections_table.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         group_layout.addWidget(self.connections_table)
@@ -62,15 +73,9 @@ class RecentConnectionsBlock(QWidget):
         self.setLayout(main_layout)
 
     def filter_connections(self) -> None:
-        filter_text = self.search_input.text().lower()
-        for row in range(self.connections_table.rowCount()):
-            ip_item = self.connections_table.item(row, 0)
-            date_item = self.connections_table.item(row, 1)
-            ip = ip_item.text().lower() if ip_item else ""
-            date = date_item.text().lower() if date_item else ""
-            is_visible = filter_text in ip or filter_text in date
-            self.connections_table.setRowHidden(row, not is_visible)
-        if not any(not self.connections_table.isRowHidden(row) for row in range(self.connections_table.rowCount())):
+        filter_text = self.search_input.text().strip()
+        self.connections_model.set_search(filter_text)  # Поиск выполняется запросом к базе
+        if filter_text and self.connections_model.rowCount() == 0:
             Notification(
                 "Нет совпадений",
                 "Попробуйте изменить запрос.",
@@ -80,7 +85,7 @@ class RecentConnectionsBlock(QWidget):
             ).show_notification()
 
     def clear_connections(self) -> None:
-        self.connections_table.setRowCount(0)
+        self.connections_model.clear()
         Notification(
             "Список подключений очищен",
             "Все недавние подключения удалены.",
@@ -91,20 +96,10 @@ class RecentConnectionsBlock(QWidget):
 
     def add_connection(self, ip: str, date: str, notify: bool = True) -> None:
         """
-        Добавляет новую запись в таблицу.
+        Добавляет новую запись в таблицу (повторное подключение к IP перемещает его запись).
         Если notify=False, уведомление не показывается.
         """
-        row = self.connections_table.rowCount()
-        self.connections_table.insertRow(row)
-
-        ip_item = QTableWidgetItem(ip)
-        ip_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-
-        date_item = QTableWidgetItem(date)
-        date_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-
-        self.connections_table.setItem(row, 0, ip_item)
-        self.connections_table.setItem(row, 1, date_item)
+        self.connections_model.upsert((None, ip, None, date))
 
         if notify:
             Notification(
@@ -115,15 +110,13 @@ class RecentConnectionsBlock(QWidget):
                 parent=self
             ).show_notification()
 
-    def on_item_double_clicked(self, item: QTableWidgetItem) -> None:
+    def on_item_double_clicked(self, index: QModelIndex) -> None:
         if self.pc_connection_block is None:
             print("Ошибка: pc_connection_block is None")
             return
 
-        row = item.row()
-        ip_item = self.connections_table.item(row, 0)
-        if ip_item:
-            ip_text = ip_item.text()
+        ip_text = self.connections_model.row_data(index.row())[1]
+        if ip_text:
             self.pc_connection_block.ip_input.setText(ip_text)
             Notification(
                 "Выбран IP",
@@ -135,16 +128,10 @@ class RecentConnectionsBlock(QWidget):
 
     def refresh_table(self) -> None:
         """
-        Загружает недавние подключения из базы данных и заполняет таблицу.
-        При программном обновлении уведомления не показываются.
+        Перезагружает недавние подключения из базы данных.
+        Загружается только первая страница, остальные – при прокрутке таблицы.
         """
-        from database import db_manager  # Импорт внутри метода для избежания циклических импортов
-
-        records = db_manager.get_all_connections()
-        self.connections_table.setRowCount(0)
-        for row_data in records:
-            ip, date = row_data[1], row_data[3]  # ip и last_connection
-            self.add_connection(ip, date, notify=False)
+        self.connections_model.reload()
 
     def moveEvent(self, event) -> None:
         """
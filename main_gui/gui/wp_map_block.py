@@ -1,12 +1,46 @@
+import logging
+import threading
+from typing import Any, Dict
+
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QLineEdit, QTableWidget, QTableWidgetItem, QGroupBox, QHeaderView,
-    QMenu, QMessageBox, QSizePolicy
+    QLineEdit, QTableView, QGroupBox, QHeaderView,
+    QMenu, QMessageBox, QSizePolicy, QPushButton, QCheckBox
 )
-from PySide6.QtCore import Qt, QPoint
+from PySide6.QtCore import Qt, QPoint, QThread, Signal, QModelIndex, QTimer
 from PySide6.QtGui import QAction
 from notifications import Notification
 from database import db_manager  # убедитесь, что путь импорта корректный
+from main_gui import utils
+from main_gui.gui.connections_model import ConnectionsTableModel
+
+logger = logging.getLogger(__name__)
+
+
+class SubnetScanThread(QThread):
+    """
+    Поток сканирования подсети. Найденные хосты передаются сигналом host_found
+    по мере ответа, не дожидаясь окончания сканирования.
+    """
+    host_found = Signal(dict)
+    scan_failed = Signal(str)
+
+    def __init__(self, cidr: str, icmp: bool = False) -> None:
+        super().__init__()
+        self.cidr = cidr
+        self.icmp = icmp
+        self.stop_event = threading.Event()
+
+    def run(self) -> None:
+        try:
+            utils.discover_hosts(self.cidr, self.host_found.emit, stop_event=self.stop_event, icmp=self.icmp)
+        except Exception as e:
+            logger.error(f"Ошибка сканирования подсети {self.cidr}: {e}")
+            self.scan_failed.emit(str(e))
+
+    def stop(self) -> None:
+        """Запрашивает досрочную остановку сканирования."""
+        self.stop_event.set()
 
 
 class WPMapBlock(QWidget):
@@ -15,15 +49,19 @@ class WPMapBlock(QWidget):
     позволяет фильтровать записи, редактировать номер РМ, передавать IP по двойному клику
     и удалять запись через контекстное меню.
     """
+    # Задержка перед выполнением поиска после последнего нажатия клавиши (мс)
+    SEARCH_DEBOUNCE_MS: int = 250
+
     def __init__(self, pc_connection_block=None) -> None:
         super().__init__()
         self.pc_connection_block = pc_connection_block
-        # Словарь для контроля повторного уведомления при редактировании ячейки
-        self._updating_cell: dict[tuple[int, int], str] = {}
+        self.scan_thread: SubnetScanThread | None = None
+        self._scan_found: int = 0
+        self._scan_added: int = 0
         self.init_ui()
         self.refresh_table()
-        self.wp_table.itemChanged.connect(self.update_rm_in_db)
-        self.wp_table.itemDoubleClicked.connect(self.on_item_double_clicked)
+        self.wp_model.rm_changed.connect(self.on_rm_changed)
+        self.wp_table.doubleClicked.connect(self.on_item_double_clicked)
 
     def init_ui(self) -> None:
         """Настраивает UI: поле поиска и таблица рабочих мест."""
@@ -44,16 +82,43 @@ class WPMapBlock(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setObjectName("inputField")
         self.search_input.setPlaceholderText("Введите РМ или IP")
-        self.search_input.textChanged.connect(self.filter_connections)
+        # Поиск выполняется запросом к базе после паузы в наборе текста
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.filter_connections)
+        self.search_input.textChanged.connect(self.search_timer.start)
 
         search_layout.addWidget(search_label)
         search_layout.addWidget(self.search_input)
         group_layout.addLayout(search_layout)
 
-        # Таблица рабочих мест
-        self.wp_table = QTableWidget(0, 4)
+        # Сканирование подсети
+        scan_layout = QHBoxLayout()
+        self.scan_input = QLineEdit()
+        self.scan_input.setObjectName("inputField")
+        self.scan_input.setPlaceholderText("Подсеть, например 10.0.0.0/22")
+        self.scan_icmp_checkbox = QCheckBox("ICMP")
+        self.scan_icmp_checkbox.setToolTip("Дополнительно проверять хосты с помощью ping")
+        self.scan_button = QPushButton("📡 Сканировать")
+        self.scan_button.clicked.connect(self.toggle_scan)
+        self.scan_status_label = QLabel("")
+
+        scan_layout.addWidget(self.scan_input)
+        scan_layout.addWidget(self.scan_icmp_checkbox)
+        scan_layout.addWidget(self.scan_button)
+        group_layout.addLayout(scan_layout)
+        group_layout.addWidget(self.scan_status_label)
+
+        # Таблица рабочих мест: строки подгружаются из базы по мере прокрутки
+        self.wp_model = ConnectionsTableModel(
+            [("rm", "🖥 РМ"), ("ip", "💻 IP"), ("os", "🖥 ОС"), ("last_connection", "📅 Последнее подключение")],
+            editable=("rm",),
+            parent=self
+        )
+        self.wp_table = QTableView()
         self.wp_table.setObjectName("wpTable")
-        self.wp_table.setHorizontalHeaderLabels(["🖥 РМ", "💻 IP", "🖥 ОС", "📅 Последнее подключение"])
+        self.wp_table.setModel(self.wp_model)
         self.wp_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.wp_table.customContextMenuRequested.connect(self.open_context_menu)
         self.wp_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
@@ -66,19 +131,13 @@ class WPMapBlock(QWidget):
 
     def filter_connections(self) -> None:
         """
-        Фильтрует строки таблицы по введённому значению в поле поиска.
-        Строка отображается, если в ячейке с РМ или IP содержится искомый текст.
+        Фильтрует таблицу по введённому значению в поле поиска.
+        Поиск выполняется в базе данных по РМ, IP, ОС и дате подключения.
         """
-        filter_text = self.search_input.text().lower()
-        for row in range(self.wp_table.rowCount()):
-            rm_item = self.wp_table.item(row, 0)
-            ip_item = self.wp_table.item(row, 1)
-            rm_text = rm_item.text().lower() if rm_item else ""
-            ip_text = ip_item.text().lower() if ip_item else ""
-            is_visible = filter_text in rm_text or filter_text in ip_text
-            self.wp_table.setRowHidden(row, not is_visible)
-
-        if not any(not self.wp_table.isRowHidden(row) for row in range(self.wp_table.rowCount())):
+        filter_text = self.search_input.text().strip()
+        self.wp_model.set_search(filter_text)
+
+        if filter_text and self.wp_model.rowCount() == 0:
             Notification(
                 "Поиск не дал результатов",
                 "Измените запрос и попробуйте снова.",
@@ -87,33 +146,80 @@ class WPMapBlock(QWidget):
                 parent=self.window()
             ).show_notification()
 
+    def toggle_scan(self) -> None:
+        """Запускает сканирование подсети или останавливает текущее."""
+        if self.scan_thread and self.scan_thread.isRunning():
+            self.scan_thread.stop()
+            self.scan_button.setEnabled(False)
+            self.scan_status_label.setText("⏹ Остановка сканирования...")
+            return
+
+        cidr = self.scan_input.text().strip()
+        if not cidr:
+            Notification(
+                "Сканирование",
+                "Введите подсеть, например 10.0.0.0/22.",
+                "warning",
+                duration=2500,
+                parent=self.window()
+            ).show_notification()
+            return
+
+        self._scan_found = 0
+        self._scan_added = 0
+        self.scan_thread = SubnetScanThread(cidr, icmp=self.scan_icmp_checkbox.isChecked())
+        self.scan_thread.host_found.connect(self.on_host_found)
+        self.scan_thread.scan_failed.connect(self.on_scan_failed)
+        self.scan_thread.finished.connect(self.on_scan_finished)
+        self.scan_button.setText("⏹ Остановить")
+        self.scan_status_label.setText(f"📡 Сканирование {cidr}...")
+        self.scan_thread.start()
+
+    def on_host_found(self, host: Dict[str, Any]) -> None:
+        """
+        Добавляет найденный хост в базу данных (строку в таблицу добавит событие db_manager).
+
+        :param host: Словарь из utils.probe_host().
+        """
+        self._scan_found += 1
+        if db_manager.add_discovered_host(host["ip"], host.get("os")):
+            self._scan_added += 1
+        self.scan_status_label.setText(
+            f"📡 Найдено хостов: {self._scan_found} (новых: {self._scan_added})"
+        )
+
+    def on_scan_failed(self, message: str) -> None:
+        """Сообщает об ошибке сканирования (например, неверно задана подсеть)."""
+        Notification(
+            "Ошибка сканирования",
+            message,
+            "error",
+            duration=3000,
+            parent=self.window()
+        ).show_notification()
+
+    def on_scan_finished(self) -> None:
+        """Восстанавливает состояние кнопки и показывает итоги сканирования."""
+        self.scan_button.setText("📡 Сканировать")
+        self.scan_button.setEnabled(True)
+        self.scan_status_label.setText(
+            f"✅ Сканирование завершено. Найдено: {self._scan_found}, новых: {self._scan_added}"
+        )
+
     def refresh_table(self) -> None:
         """
-        Загружает данные карты рабочих мест из базы данных и заполняет таблицу.
+        Перезагружает карту рабочих мест из базы данных.
+        Загружается только первая страница, остальные – при прокрутке таблицы.
         """
-        records = db_manager.get_all_connections()
-        self.wp_table.setRowCount(0)
-        for row_data in records:
-            row_index = self.wp_table.rowCount()
-            self.wp_table.insertRow(row_index)
-            # Заполняем 4 столбца (если данных меньше, оставляем пустую строку)
-            for col_index in range(4):
-                value = row_data[col_index] if col_index < len(row_data) and row_data[col_index] is not None else ""
-                item = QTableWidgetItem(value)
-                # Разрешаем редактирование только для первого столбца (РМ)
-                if col_index == 0:
-                    item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable)
-                else:
-                    item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                self.wp_table.setItem(row_index, col_index, item)
-
-    def on_item_double_clicked(self, item: QTableWidgetItem) -> None:
+        self.wp_model.reload()
+
+    def on_item_double_clicked(self, index: QModelIndex) -> None:
         """
         При двойном клике по ячейке столбца IP передаёт значение в поле ввода IP
         в блоке подключения, если он присутствует.
         """
-        if item.column() == 1 and self.pc_connection_block:
-            ip_text = item.text()
+        if index.column() == 1 and self.pc_connection_block:
+            ip_text = index.data()
             self.pc_connection_block.ip_input.setText(ip_text)
             Notification(
                 f"Выбран IP: {ip_text}",
@@ -123,27 +229,10 @@ class WPMapBlock(QWidget):
                 parent=self.window()
             ).show_notification()
 
-    def update_rm_in_db(self, item: QTableWidgetItem) -> None:
+    def on_rm_changed(self, ip: str, new_rm: str) -> None:
         """
-        Сохраняет изменения в номере РМ (первый столбец) в базе данных при редактировании.
-        Для каждой ячейки уведомление показывается один раз.
+        Уведомляет о сохранении нового номера РМ (модель уже записала его в базу данных).
         """
-        if item.column() != 0:
-            return
-
-        row = item.row()
-        new_rm = item.text().strip()
-        ip_item = self.wp_table.item(row, 1)
-        if not ip_item:
-            return
-        ip = ip_item.text()
-
-        key = (row, item.column())
-        if self._updating_cell.get(key) == new_rm:
-            return
-
-        db_manager.update_rm(ip, new_rm)
-        self._updating_cell[key] = new_rm
         Notification(
             "РМ обновлен",
             f"Новый РМ {new_rm} привязан к IP {ip}.",
@@ -158,23 +247,19 @@ class WPMapBlock(QWidget):
         """
         menu = QMenu()
         delete_action = QAction("Удалить запись", self)
-        selected_item = self.wp_table.itemAt(position)
-        if selected_item is None:
+        index = self.wp_table.indexAt(position)
+        if not index.isValid():
             return
 
-        delete_action.triggered.connect(lambda: self.delete_rm_entry(selected_item))
+        delete_action.triggered.connect(lambda: self.delete_rm_entry(index.row()))
         menu.addAction(delete_action)
         menu.exec(self.wp_table.viewport().mapToGlobal(position))
 
-    def delete_rm_entry(self, item: QTableWidgetItem) -> None:
+    def delete_rm_entry(self, row: int) -> None:
         """
         Удаляет запись из базы данных и из таблицы после подтверждения.
         """
-        row = item.row()
-        ip_item = self.wp_table.item(row, 1)
-        if ip_item is None:
-            return
-        ip = ip_item.text().strip()
+        ip = self.wp_model.row_data(row)[1]
         Notification(
             "Удаление записи",
             f"Вы собираетесь удалить запись с IP {ip}.",
@@ -190,8 +275,7 @@ class WPMapBlock(QWidget):
             QMessageBox.No
         )
         if reply == QMessageBox.Yes:
-            db_manager.delete_rm(ip)
-            self.wp_table.removeRow(row)
+            db_manager.delete_rm(ip)  # Строка удаляется из таблиц событием db_manager
             Notification(
                 "Запись удалена",
                 f"Рабочее место с IP {ip} успешно удалено.",
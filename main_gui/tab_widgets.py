@@ -11,11 +11,10 @@ from main_gui.gui.pc_connection_block import PCConnectionBlock
 # Импортируем другие виджеты (например, RecentConnectionsBlock, WPMapBlock)
 from main_gui.gui.recent_connections_block import RecentConnectionsBlock
 from main_gui.gui.wp_map_block import WPMapBlock
-# Импорт окон для подключения
-from windows_gui.gui.windows_window import WindowsWindow
-from linux_gui.gui.linux_window import LinuxWindow
+# Окна подключения (WindowsWindow, LinuxWindow) импортируются при первом подключении:
+# вместе с ними загружаются все их блоки и протокольные библиотеки (pypsrp, pypsexec,
+# paramiko и др.), которые не нужны для запуска и работы с картой РМ.
 from styles import apply_theme
-from linux_gui.session_manager import SessionManager
 
 class DetachedWindow(QMainWindow):
     def __init__(self, tabs_widget: 'DynamicTabs', parent: 'DynamicTabs', title: str, theme_name: str):
@@ -173,9 +172,11 @@ class DynamicTabs(QTabWidget):
 
         # В зависимости от ОС создаем нужное окно и формируем заголовок
         if os_name == "Windows":
+            from windows_gui.gui.windows_window import WindowsWindow
             new_widget = WindowsWindow(pc_name, ip)
             new_title = f"Windows: {pc_name}"
         elif os_name == "Linux":
+            from linux_gui.gui.linux_window import LinuxWindow
             new_widget = LinuxWindow(ip)
             new_title = f"Linux: {ip}"
         else:
@@ -203,6 +204,7 @@ class DynamicTabs(QTabWidget):
     def open_windows_gui(self, hostname: str, ip: str):
         """Метод для открытия вкладки с Windows-окном."""
         try:
+            from windows_gui.gui.windows_window import WindowsWindow
             windows_widget = WindowsWindow(hostname, ip)
             self.add_existing_tab(windows_widget, f"Windows: {hostname}")
             self.setCurrentIndex(self.count() - 1)  # Переключаемся на только что открытую вкладку
@@ -212,6 +214,7 @@ class DynamicTabs(QTabWidget):
     def open_linux_gui(self, ip: str):
         """Метод для открытия вкладки с Linux-окном."""
         try:
+            from linux_gui.gui.linux_window import LinuxWindow
             linux_widget = LinuxWindow(ip)
             self.add_existing_tab(linux_widget, f"Linux: {ip}")
             self.setCurrentIndex(self.count() - 1)  # Переключаемся на только что открытую вкладку
@@ -239,12 +242,6 @@ class DynamicTabs(QTabWidget):
             return
 
         widget = self.widget(index)
-        if hasattr(widget, 'session_manager') and isinstance(widget.session_manager, SessionManager):
-            try:
-                widget.session_manager.close_session()
-            except Exception as e:
-                QMessageBox.warning(self, "Ошибка", f"Ошибка при закрытии SSH-сессии: {str(e)}")
-
         if hasattr(widget, 'has_unsaved_changes') and widget.has_unsaved_changes():
             reply = QMessageBox.question(
                 self,
@@ -256,8 +253,21 @@ class DynamicTabs(QTabWidget):
             if reply == QMessageBox.No:
                 return
 
+        self.close_widget_session(widget)
         self.removeTab(index)
 
+    def close_widget_session(self, widget: QWidget):
+        """
+        Освобождает сессию окна подключения (LinuxWindow, WindowsWindow) перед закрытием вкладки.
+
+        :param widget: Виджет закрываемой вкладки.
+        """
+        if hasattr(widget, 'close_session'):
+            try:
+                widget.close_session()
+            except Exception as e:
+                QMessageBox.warning(self, "Ошибка", f"Ошибка при закрытии сессии: {str(e)}")
+
     def rename_tab(self, index: int):
         current_title = self.tabText(index)
         new_title, ok = QInputDialog.getText(self, "Переименовать вкладку", "Введите новое название:",
@@ -316,11 +326,13 @@ class DynamicTabs(QTabWidget):
     def close_other_tabs(self, current_index: int):
         for i in reversed(range(self.count())):
             if i != current_index and i not in self.pinned_tabs:
+                self.close_widget_session(self.widget(i))
                 self.removeTab(i)
 
     def close_tabs_to_right(self, current_index: int):
         for i in reversed(range(current_index + 1, self.count())):
             if i not in self.pinned_tabs:
+                self.close_widget_session(self.widget(i))
                 self.removeTab(i)
 
     def toggle_pin_tab(self, index: int):
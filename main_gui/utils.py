@@ -1,9 +1,21 @@
 import re
+import asyncio
+import threading
 import subprocess
 import platform
 import socket
 import ipaddress
-from typing import Optional, Tuple
+from typing import AsyncIterator, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Any
+
+# Порты, по которым определяется доступность хоста при сканировании сети, и их ОС
+DISCOVERY_PORTS: Dict[int, str] = {22: "Linux", 3389: "Windows", 5985: "Windows"}
+# Максимальное число одновременно проверяемых хостов при сканировании
+DISCOVERY_CONCURRENCY: int = 256
+# Порты, характерные для Windows (RPC, SMB, RDP, WinRM)
+WINDOWS_PORTS: Tuple[int, ...] = (135, 445, 3389, 5985)
+# Порты, открытый хотя бы один из которых считается признаком Windows (без SMB – его поднимает и Samba)
+WINDOWS_ONLY_PORTS: FrozenSet[int] = frozenset({135, 3389, 5985})
+SSH_PORT: int = 22
 
 def is_potential_ip(text: str) -> bool:
     """Проверяет, состоит ли строка только из цифр и точек (потенциальный IP)."""
@@ -93,26 +105,54 @@ def ping_ip(ip: str, timeout: int = 1000) -> Tuple[bool, str]:
     except Exception as e:
         return False, f"Ошибка выполнения ping: {e}"
 
-def detect_os(ip: str) -> Optional[str]:
+def detect_os(ip: str, ttl: Optional[int] = None, use_cache: bool = True) -> Optional[str]:
     """
-    Определяет операционную систему удалённого ПК по TTL в ответе ping.
+    Определяет операционную систему удалённого ПК.
+    Сначала проверяется кэш в базе данных; при промахе параллельно опрашиваются
+    характерные порты (см. fingerprint_os), результат сохраняется в кэш.
 
     :param ip: IP-адрес для проверки
-    :return: "Windows", "Linux/Unix", "Сетевое устройство (роутер, коммутатор и т. д.)" или None, если определить не удалось.
+    :param ttl: TTL из уже выполненного ping (если есть) – используется как дополнительный признак
+    :param use_cache: Использовать ли кэш в базе данных
+    :return: "Windows", "Linux", "Сетевое устройство (роутер, коммутатор и т. д.)" или None, если определить не удалось.
     """
-    reachable, output = ping_ip(ip)
-    if not reachable:
-        return None
+    from database import db_manager  # Импорт внутри функции для избежания циклических импортов
+
+    if use_cache:
+        cached = db_manager.get_cached_os(ip)
+        if cached:
+            return cached
+
+    os_name = asyncio.run(fingerprint_os(ip, ttl))
+    if os_name:
+        db_manager.save_os_fingerprint(ip, os_name)
+    return os_name
+
+def parse_ttl(output: str) -> Optional[int]:
+    """
+    Извлекает TTL из вывода ping.
 
+    :param output: Вывод команды ping
+    :return: Значение TTL или None
+    """
     match = re.search(r"TTL=(\d+)", output, re.IGNORECASE)
-    if match:
-        ttl = int(match.group(1))
-        if 110 <= ttl <= 130:
-            return "Windows"
-        elif 50 <= ttl <= 70:
-            return "Linux"
-        elif ttl > 200:
-            return "Сетевое устройство (роутер, коммутатор и т. д.)"
+    return int(match.group(1)) if match else None
+
+def os_from_ttl(ttl: Optional[int]) -> Optional[str]:
+    """
+    Определяет операционную систему по TTL.
+
+    :param ttl: Значение TTL из ответа ping
+    :return: Название ОС или None, если определить не удалось.
+    """
+    if ttl is None:
+        return None
+    if 110 <= ttl <= 130:
+        return "Windows"
+    elif 50 <= ttl <= 70:
+        return "Linux"
+    elif ttl > 200:
+        return "Сетевое устройство (роутер, коммутатор и т. д.)"
     return None
 
 def get_pc_name(ip: str) -> Optional[str]:
@@ -132,3 +172,203 @@ def get_pc_name(ip: str) -> Optional[str]:
         return None
     except Exception:
         return None
+
+async def probe_port(ip: str, port: int, timeout: float = 1.0) -> Optional[bool]:
+    """
+    Проверяет TCP-порт попыткой установить соединение.
+
+    :param ip: IP-адрес
+    :param port: Номер порта
+    :param timeout: Таймаут подключения в секундах
+    :return: True – порт открыт; False – соединение отклонено (хост доступен, порт закрыт);
+             None – ответа нет (хост недоступен или порт фильтруется).
+    """
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+    except ConnectionRefusedError:
+        return False
+    except (asyncio.TimeoutError, OSError):
+        return None
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except Exception:
+        pass
+    return True
+
+async def read_banner(ip: str, port: int, timeout: float = 1.0) -> Optional[str]:
+    """
+    Подключается к порту и читает первую строку, которую отправляет сервер (например, SSH-баннер).
+
+    :param ip: IP-адрес
+    :param port: Номер порта
+    :param timeout: Таймаут в секундах
+    :return: Строка баннера или None, если порт закрыт или сервер ничего не отправил.
+    """
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+    except (asyncio.TimeoutError, OSError):
+        return None
+    try:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+        return line.decode(errors="ignore").strip() or None
+    except (asyncio.TimeoutError, OSError):
+        return None
+    finally:
+        writer.close()
+
+async def fingerprint_os(ip: str, ttl: Optional[int] = None, timeout: float = 1.0) -> Optional[str]:
+    """
+    Определяет ОС по открытым портам: SSH-баннер порта 22 и порты Windows
+    (135, 445, 3389, 5985) проверяются параллельно. SSH-баннер не-Windows
+    сервера важнее портов Windows, а открытого SMB (445) недостаточно –
+    его часто поднимает Samba на Linux. TTL используется, если по портам
+    определить ОС не удалось.
+
+    :param ip: IP-адрес
+    :param ttl: TTL из ответа ping (если известен)
+    :param timeout: Таймаут проверки каждого порта в секундах
+    :return: Название ОС или None.
+    """
+    banner, *windows_results = await asyncio.gather(
+        read_banner(ip, SSH_PORT, timeout),
+        *(probe_port(ip, port, timeout) for port in WINDOWS_PORTS)
+    )
+    if banner and banner.startswith("SSH-"):
+        return "Windows" if "windows" in banner.lower() else "Linux"
+    open_ports = {port for port, result in zip(WINDOWS_PORTS, windows_results) if result}
+    if open_ports & WINDOWS_ONLY_PORTS:
+        return "Windows"
+    return os_from_ttl(ttl)
+
+async def async_ping(ip: str, timeout: int = 1000) -> Tuple[bool, Optional[int]]:
+    """
+    Асинхронный ping без блокировки цикла событий.
+
+    :param ip: IP-адрес
+    :param timeout: Таймаут в миллисекундах
+    :return: Кортеж (доступен ли хост, TTL ответа или None)
+    """
+    system = platform.system().lower()
+    if system == 'windows':
+        cmd = ["ping", "-n", "1", "-w", str(timeout), ip]
+    elif system == 'darwin':
+        cmd = ["ping", "-c", "1", ip]
+    else:
+        cmd = ["ping", "-c", "1", "-W", str(max(1, int(timeout / 1000))), ip]
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+        )
+    except Exception:
+        return False, None
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout / 1000.0 + 1)
+    except asyncio.TimeoutError:
+        process.kill()
+        return False, None
+    output = stdout.decode(errors="ignore")
+    return process.returncode == 0, parse_ttl(output)
+
+async def probe_host(ip: str, ports: Iterable[int] = tuple(DISCOVERY_PORTS), timeout: float = 1.0,
+                     icmp: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Проверяет хост: параллельно подключается к TCP-портам и (опционально) выполняет ping.
+
+    :param ip: IP-адрес
+    :param ports: Проверяемые TCP-порты
+    :param timeout: Таймаут в секундах
+    :param icmp: Выполнять ли ping
+    :return: Словарь {"ip", "open_ports", "ttl", "os"} для доступного хоста или None.
+    """
+    ports = list(ports)
+    tasks = [probe_port(ip, port, timeout) for port in ports]
+    if icmp:
+        tasks.append(async_ping(ip, int(timeout * 1000)))
+    results = await asyncio.gather(*tasks)
+
+    port_results = results[:len(ports)]
+    ping_ok, ttl = results[len(ports)] if icmp else (False, None)
+    alive = ping_ok or any(result is not None for result in port_results)
+    if not alive:
+        return None
+
+    open_ports = [port for port, result in zip(ports, port_results) if result]
+    # Порты Windows важнее SSH: на Windows-хосте может работать OpenSSH
+    os_names = {DISCOVERY_PORTS[port] for port in open_ports if port in DISCOVERY_PORTS}
+    os_name = "Windows" if "Windows" in os_names else next(iter(os_names), None)
+    return {
+        "ip": ip,
+        "open_ports": open_ports,
+        "ttl": ttl,
+        "os": os_name or os_from_ttl(ttl),
+    }
+
+async def sweep_subnet(cidr: str, ports: Iterable[int] = tuple(DISCOVERY_PORTS), timeout: float = 1.0,
+                       icmp: bool = False, concurrency: int = DISCOVERY_CONCURRENCY,
+                       stop_event: Optional[threading.Event] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Сканирует диапазон адресов (CIDR) и выдаёт найденные хосты по мере ответа.
+    Одновременно проверяется не более concurrency хостов.
+
+    :param cidr: Диапазон адресов, например "10.0.0.0/22" (одиночный адрес тоже допустим)
+    :param ports: Проверяемые TCP-порты
+    :param timeout: Таймаут проверки в секундах
+    :param icmp: Выполнять ли дополнительно ping
+    :param concurrency: Максимальное число одновременно проверяемых хостов
+    :param stop_event: Событие для досрочной остановки сканирования
+    :return: Асинхронный итератор словарей, возвращаемых probe_host()
+    :raises ValueError: Если диапазон задан некорректно.
+    """
+    network = ipaddress.ip_network(cidr.strip(), strict=False)
+    hosts = iter(network.hosts() if network.num_addresses > 1 else [network.network_address])
+    ports = tuple(ports)
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def worker() -> None:
+        for address in hosts:
+            if stop_event is not None and stop_event.is_set():
+                break
+            try:
+                result = await probe_host(str(address), ports, timeout, icmp)
+            except Exception:
+                result = None
+            if result is not None:
+                await results.put(result)
+        await results.put(None)  # Маркер завершения воркера
+
+    workers_count = max(1, min(concurrency, network.num_addresses))
+    workers = [asyncio.create_task(worker()) for _ in range(workers_count)]
+    finished = 0
+    try:
+        while finished < workers_count:
+            item = await results.get()
+            if item is None:
+                finished += 1
+                continue
+            yield item
+    finally:
+        for task in workers:
+            task.cancel()
+
+def discover_hosts(cidr: str, on_found: Callable[[Dict[str, Any]], None],
+                   stop_event: Optional[threading.Event] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+    """
+    Синхронная обёртка над sweep_subnet() для запуска в рабочем потоке (например, QThread).
+
+    :param cidr: Диапазон адресов
+    :param on_found: Функция, вызываемая для каждого найденного хоста
+    :param stop_event: Событие для досрочной остановки сканирования
+    :param kwargs: Дополнительные параметры sweep_subnet()
+    :return: Список всех найденных хостов
+    """
+    found: List[Dict[str, Any]] = []
+
+    async def run() -> None:
+        async for host in sweep_subnet(cidr, stop_event=stop_event, **kwargs):
+            found.append(host)
+            on_found(host)
+
+    asyncio.run(run())
+    return found
@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+logger = logging.getLogger(__name__)
+
+# Функция выполнения скрипта на одном хосте: (хост, on_output(поток, текст), событие отмены) -> код возврата
+HostRunner = Callable[[str, Callable[[str, str], None], threading.Event], int]
+
+
+class HostSlots:
+    """
+    Ограничение числа одновременных запусков скриптов на одном хосте,
+    общее для всех запусков приложения (например, двух открытых окон запуска).
+    """
+
+    _semaphores: Dict[str, threading.BoundedSemaphore] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, hostname: str, limit: int) -> threading.BoundedSemaphore:
+        """Возвращает семафор хоста (создаётся при первом обращении с указанным лимитом)."""
+        with cls._lock:
+            semaphore = cls._semaphores.get(hostname)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(limit)
+                cls._semaphores[hostname] = semaphore
+            return semaphore
+
+
+class HostRun(QRunnable, QObject):
+    """
+    Выполнение скрипта на одном хосте в потоке пула.
+    Вывод и результат передаются сигналами в GUI-поток.
+    """
+    started = Signal(str)  # Хост
+    output = Signal(str, str, str)  # Хост, поток ("stdout"/"stderr"), текст
+    finished = Signal(str, object, float, str)  # Хост, код возврата (None при ошибке), длительность, ошибка
+
+    SLOT_WAIT_INTERVAL: float = 0.5
+
+    def __init__(self, hostname: str, runner: HostRunner, cancel: threading.Event,
+                 max_runs_per_host: int) -> None:
+        QRunnable.__init__(self)
+        QObject.__init__(self)
+        self.hostname: str = hostname
+        self.runner = runner
+        self.cancel = cancel
+        self.max_runs_per_host: int = max_runs_per_host
+
+    def run(self) -> None:
+        slots = HostSlots.get(self.hostname, self.max_runs_per_host)
+        # Ждём свободного слота хоста, не теряя реакции на отмену
+        while not slots.acquire(timeout=self.SLOT_WAIT_INTERVAL):
+            if self.cancel.is_set():
+                self.finished.emit(self.hostname, None, 0.0, "Выполнение остановлено")
+                return
+        started = time.monotonic()
+        try:
+            if self.cancel.is_set():
+                raise Exception("Выполнение остановлено")
+            self.started.emit(self.hostname)
+            exit_code = self.runner(self.hostname, self._emit_output, self.cancel)
+        except Exception as e:
+            logger.error(f"❌ Ошибка выполнения скрипта на {self.hostname}: {e}")
+            self.finished.emit(self.hostname, None, time.monotonic() - started, str(e))
+        else:
+            self.finished.emit(self.hostname, exit_code, time.monotonic() - started, "")
+        finally:
+            slots.release()
+
+    def _emit_output(self, stream: str, text: str) -> None:
+        if text:
+            self.output.emit(self.hostname, stream, text)
+
+
+class ScriptFanOut(QObject):
+    """
+    Параллельный запуск скрипта на нескольких хостах.
+
+    Каждый хост выполняется в отдельной задаче собственного пула (не более
+    max_parallel_hosts одновременно); на одном хосте одновременно выполняется
+    не более max_runs_per_host запусков. Вывод хостов приходит по мере поступления
+    сигналом output, результат каждого хоста – сигналом host_finished.
+    """
+    host_started = Signal(str)  # Хост
+    output = Signal(str, str, str)  # Хост, поток, текст
+    host_finished = Signal(str, object, float, str)  # Хост, код возврата, длительность, ошибка
+    finished = Signal()  # Все хосты завершены
+
+    MAX_PARALLEL_HOSTS: int = 8
+    MAX_RUNS_PER_HOST: int = 1
+
+    def __init__(self, runner: HostRunner, max_parallel_hosts: int = MAX_PARALLEL_HOSTS,
+                 max_runs_per_host: int = MAX_RUNS_PER_HOST, parent: Optional[QObject] = None) -> None:
+        """
+        :param runner: Функция выполнения скрипта на одном хосте.
+        :param max_parallel_hosts: Число хостов, обрабатываемых одновременно.
+        :param max_runs_per_host: Число одновременных запусков на одном хосте.
+        :param parent: Родительский объект.
+        """
+        super().__init__(parent)
+        self.runner = runner
+        self.max_runs_per_host: int = max_runs_per_host
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max_parallel_hosts)
+        self.cancel_event = threading.Event()
+        self.pending: List[str] = []
+        self.runs: List[HostRun] = []
+
+    def start(self, hostnames: List[str]) -> None:
+        """
+        Запускает скрипт на всех хостах (повторяющиеся хосты отбрасываются).
+
+        :param hostnames: Список хостов.
+        :raises Exception: Если предыдущий запуск ещё выполняется.
+        """
+        if self.is_running():
+            raise Exception("Предыдущий запуск ещё не завершён")
+        self.cancel_event = threading.Event()
+        self.pending = list(dict.fromkeys(hostnames))
+        self.runs = []
+        logger.info(f"▶ Запуск скрипта на {len(self.pending)} хостах")
+        for hostname in self.pending:
+            run = HostRun(hostname, self.runner, self.cancel_event, self.max_runs_per_host)
+            run.started.connect(self.host_started)
+            run.output.connect(self.output)
+            run.finished.connect(self._on_host_finished)
+            self.runs.append(run)
+            self.thread_pool.start(run)
+        if not self.pending:
+            self.finished.emit()
+
+    def cancel(self) -> None:
+        """Останавливает выполняющиеся запуски; ожидающие хосты завершаются с ошибкой отмены."""
+        self.cancel_event.set()
+
+    def is_running(self) -> bool:
+        """Возвращает True, если запуск ещё не завершён на всех хостах."""
+        return bool(self.pending)
+
+    def _on_host_finished(self, hostname: str, exit_code: Optional[int], duration: float, error: str) -> None:
+        """Передаёт результат хоста и сообщает о завершении запуска после последнего хоста."""
+        if hostname in self.pending:
+            self.pending.remove(hostname)
+        self.host_finished.emit(hostname, exit_code, duration, error)
+        if not self.pending:
+            self.runs = []
+            self.finished.emit()
@@ -0,0 +1,281 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import QColor, QTextCharFormat, QTextCursor
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem,
+    QLineEdit, QPushButton, QSpinBox, QTableWidget, QTableWidgetItem,
+    QHeaderView, QPlainTextEdit, QSplitter, QWidget, QAbstractItemView
+)
+
+from database import db_manager
+from notifications import Notification
+from script_fanout import HostRunner, ScriptFanOut
+
+logger = logging.getLogger(__name__)
+
+
+class ScriptFanOutDialog(QDialog):
+    """
+    Окно запуска скрипта библиотеки на нескольких хостах.
+
+    Хосты выбираются из недавних подключений с той же ОС (или вводятся вручную),
+    скрипт выполняется на них параллельно (ScriptFanOut). Вывод каждого хоста
+    показывается по мере поступления, итоги – в таблице с кодом возврата и временем.
+    """
+    run_finished = Signal(dict)  # {хост: (код возврата или None, длительность, ошибка)}
+
+    COLUMNS = ["🖥️ Хост", "🔄 Статус", "Код", "⏱️ Время"]
+    MAX_OUTPUT_CHARS: int = 1_000_000  # Хранимый вывод одного хоста
+
+    def __init__(self, script_name: str, os_name: str, hostname: str,
+                 runner: HostRunner, parent: Optional[QWidget] = None) -> None:
+        """
+        :param script_name: Имя скрипта (для заголовка).
+        :param os_name: ОС хостов ("Windows" или "Linux") – для списка недавних подключений.
+        :param hostname: Текущий хост вкладки (выбран по умолчанию).
+        :param runner: Функция выполнения скрипта на одном хосте.
+        :param parent: Родительский виджет.
+        """
+        super().__init__(parent)
+        self.script_name: str = script_name
+        self.os_name: str = os_name
+        self.hostname: str = hostname
+        self.runner = runner
+        self.fanout: Optional[ScriptFanOut] = None
+        self.rows: Dict[str, int] = {}
+        self.outputs: Dict[str, List[Tuple[str, str]]] = {}
+        self.output_sizes: Dict[str, int] = {}
+        self.results: Dict[str, Tuple[Optional[int], float, str]] = {}
+
+        self.setWindowTitle(f"Запуск скрипта: {script_name}")
+        self.resize(900, 600)
+
+        self.stderr_format = QTextCharFormat()
+        self.stderr_format.setForeground(QColor(200, 40, 40))
+        self.stdout_format = QTextCharFormat()
+
+        self._init_ui()
+        self._load_hosts()
+
+    def _init_ui(self) -> None:
+        """Инициализирует интерфейс окна."""
+        layout = QVBoxLayout(self)
+
+        # Выбор хостов
+        hosts_widget = QWidget()
+        hosts_layout = QVBoxLayout(hosts_widget)
+        hosts_layout.setContentsMargins(0, 0, 0, 0)
+        hosts_layout.addWidget(QLabel(f"📜 {self.script_name} – хосты ({self.os_name}):"))
+        self.hosts_list = QListWidget()
+        hosts_layout.addWidget(self.hosts_list)
+        add_layout = QHBoxLayout()
+        self.host_input = QLineEdit()
+        self.host_input.setPlaceholderText("Имя или IP-адрес хоста...")
+        self.host_input.returnPressed.connect(self.add_host_from_input)
+        add_button = QPushButton("➕ Добавить")
+        add_button.clicked.connect(self.add_host_from_input)
+        add_layout.addWidget(self.host_input)
+        add_layout.addWidget(add_button)
+        hosts_layout.addLayout(add_layout)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Одновременно хостов:"))
+        self.parallel_input = QSpinBox()
+        self.parallel_input.setRange(1, 32)
+        self.parallel_input.setValue(ScriptFanOut.MAX_PARALLEL_HOSTS)
+        controls.addWidget(self.parallel_input)
+        controls.addStretch()
+        self.run_button = QPushButton("▶ Запустить")
+        self.run_button.clicked.connect(self.start_run)
+        self.stop_button = QPushButton("⏹ Остановить")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop_run)
+        controls.addWidget(self.run_button)
+        controls.addWidget(self.stop_button)
+        hosts_layout.addLayout(controls)
+
+        # Итоги по хостам и вывод выбранного хоста
+        self.results_table = QTableWidget(0, len(self.COLUMNS))
+        self.results_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.results_table.verticalHeader().setVisible(False)
+        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.results_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.results_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.results_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.results_table.itemSelectionChanged.connect(self.show_selected_output)
+
+        self.output_view = QPlainTextEdit()
+        self.output_view.setReadOnly(True)
+        self.output_view.setMaximumBlockCount(10000)
+        self.output_view.setPlaceholderText("Выберите хост в таблице, чтобы увидеть его вывод")
+
+        splitter = QSplitter(Qt.Vertical)
+        splitter.addWidget(hosts_widget)
+        splitter.addWidget(self.results_table)
+        splitter.addWidget(self.output_view)
+        layout.addWidget(splitter)
+
+    def _load_hosts(self) -> None:
+        """Заполняет список хостов: текущий хост и недавние подключения с той же ОС."""
+        self.add_host(self.hostname, checked=True)
+        try:
+            connections = db_manager.get_all_connections()
+        except Exception as e:
+            logger.error(f"Ошибка загрузки недавних подключений: {e}")
+            return
+        for rm, ip, os_name, _ in connections:
+            if os_name == self.os_name:
+                self.add_host(ip, label=f"{ip} ({rm})" if rm else ip)
+
+    def add_host(self, hostname: str, label: Optional[str] = None, checked: bool = False) -> None:
+        """
+        Добавляет хост в список (повторно хост не добавляется).
+
+        :param hostname: Имя или IP-адрес хоста.
+        :param label: Отображаемый текст.
+        :param checked: Отметить хост для запуска.
+        """
+        for i in range(self.hosts_list.count()):
+            if self.hosts_list.item(i).data(Qt.UserRole) == hostname:
+                return
+        item = QListWidgetItem(label or hostname)
+        item.setData(Qt.UserRole, hostname)
+        item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+        item.setCheckState(Qt.Checked if checked else Qt.Unchecked)
+        self.hosts_list.addItem(item)
+
+    def add_host_from_input(self) -> None:
+        """Добавляет в список хост из поля ввода и отмечает его."""
+        hostname = self.host_input.text().strip()
+        if hostname:
+            self.add_host(hostname, checked=True)
+            self.host_input.clear()
+
+    def selected_hosts(self) -> List[str]:
+        """Возвращает отмеченные хосты."""
+        return [
+            self.hosts_list.item(i).data(Qt.UserRole)
+            for i in range(self.hosts_list.count())
+            if self.hosts_list.item(i).checkState() == Qt.Checked
+        ]
+
+    def start_run(self) -> None:
+        """Запускает скрипт на отмеченных хостах."""
+        hosts = self.selected_hosts()
+        if not hosts:
+            Notification("⚠️ Нет хостов", "Отметьте хотя бы один хост.", "warning",
+                         duration=3000, parent=self.window()).show_notification()
+            return
+
+        self.results_table.setRowCount(0)
+        self.output_view.clear()
+        self.rows.clear()
+        self.outputs.clear()
+        self.output_sizes.clear()
+        self.results.clear()
+        for hostname in hosts:
+            row = self.results_table.rowCount()
+            self.results_table.insertRow(row)
+            self.rows[hostname] = row
+            self.outputs[hostname] = []
+            self.output_sizes[hostname] = 0
+            self._set_row(hostname, "⏳ В очереди", "", "")
+
+        if self.fanout is not None:
+            self.fanout.deleteLater()
+        self.fanout = ScriptFanOut(self.runner, self.parallel_input.value(), parent=self)
+        self.fanout.host_started.connect(self.on_host_started)
+        self.fanout.output.connect(self.on_output)
+        self.fanout.host_finished.connect(self.on_host_finished)
+        self.fanout.finished.connect(self.on_run_finished)
+        self.run_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.results_table.selectRow(0)
+        self.fanout.start(hosts)
+
+    def stop_run(self) -> None:
+        """Останавливает выполнение на всех хостах."""
+        if self.fanout is not None:
+            self.fanout.cancel()
+            self.stop_button.setEnabled(False)
+
+    def on_host_started(self, hostname: str) -> None:
+        self._set_row(hostname, "▶ Выполняется", "", "")
+
+    def on_output(self, hostname: str, stream: str, text: str) -> None:
+        """Сохраняет вывод хоста и дописывает его в окно, если хост выбран."""
+        chunks = self.outputs.get(hostname)
+        if chunks is None:
+            return
+        chunks.append((stream, text))
+        self.output_sizes[hostname] += len(text)
+        while self.output_sizes[hostname] > self.MAX_OUTPUT_CHARS and len(chunks) > 1:
+            self.output_sizes[hostname] -= len(chunks.pop(0)[1])
+        if hostname == self._selected_host():
+            self._append_output(stream, text)
+
+    def on_host_finished(self, hostname: str, exit_code: Optional[int], duration: float, error: str) -> None:
+        """Отображает результат хоста в таблице итогов."""
+        self.results[hostname] = (exit_code, duration, error)
+        if error:
+            status = f"❌ {error}"
+        elif exit_code == 0:
+            status = "✅ Успешно"
+        else:
+            status = "⚠️ Завершён с ошибкой"
+        self._set_row(hostname, status, "" if exit_code is None else str(exit_code), f"{duration:.1f} с")
+
+    def on_run_finished(self) -> None:
+        """Показывает сводку по завершении запуска на всех хостах."""
+        self.run_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+        failed = sum(1 for code, _, error in self.results.values() if error or code != 0)
+        total = len(self.results)
+        if failed:
+            Notification("⚠️ Запуск завершён",
+                         f"'{self.script_name}': ошибки на {failed} из {total} хостов.",
+                         "warning", duration=3000, parent=self.window()).show_notification()
+        else:
+            Notification("✅ Запуск завершён",
+                         f"'{self.script_name}' выполнен на {total} хостах.",
+                         "success", duration=3000, parent=self.window()).show_notification()
+        self.run_finished.emit(dict(self.results))
+
+    def show_selected_output(self) -> None:
+        """Показывает сохранённый вывод выбранного хоста."""
+        self.output_view.clear()
+        hostname = self._selected_host()
+        for stream, text in self.outputs.get(hostname, []):
+            self._append_output(stream, text)
+
+    def _selected_host(self) -> Optional[str]:
+        rows = self.results_table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        item = self.results_table.item(rows[0].row(), 0)
+        return item.text() if item is not None else None
+
+    def _append_output(self, stream: str, text: str) -> None:
+        cursor = self.output_view.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text, self.stderr_format if stream == "stderr" else self.stdout_format)
+        self.output_view.setTextCursor(cursor)
+
+    def _set_row(self, hostname: str, status: str, exit_code: str, duration: str) -> None:
+        row = self.rows.get(hostname)
+        if row is None:
+            return
+        for column, value in enumerate((hostname, status, exit_code, duration)):
+            item = self.results_table.item(row, column)
+            if item is None:
+                self.results_table.setItem(row, column, QTableWidgetItem(value))
+            elif item.text() != value:
+                item.setText(value)
+
+    def closeEvent(self, event) -> None:
+        """При закрытии окна выполнение на хостах останавливается."""
+        if self.fanout is not None and self.fanout.is_running():
+            self.fanout.cancel()
+        super().closeEvent(event)
@@ -0,0 +1,43 @@
+from typing import Dict
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import Qt  # noqa: E402
+
+from linux_gui.gui.process_tree_model import ROOT_PID, ProcessTreeModel  # noqa: E402
+
+
+def process(pid: int, ppid: int, cpu: str = "1.0") -> Dict[str, str]:
+    return {"PID": str(pid), "PPID": str(ppid), "USER": "root", "%CPU": cpu,
+            "%MEM": "0.1", "TIME": "00:00:01", "COMMAND": f"proc{pid}"}
+
+
+@pytest.fixture
+def model() -> ProcessTreeModel:
+    model = ProcessTreeModel()
+    # 1 -> 100 -> (101 -> 103, 102)
+    model.apply_diff({"changed": [
+        process(1, 0), process(100, 1), process(101, 100), process(102, 100), process(103, 101),
+    ], "exited": []})
+    return model
+
+
+def test_parent_and_child_exit_in_same_tick(model):
+    """Родитель и его потомок завершились в одном такте: оставшиеся потомки переносятся в корень."""
+    model.apply_diff({"changed": [process(1, 0, "5.0")], "exited": ["100", "101"]})
+
+    assert model.process_count() == 3
+    assert model._parent_of == {1: ROOT_PID, 102: ROOT_PID, 103: ROOT_PID}
+    assert set(model._processes) == {1, 102, 103}
+    # Дерево и данные согласованы: последующая пересортировка не падает
+    model.sort(0, Qt.AscendingOrder)
+    assert model._children[ROOT_PID] == [1, 102, 103]
+
+
+def test_exited_child_listed_before_parent(model):
+    model.apply_diff({"changed": [], "exited": ["103", "101", "100"]})
+
+    assert model._parent_of == {1: ROOT_PID, 102: ROOT_PID}
+    assert model.rowCount() == 2
@@ -0,0 +1,144 @@
+from typing import Dict, List
+
+import pytest
+
+from windows_gui.session_parser import EXCLUDED_USERNAMES, get_layout, get_session_type, parse_sessions
+
+# Записанный вывод qwinsta /server:<хост> и quser (английская и русская локали Windows)
+QWINSTA_EN = """\
+ SESSIONNAME       USERNAME                 ID  STATE   TYPE        DEVICE
+ services                                    0  Disc
+>console           Administrator             1  Active
+ rdp-tcp#5         jdoe                      2  Active
+                   asmith                    3  Disc
+ rdp-tcp                                 65536  Listen
+"""
+
+QWINSTA_RU = """\
+ СЕАНС             ПОЛЬЗОВАТЕЛЬ             ID  СТАТУС  ТИП         УСТР-ВО
+ services                                    0  Диск
+>console           Администратор             1  Активно
+ rdp-tcp#12        ivanov                    3  Активно
+ rdp-tcp                                 65536  Прием
+"""
+
+QUSER_EN = """\
+ USERNAME              SESSIONNAME        ID  STATE   IDLE TIME  LOGON TIME
+>administrator         console             1  Active      none   10/16/2026 9:15 AM
+ jdoe                  rdp-tcp#5           2  Active         5   10/16/2026 10:02 AM
+ asmith                                    3  Disc        1:05   10/15/2026 6:40 PM
+"""
+
+QUSER_RU = """\
+ ПОЛЬЗОВАТЕЛЬ          СЕАНС              ID  СТАТУС  БЕЗДЕЙСТВ. ВРЕМЯ ВХОДА
+>администратор         console             1  Активно      нет   16.10.2026 9:15
+ ivanov                rdp-tcp#5           2  Активно        5   16.10.2026 10:02
+"""
+
+
+def legacy_parse_qwinsta(output: str) -> List[Dict[str, str]]:
+    """Прежний разбор qwinsta (до SessionTableLayout) – для сравнения результатов и скорости."""
+    lines = [line.rstrip('\n') for line in output.split('\n') if line.strip()]
+    if not lines:
+        return []
+    header_line = lines[0].strip()
+    positions: List[int] = []
+    in_column = False
+    for i, char in enumerate(header_line):
+        if char != ' ':
+            if not in_column:
+                positions.append(i)
+                in_column = True
+        else:
+            in_column = False
+    positions.append(len(header_line) + 1)
+
+    def split(line: str) -> List[str]:
+        return [line[positions[i]:positions[i + 1]].strip() for i in range(len(positions) - 1)]
+
+    def index(headers: List[str], names: List[str]) -> int:
+        for name in names:
+            if name in headers:
+                return headers.index(name)
+        raise ValueError(f"Не найдена колонка: {names}")
+
+    headers = split(header_line)
+    session_col = index(headers, ['SESSIONNAME', 'СЕАНС'])
+    user_col = index(headers, ['USERNAME', 'ПОЛЬЗОВАТЕЛЬ'])
+    state_col = index(headers, ['STATE', 'СТАТУС'])
+
+    sessions: List[Dict[str, str]] = []
+    for line in lines[1:]:
+        parts = split(line)
+        session_type = parts[session_col] if session_col < len(parts) else ''
+        username = parts[user_col] if user_col < len(parts) else ''
+        state = parts[state_col] if state_col < len(parts) else ''
+        if username and username not in EXCLUDED_USERNAMES:
+            if username.isdigit():
+                continue
+            sessions.append({
+                "user": username,
+                "logon_type": get_session_type(session_type),
+                "status": state,
+                "logon_time": ''
+            })
+    return sessions
+
+
+def test_qwinsta_english():
+    assert parse_sessions(QWINSTA_EN, "qwinsta") == [
+        {"user": "Administrator", "logon_type": "Локальный", "status": "Active", "logon_time": ""},
+        {"user": "jdoe", "logon_type": "RDP", "status": "Active", "logon_time": ""},
+        {"user": "asmith", "logon_type": "Удалённый", "status": "Disc", "logon_time": ""},
+    ]
+
+
+def test_qwinsta_russian():
+    assert parse_sessions(QWINSTA_RU, "qwinsta") == [
+        {"user": "Администратор", "logon_type": "Локальный", "status": "Активно", "logon_time": ""},
+        {"user": "ivanov", "logon_type": "RDP", "status": "Активно", "logon_time": ""},
+    ]
+
+
+def test_quser_english():
+    assert parse_sessions(QUSER_EN, "quser") == [
+        {"user": "administrator", "logon_type": "Локальный", "status": "Active",
+         "logon_time": "10/16/2026 9:15 AM"},
+        {"user": "jdoe", "logon_type": "RDP", "status": "Active", "logon_time": "10/16/2026 10:02 AM"},
+        {"user": "asmith", "logon_type": "Удалённый", "status": "Disc", "logon_time": "10/15/2026 6:40 PM"},
+    ]
+
+
+def test_quser_russian():
+    assert parse_sessions(QUSER_RU, "quser") == [
+        {"user": "администратор", "logon_type": "Локальный", "status": "Активно",
+         "logon_time": "16.10.2026 9:15"},
+        {"user": "ivanov", "logon_type": "RDP", "status": "Активно", "logon_time": "16.10.2026 10:02"},
+    ]
+
+
+@pytest.mark.parametrize("output", [QWINSTA_EN, QWINSTA_RU])
+def test_qwinsta_matches_legacy_parser(output):
+    assert parse_sessions(output, "qwinsta") == legacy_parse_qwinsta(output)
+
+
+def test_empty_output():
+    assert parse_sessions("", "qwinsta") == []
+    assert parse_sessions("\r\n  \r\n", "quser") == []
+
+
+def test_unknown_header():
+    with pytest.raises(ValueError):
+        parse_sessions("No User exists for *\n", "quser")
+
+
+def test_layout_is_cached_per_header():
+    header = QWINSTA_EN.splitlines()[0]
+    assert get_layout(header) is get_layout(header)
+
+
+def test_large_output_matches_legacy_parser():
+    """Большой вывод qwinsta разбирается по готовой разметке так же, как прежним парсером."""
+    header, *rows = QWINSTA_EN.splitlines()
+    output = "\n".join([header] + rows * 1000)
+    assert parse_sessions(output, "qwinsta") == legacy_parse_qwinsta(output)
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+from typing import Set
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Пакеты, которые загружаются только при первом подключении к хосту
+DEFERRED_PACKAGES = ("windows_gui", "linux_gui", "pypsrp", "pypsexec", "paramiko")
+
+
+def imported_modules(statement: str) -> Set[str]:
+    """
+    Выполняет импорт в отдельном интерпретаторе с -X importtime
+    и возвращает имена всех загруженных при этом модулей.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT_DIR, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "QT_QPA_PLATFORM": "offscreen"}
+    )
+    assert result.returncode == 0, result.stderr
+    modules = set()
+    for line in result.stderr.splitlines():
+        # Формат строки: "import time: <self> | <cumulative> | <отступ><модуль>"
+        if line.startswith("import time:") and line.count("|") == 2:
+            name = line.rsplit("|", 1)[1].strip()
+            if name != "imported package":
+                modules.add(name)
+    return modules
+
+
+def test_main_window_does_not_import_connection_windows():
+    """При запуске приложения окна подключения и протокольные библиотеки не загружаются."""
+    pytest.importorskip("PySide6")
+    modules = imported_modules("import main_gui.gui.main_window")
+    assert "main_gui.gui.main_window" in modules
+    loaded = sorted(
+        module for module in modules
+        if module.split(".", 1)[0] in DEFERRED_PACKAGES
+    )
+    assert loaded == []
@@ -3,14 +3,19 @@ import platform
 import logging
 from typing import List, Dict, Union
 
+from windows_gui.session_parser import EXCLUDED_USERNAMES, parse_sessions
+
 logger = logging.getLogger(__name__)
 
 
 class ActiveUsers:
     """
     Класс для получения активных сессий пользователей на Windows.
-    Использует команды 'quser' для локальной машины и 'qwinsta' для удалённых серверов.
+    Использует команды 'quser' для локальной машины и 'qwinsta' для удалённых серверов;
+    вывод разбирается модулем session_parser.
     """
+    COMMAND_TIMEOUT: int = 15  # Секунды ожидания ответа quser/qwinsta
+
     def __init__(self, hostname: str) -> None:
         """
         Инициализация с указанием имени хоста.
@@ -18,11 +23,7 @@ class ActiveUsers:
         :param hostname: Имя хоста или IP-адрес.
         """
         self.hostname: str = hostname
-        self.EXCLUDED_USERNAMES = {
-            'SYSTEM', 'LOCAL SERVICE', 'pdqdeployment',
-            'NETWORK SERVICE', 'СИСТЕМА', '',
-            '65536'  # Фильтрация по ID
-        }
+        self.EXCLUDED_USERNAMES = EXCLUDED_USERNAMES
 
     def get_active_sessions(self) -> Dict[str, Union[List[Dict[str, str]], str]]:
         """
@@ -52,7 +53,7 @@ class ActiveUsers:
 
         :param is_remote: True, если команда должна выполняться на удалённом хосте.
         :return: Вывод команды.
-        :raises RuntimeError: При ошибке выполнения команды.
+        :raises RuntimeError: При ошибке выполнения команды или если хост не ответил за COMMAND_TIMEOUT секунд.
         """
         command: str = "qwinsta" if is_remote else "quser"
         args: List[str] = [command]
@@ -61,20 +62,24 @@ class ActiveUsers:
             args.append(f"/server:{self.hostname}")
 
         try:
+            # Без оболочки: по таймауту subprocess завершает сам qwinsta/quser,
+            # а не только cmd.exe, который оставил бы процесс с открытым каналом вывода
             result = subprocess.run(
                 args,
                 capture_output=True,
                 text=True,
                 encoding='cp866',
                 errors='replace',
-                shell=True
+                timeout=self.COMMAND_TIMEOUT
             )
-            if result.returncode != 0:
-                error_msg = result.stderr or f"Command failed with code {result.returncode}"
-                raise RuntimeError(error_msg)
-            return result.stdout
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"Хост не ответил за {self.COMMAND_TIMEOUT} с")
         except Exception as e:
             raise RuntimeError(f"Ошибка выполнения {command}: {str(e)}")
+        if result.returncode != 0:
+            error_msg = result.stderr or f"Command failed with code {result.returncode}"
+            raise RuntimeError(f"Ошибка выполнения {command}: {error_msg}")
+        return result.stdout
 
     def _parse_output(self, output: str, is_remote: bool) -> List[Dict[str, str]]:
         """
@@ -84,151 +89,4 @@ class ActiveUsers:
         :param is_remote: Флаг, указывающий, используется ли удалённая команда.
         :return: Список сессий.
         """
-        sessions: List[Dict[str, str]] = []
-        lines: List[str] = [line.rstrip('\n') for line in output.split('\n') if line.strip()]
-
-        if not lines:
-            return sessions
-
-        if is_remote:
-            return self._parse_qwinsta(lines)
-        else:
-            return self._parse_quser(lines)
-
-    def _parse_quser(self, lines: List[str]) -> List[Dict[str, str]]:
-        """
-        Парсит вывод команды 'quser' (локальная машина).
-
-        :param lines: Список строк вывода.
-        :return: Список сессий.
-        :raises ValueError: Если формат вывода не соответствует ожиданиям.
-        """
-        sessions: List[Dict[str, str]] = []
-        header_line: str = lines[0].strip()
-        col_positions: List[int] = self._get_column_positions(header_line)
-        headers: List[str] = self._split_line_by_positions(header_line, col_positions)
-
-        try:
-            username_col: int = self._get_column_index(headers, ['USERNAME', 'ПОЛЬЗОВАТЕЛЬ'])
-            session_col: int = self._get_column_index(headers, ['SESSIONNAME', 'СЕАНС'])
-            state_col: int = self._get_column_index(headers, ['STATE', 'СТАТУС'])
-            logon_time_col: int = self._get_column_index(headers, ['LOGON TIME', 'ВРЕМЯ ВХОДА'])
-        except ValueError as e:
-            raise ValueError(f"Неизвестный формат вывода quser: {str(e)}")
-
-        for line in lines[1:]:
-            parts: List[str] = self._split_line_by_positions(line, col_positions)
-            username: str = parts[username_col] if username_col < len(parts) else ''
-            session_type: str = parts[session_col] if session_col < len(parts) else ''
-            state: str = parts[state_col] if state_col < len(parts) else ''
-            logon_time: str = parts[logon_time_col] if logon_time_col < len(parts) else ''
-
-            if username and username not in self.EXCLUDED_USERNAMES:
-                sessions.append({
-                    "user": username,
-                    "logon_type": self._get_session_type(session_type),
-                    "status": state,
-                    "logon_time": logon_time
-                })
-        return sessions
-
-    def _parse_qwinsta(self, lines: List[str]) -> List[Dict[str, str]]:
-        """
-        Парсит вывод команды 'qwinsta' (удалённый хост).
-
-        :param lines: Список строк вывода.
-        :return: Список сессий.
-        :raises ValueError: Если формат вывода не соответствует ожиданиям.
-        """
-        sessions: List[Dict[str, str]] = []
-        header_line: str = lines[0].strip()
-        col_positions: List[int] = self._get_column_positions(header_line)
-        headers: List[str] = self._split_line_by_positions(header_line, col_positions)
-
-        try:
-            session_col: int = self._get_column_index(headers, ['SESSIONNAME', 'СЕАНС'])
-            user_col: int = self._get_column_index(headers, ['USERNAME', 'ПОЛЬЗОВАТЕЛЬ'])
-            state_col: int = self._get_column_index(headers, ['STATE', 'СТАТУС'])
-        except ValueError as e:
-            raise ValueError(f"Неизвестный формат вывода qwinsta: {str(e)}")
-
-        for line in lines[1:]:
-            parts: List[str] = self._split_line_by_positions(line, col_positions)
-            session_type: str = parts[session_col] if session_col < len(parts) else ''
-            username: str = parts[user_col] if user_col < len(parts) else ''
-            state: str = parts[state_col] if state_col < len(parts) else ''
-
-            # Фильтрация: пропускаем числовые идентификаторы и исключённые имена.
-            if username and username not in self.EXCLUDED_USERNAMES:
-                if username.isdigit():
-                    continue
-                sessions.append({
-                    "user": username,
-                    "logon_type": self._get_session_type(session_type),
-                    "status": state,
-                    "logon_time": ''
-                })
-        return sessions
-
-    def _get_column_positions(self, header_line: str) -> List[int]:
-        """
-        Определяет начальные позиции столбцов на основе строки заголовка.
-
-        :param header_line: Строка заголовка.
-        :return: Список позиций, где начинается каждый столбец.
-        """
-        col_positions: List[int] = []
-        in_column = False
-        for i, char in enumerate(header_line):
-            if char != ' ':
-                if not in_column:
-                    col_positions.append(i)
-                    in_column = True
-            else:
-                in_column = False
-        col_positions.append(len(header_line) + 1)
-        return col_positions
-
-    def _split_line_by_positions(self, line: str, positions: List[int]) -> List[str]:
-        """
-        Разбивает строку на части согласно указанным позициям.
-
-        :param line: Строка для разбивки.
-        :param positions: Список позиций начала столбцов.
-        :return: Список частей строки.
-        """
-        parts: List[str] = []
-        for i in range(len(positions) - 1):
-            start = positions[i]
-            end = positions[i + 1]
-            part = line[start:end].strip()
-            parts.append(part)
-        return parts
-
-    def _get_column_index(self, headers: List[str], possible_names: List[str]) -> int:
-        """
-        Находит индекс столбца среди заголовков, соответствующий одному из возможных имён.
-
-        :param headers: Список заголовков.
-        :param possible_names: Возможные имена столбца.
-        :return: Индекс найденного столбца.
-        :raises ValueError: Если ни одно из имён не найдено.
-        """
-        for name in possible_names:
-            if name in headers:
-                return headers.index(name)
-        raise ValueError(f"Не найдена колонка: {possible_names}")
-
-    def _get_session_type(self, session_name: str) -> str:
-        """
-        Определяет тип сессии по имени.
-
-        :param session_name: Имя сессии.
-        :return: Тип сессии: "RDP", "Локальный" или "Удалённый".
-        """
-        session_name = session_name.lower()
-        if 'rdp' in session_name or 'терминальная служба' in session_name:
-            return "RDP"
-        if 'console' in session_name or 'консоль' in session_name:
-            return "Локальный"
-        return "Удалённый"
+        return parse_sessions(output, "qwinsta" if is_remote else "quser")
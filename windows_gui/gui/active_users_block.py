@@ -1,7 +1,5 @@
-import subprocess
-import platform
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
@@ -9,6 +7,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, QTimer
 from notifications import Notification
+from windows_gui import active_users
+from windows_gui.gui.tab_loader import LoadTask, TabLoader
 
 logger = logging.getLogger(__name__)
 
@@ -17,15 +17,25 @@ class ActiveUsers(QWidget):
     """
     Блок для отображения активных сессий пользователей.
     Принимает имя хоста (или IP), для которого запрашиваются сессии.
+
+    Запрос (windows_gui.active_users) выполняется в пуле вкладки (TabLoader) с таймаутом;
+    пока он выполняется, новые запросы не запускаются. При ошибках интервал автообновления увеличивается
+    вдвое (до MAX_BACKOFF_MS) и возвращается к обычному после успешного запроса.
     """
 
-    def __init__(self, hostname: str, parent: QWidget = None) -> None:
+    REFRESH_INTERVAL_MS: int = 60000
+    MAX_BACKOFF_MS: int = 15 * 60000
+
+    def __init__(self, hostname: str, parent: QWidget = None, loader: TabLoader = None) -> None:
         super().__init__(parent)
         self.hostname: str = hostname
-        self.EXCLUDED_USERNAMES: set[str] = {
-            'SYSTEM', 'LOCAL SERVICE', 'pdqdeployment',
-            'NETWORK SERVICE', 'СИСТЕМА', '', '65536'
-        }
+        self.loader = loader if loader is not None else TabLoader(hostname, self)
+        self.worker: Optional[LoadTask] = None
+        # Ручное обновление, запрошенное во время выполняющегося запроса, – уведомить по его результату
+        self.notify_pending: bool = False
+        self.failures: int = 0
+        # Сессии, отображаемые в таблице, – для обновления только изменившихся строк
+        self.sessions: List[Dict[str, str]] = []
         self.STATUS_EMOJI: Dict[str, str] = {
             'Active': '🟢 Активно',
             'Active*': '🟡 Активно (подключение)',
@@ -38,8 +48,8 @@ class ActiveUsers(QWidget):
         # Первоначальное обновление через 100 мс, затем автообновление каждую минуту
         QTimer.singleShot(100, self.update_info)
         self.refresh_timer = QTimer(self)
-        self.refresh_timer.timeout.connect(self.update_info)
-        self.refresh_timer.start(60000)
+        self.refresh_timer.timeout.connect(self._on_refresh_timer)
+        self.refresh_timer.start(self.REFRESH_INTERVAL_MS)
 
     def _init_ui(self) -> None:
         """
@@ -93,19 +103,44 @@ class ActiveUsers(QWidget):
         """
         self.update_info(notify_on_update=True)
 
-    def update_info(self, notify_on_update: bool = False) -> None:
+    def _on_refresh_timer(self) -> None:
+        """Автообновление; пока блок скрыт, запрос уступает очередь видимым блокам."""
+        self.update_info(visible=self.isVisible())
+
+    def update_info(self, notify_on_update: bool = False, visible: bool = True) -> None:
         """
-        Обновляет информацию о сессиях.
+        Запускает обновление информации о сессиях в фоновом потоке.
+        Если предыдущий запрос ещё выполняется, новый не запускается:
+        уведомление о ручном обновлении будет показано по его результату.
 
         :param notify_on_update: Если True, при ручном обновлении показывается уведомление.
                                   При автоматическом обновлении уведомления не выводятся.
+        :param visible: False для фонового обновления скрытого блока.
         """
-        result: Dict[str, Any] = self.get_active_sessions()
+        self.notify_pending = self.notify_pending or notify_on_update
+        if self.worker is not None:
+            logger.debug(f"Запрос сессий {self.hostname} ещё выполняется, обновление пропущено")
+            return
+        self.worker = self.loader.submit(
+            "ActiveUsers", self.get_active_sessions, visible,
+            on_finished=[self.on_sessions_ready],
+            on_error=[lambda message: self.on_sessions_ready({"error": message})]
+        )
+
+    def on_sessions_ready(self, result: Dict[str, Any]) -> None:
+        """
+        Отображает результат запроса сессий и настраивает интервал следующего автообновления.
+
+        :param result: Словарь с ключом "sessions" или "error".
+        """
+        self.worker = None
+        notify_on_update, self.notify_pending = self.notify_pending, False
+        self._schedule_next(failed="error" in result)
         if "error" in result:
             error_msg: str = result['error']
             # Обновляем текст статуса в виджете – уведомление не выводим автоматически
             self.info_label.setText(f"❌ Ошибка: {error_msg}")
-            self.table.setRowCount(0)
+            self._update_table([])
             if notify_on_update:
                 Notification(
                     "❌ Ошибка при обновлении",
@@ -142,16 +177,35 @@ class ActiveUsers(QWidget):
                         parent=self.window()
                     ).show_notification()
 
+    def _schedule_next(self, failed: bool) -> None:
+        """
+        Задаёт интервал автообновления: при ошибках он удваивается (не более MAX_BACKOFF_MS),
+        после успешного запроса возвращается к REFRESH_INTERVAL_MS.
+
+        :param failed: Запрос завершился ошибкой.
+        """
+        self.failures = self.failures + 1 if failed else 0
+        interval = min(self.REFRESH_INTERVAL_MS * 2 ** self.failures, self.MAX_BACKOFF_MS)
+        if failed:
+            logger.info(f"Хост {self.hostname} не ответил ({self.failures} раз подряд), "
+                        f"следующее обновление через {interval // 1000} с")
+        self.refresh_timer.start(interval)
+
     def _update_table(self, sessions: List[Dict[str, str]]) -> None:
         """
         Обновляет содержимое таблицы с активными сессиями.
+        Строки, не изменившиеся с прошлого обновления, не перезаписываются.
 
         :param sessions: Список сессий, каждая из которых описывается словарём.
         """
+        previous = self.sessions
+        self.sessions = list(sessions)
         new_row_count: int = len(sessions)
         # Устанавливаем нужное количество строк
         self.table.setRowCount(new_row_count)
         for row, session in enumerate(sessions):
+            if row < len(previous) and previous[row] == session:
+                continue
             # Создаём элементы таблицы и делаем их не редактируемыми
             user_item = QTableWidgetItem(f"👤 {session.get('user', '')}")
             user_item.setFlags(user_item.flags() & ~Qt.ItemIsEditable)
@@ -187,178 +241,11 @@ class ActiveUsers(QWidget):
     def get_active_sessions(self) -> Dict[str, Any]:
         """
         Получает активные сессии с использованием команд quser или qwinsta.
-        Работает только на Windows.
+        Работает только на Windows. Выполняется в пуле вкладки (TabLoader).
 
         :return: Словарь с ключом "sessions" или "error".
         """
-        try:
-            if platform.system() != "Windows":
-                return {"error": "Функция доступна только на Windows"}
-            is_remote: bool = self.hostname.lower() not in ('localhost', '127.0.0.1')
-            output: str = self._run_remote_command(is_remote)
-            sessions: List[Dict[str, str]] = self._parse_output(output, is_remote)
-            return {"sessions": sessions}
-        except Exception as e:
-            logger.exception("Ошибка получения активных сессий")
-            return {"error": str(e)}
-
-    def _run_remote_command(self, is_remote: bool) -> str:
-        """
-        Выполняет команду (quser или qwinsta) для получения активных сессий.
-
-        :param is_remote: Если True, используется команда для удалённого сервера.
-        :return: Вывод команды.
-        :raises RuntimeError: Если команда завершается с ошибкой.
-        """
-        command: str = "qwinsta" if is_remote else "quser"
-        args: List[str] = [command]
-        if is_remote:
-            args.append("/server:" + self.hostname)
-        result = subprocess.run(
-            args, capture_output=True, text=True, encoding='cp866',
-            errors='replace', shell=True
-        )
-        if result.returncode != 0:
-            raise RuntimeError(result.stderr or f"Command failed with code {result.returncode}")
-        return result.stdout
-
-    def _parse_output(self, output: str, is_remote: bool) -> List[Dict[str, str]]:
-        """
-        Разбивает вывод команды на строки и делегирует парсинг в зависимости от типа.
-
-        :param output: Вывод команды.
-        :param is_remote: Если True, используется парсинг для qwinsta.
-        :return: Список сессий.
-        """
-        sessions: List[Dict[str, str]] = []
-        lines: List[str] = [line.rstrip('\n') for line in output.split('\n') if line.strip()]
-        if not lines:
-            return sessions
-        return self._parse_qwinsta(lines) if is_remote else self._parse_quser(lines)
-
-    def _parse_quser(self, lines: List[str]) -> List[Dict[str, str]]:
-        """
-        Парсит вывод команды quser (локальная машина).
-
-        :param lines: Строки вывода.
-        :return: Список сессий.
-        :raises ValueError: Если формат вывода не соответствует ожиданиям.
-        """
-        sessions: List[Dict[str, str]] = []
-        header_line: str = lines[0].strip()
-        col_positions: List[int] = self._get_column_positions(header_line)
-        headers: List[str] = self._split_line_by_positions(header_line, col_positions)
-        try:
-            username_col: int = self._get_column_index(headers, ['USERNAME', 'ПОЛЬЗОВАТЕЛЬ'])
-            session_col: int = self._get_column_index(headers, ['SESSIONNAME', 'СЕАНС'])
-            state_col: int = self._get_column_index(headers, ['STATE', 'СТАТУС'])
-        except ValueError as e:
-            raise ValueError(f"Неизвестный формат вывода quser: {e}")
-        for line in lines[1:]:
-            parts: List[str] = self._split_line_by_positions(line, col_positions)
-            username: str = parts[username_col] if username_col < len(parts) else ''
-            session_type: str = parts[session_col] if session_col < len(parts) else ''
-            state: str = parts[state_col] if state_col < len(parts) else ''
-            if username and username not in self.EXCLUDED_USERNAMES:
-                sessions.append({
-                    "user": username,
-                    "logon_type": self._get_session_type(session_type),
-                    "status": state,
-                })
-        return sessions
-
-    def _parse_qwinsta(self, lines: List[str]) -> List[Dict[str, str]]:
-        """
-        Парсит вывод команды qwinsta (удалённый хост).
-
-        :param lines: Строки вывода.
-        :return: Список сессий.
-        :raises ValueError: Если формат вывода не соответствует ожиданиям.
-        """
-        sessions: List[Dict[str, str]] = []
-        header_line: str = lines[0].strip()
-        col_positions: List[int] = self._get_column_positions(header_line)
-        headers: List[str] = self._split_line_by_positions(header_line, col_positions)
-        try:
-            session_col: int = self._get_column_index(headers, ['SESSIONNAME', 'СЕАНС'])
-            user_col: int = self._get_column_index(headers, ['USERNAME', 'ПОЛЬЗОВАТЕЛЬ'])
-            state_col: int = self._get_column_index(headers, ['STATE', 'СТАТУС'])
-        except ValueError as e:
-            raise ValueError(f"Неизвестный формат вывода qwinsta: {e}")
-        for line in lines[1:]:
-            parts: List[str] = self._split_line_by_positions(line, col_positions)
-            session_type: str = parts[session_col] if session_col < len(parts) else ''
-            username: str = parts[user_col] if user_col < len(parts) else ''
-            state: str = parts[state_col] if state_col < len(parts) else ''
-            if username and username not in self.EXCLUDED_USERNAMES and not username.isdigit():
-                sessions.append({
-                    "user": username,
-                    "logon_type": self._get_session_type(session_type),
-                    "status": state,
-                })
-        return sessions
-
-    def _get_column_positions(self, header_line: str) -> List[int]:
-        """
-        Определяет начальные позиции столбцов на основе строки заголовка.
-
-        :param header_line: Строка заголовка.
-        :return: Список позиций начала каждого столбца.
-        """
-        col_positions: List[int] = []
-        in_column = False
-        for i, char in enumerate(header_line):
-            if char != ' ':
-                if not in_column:
-                    col_positions.append(i)
-                    in_column = True
-            else:
-                in_column = False
-        col_positions.append(len(header_line) + 1)
-        return col_positions
-
-    def _split_line_by_positions(self, line: str, positions: List[int]) -> List[str]:
-        """
-        Разбивает строку на части по заданным позициям.
-
-        :param line: Исходная строка.
-        :param positions: Список позиций.
-        :return: Список подстрок.
-        """
-        parts: List[str] = []
-        for i in range(len(positions) - 1):
-            start = positions[i]
-            end = positions[i + 1]
-            parts.append(line[start:end].strip())
-        return parts
-
-    def _get_column_index(self, headers: List[str], possible_names: List[str]) -> int:
-        """
-        Определяет индекс столбца по возможным именам.
-
-        :param headers: Список заголовков.
-        :param possible_names: Возможные варианты имени столбца.
-        :return: Индекс найденного столбца.
-        :raises ValueError: Если ни одно из имен не найдено.
-        """
-        for name in possible_names:
-            if name in headers:
-                return headers.index(name)
-        raise ValueError(f"Не найдена колонка: {possible_names}")
-
-    def _get_session_type(self, session_name: str) -> str:
-        """
-        Определяет тип сессии по имени.
-
-        :param session_name: Имя сессии.
-        :return: Тип сессии: "RDP", "Локальный" или "Удалённый".
-        """
-        session_name = session_name.lower()
-        if 'rdp' in session_name or 'терминальная служба' in session_name:
-            return "RDP"
-        if 'console' in session_name or 'консоль' in session_name:
-            return "Локальный"
-        return "Удалённый"
+        return active_users.ActiveUsers(self.hostname).get_active_sessions()
 
     def declension_sessions(self, count: int) -> str:
         """
@@ -1,16 +1,18 @@
 import logging
 import subprocess
-from typing import Any, Callable, Dict, List
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QCheckBox, QLabel, QLineEdit,
     QPushButton, QListWidget, QGroupBox, QMessageBox, QListWidgetItem,
     QMenu, QProgressBar, QFrame, QSizePolicy, QSpacerItem
 )
-from PySide6.QtCore import Qt, QTimer, QThreadPool, QRunnable, Signal, QObject
+from PySide6.QtCore import Qt, QTimer, QObject
 from PySide6.QtGui import QIntValidator, QFont
 
 from windows_gui.rdp_management import RDPManagerSync  # Обновленный RDPManagerSync с pypsexec
+from windows_gui.gui.tab_loader import LoadTask, TabLoader
 from notifications import Notification
 
 logger = logging.getLogger(__name__)
@@ -34,36 +36,6 @@ class BlockSignals:
             w.blockSignals(False)
 
 
-class RDPWorker(QRunnable, QObject):
-    """
-    Потоковый класс для выполнения RDP-команд без зависания UI.
-
-    Вызывает переданную функцию с заданными параметрами, а по завершении отправляет результат или сообщение об ошибке через сигналы.
-    """
-    finished = Signal(dict)  # Сигнал, передающий результат (словарь)
-    error = Signal(str)  # Сигнал, передающий сообщение об ошибке
-
-    def __init__(self, func: Callable[..., Dict[str, Any]], **kwargs: Any) -> None:
-        QRunnable.__init__(self)
-        QObject.__init__(self)
-        self.func = func
-        self.kwargs = kwargs
-
-    def run(self) -> None:
-        """
-        Запускает выполнение переданной функции и посылает результат через сигнал finished.
-        В случае исключения отправляет текст ошибки через сигнал error.
-        """
-        try:
-            logger.debug(f"Запуск потока для функции: {self.func.__name__} с параметрами: {self.kwargs}")
-            result = self.func(**self.kwargs)
-            logger.debug(f"Поток для {self.func.__name__} завершён. Результат: {result}")
-            self.finished.emit(result)
-        except Exception as e:
-            logger.error(f"Ошибка в потоке {self.func.__name__}: {e}")
-            self.error.emit(str(e))
-
-
 class RDPBlock(QWidget):
     """
     Виджет для управления RDP на удалённом ПК.
@@ -71,17 +43,18 @@ class RDPBlock(QWidget):
     Позволяет включать/выключать RDP, менять порт, редактировать список пользователей и получать обновлённые настройки.
     """
 
-    def __init__(self, hostname: str, parent: QWidget = None) -> None:
+    def __init__(self, hostname: str, parent: QWidget = None, loader: TabLoader = None) -> None:
         """
         Инициализирует виджет управления RDP.
 
         :param hostname: Имя хоста (или IP), к которому осуществляется доступ.
         :param parent: Родительский виджет.
+        :param loader: Пул запросов вкладки; если не задан, блок создаёт собственный.
         """
         super().__init__(parent)
         self.hostname: str = hostname
         self.manager = RDPManagerSync(hostname)
-        self.threadpool = QThreadPool.globalInstance()
+        self.loader = loader if loader is not None else TabLoader(hostname, self)
 
         # Флаги для автообновления
         self.auto_refresh: bool = False
@@ -202,25 +175,31 @@ class RDPBlock(QWidget):
         logger.info(f"Старт загрузки данных RDP для {self.hostname}")
         self._execute_operation(self.manager.refresh)
 
-    def _execute_operation(self, func: Callable[..., Dict[str, Any]], **kwargs: Any) -> RDPWorker:
+    def _execute_operation(self, func: Callable[..., Dict[str, Any]],
+                           on_complete: Optional[Callable[[Dict[str, Any]], None]] = None,
+                           **kwargs: Any) -> LoadTask:
         """
-        Запускает операцию в фоне, отображает индикатор загрузки и возвращает worker для дальнейшей обработки.
+        Запускает операцию в фоне, отображает индикатор загрузки и возвращает worker.
 
         :param func: Функция, которую необходимо выполнить в фоне.
+        :param on_complete: Дополнительный обработчик успешного результата; подключается
+                            до запуска операции, чтобы не пропустить быстрый результат.
         :param kwargs: Аргументы для функции.
         :return: Объект worker.
         """
         logger.debug(f"Запуск операции {func.__name__} с параметрами: {kwargs}")
         self._show_loading(True)
 
-        worker = RDPWorker(func, **kwargs)
-        worker.finished.connect(self._update_ui)
-        worker.error.connect(self._handle_error)
+        on_finished = [self._update_ui]
+        if on_complete is not None:
+            on_finished.append(on_complete)
         # Скрываем индикатор загрузки после завершения операции
-        worker.finished.connect(lambda _: self._show_loading(False))
-        worker.error.connect(lambda _: self._show_loading(False))
-        self.threadpool.start(worker)
-        return worker
+        on_finished.append(lambda _: self._show_loading(False))
+        return self.loader.submit(
+            f"RDPBlock.{func.__name__}", partial(func, **kwargs),
+            on_finished=on_finished,
+            on_error=[self._handle_error, lambda _: self._show_loading(False)]
+        )
 
     def _show_notification(self, message: str, notif_type: str = "success", duration: int = 3000,
                            manual: bool = True) -> None:
@@ -256,10 +235,11 @@ class RDPBlock(QWidget):
             QMessageBox.Yes | QMessageBox.No
         )
         if reply == QMessageBox.Yes:
-            worker = self._execute_operation(self.manager.update_settings, enabled=checked)
+            on_complete = None
             if not self.refresh_scheduled:
                 self.refresh_scheduled = True
-                worker.finished.connect(lambda _: QTimer.singleShot(1000, self._auto_refresh))
+                on_complete = lambda _: QTimer.singleShot(1000, self._auto_refresh)
+            self._execute_operation(self.manager.update_settings, on_complete, enabled=checked)
             Notification(
                 "✅ Статус RDP изменён",
                 "Статус RDP успешно обновлён.",
@@ -390,13 +370,13 @@ class RDPBlock(QWidget):
                 parent=self.window()
             ).show_notification()
 
-        worker = self._execute_operation(
+        self._execute_operation(
             self.manager.update_settings,
+            on_update_complete,
             enabled=self.checkbox_rdp.isChecked(),
             port=int(port) if port else None,
             users=current_users
         )
-        worker.finished.connect(on_update_complete)
 
     def _show_context_menu(self, pos) -> None:
         """Показывает контекстное меню для удаления выбранного пользователя."""
@@ -434,8 +414,7 @@ class RDPBlock(QWidget):
                 parent=self.window()
             ).show_notification()
 
-        worker = self._execute_operation(self.manager.update_settings, users=current_users)
-        worker.finished.connect(on_update_complete)
+        self._execute_operation(self.manager.update_settings, on_update_complete, users=current_users)
 
     def _update_ui(self, data: Dict[str, Any]) -> None:
         """Обновляет UI на основе полученных данных."""
@@ -524,3 +503,7 @@ class RDPBlock(QWidget):
         # msg_box.setInformativeText(friendly_message)
         # msg_box.exec_()
 
+
+    def close_session(self) -> None:
+        """Удаляет службу PsExec на удалённом ПК (вызывается при закрытии вкладки)."""
+        self.manager.close()
@@ -10,7 +10,8 @@ from PySide6.QtWidgets import (
 )
 
 from notifications import Notification
-from windows_gui.scripts import ScriptsManager
+from script_fanout_dialog import ScriptFanOutDialog
+from windows_gui.scripts import ScriptsManager, REMOTE_SUPPORTED_EXT, run_script_winrm
 
 # Логирование можно добавить, если оно настроено в проекте
 import logging
@@ -70,6 +71,7 @@ class ScriptsBlock(QWidget):
         Инициализирует виджет библиотеки скриптов.
         """
         super().__init__(parent)
+        self.hostname = hostname
         self.manager = ScriptsManager(hostname)
         self._init_ui()
         self.load_scripts()
@@ -225,6 +227,10 @@ class ScriptsBlock(QWidget):
         if item:
             execute_action = QAction("▶ Запустить", self)
             execute_action.triggered.connect(lambda _, itm=item: self.execute_script(itm))
+            run_on_hosts_action = QAction("🖧 Запустить на хостах...", self)
+            run_on_hosts_action.triggered.connect(lambda _, itm=item: self.run_on_hosts(itm))
+            script_ext = Path(item.data(Qt.UserRole).get('full_name', '')).suffix.lower()
+            run_on_hosts_action.setEnabled(script_ext in REMOTE_SUPPORTED_EXT)
             edit_file_action = QAction("📝 Редактировать скрипт", self)
             edit_file_action.triggered.connect(lambda _, itm=item: self.edit_script_dialog(itm))
             rename_action = QAction("✎ Переименовать", self)
@@ -234,6 +240,7 @@ class ScriptsBlock(QWidget):
             delete_action = QAction("❌ Удалить", self)
             delete_action.triggered.connect(lambda _, itm=item: self.delete_script_dialog(itm))
             menu.addAction(execute_action)
+            menu.addAction(run_on_hosts_action)
             menu.addAction(edit_file_action)
             menu.addSeparator()
             menu.addAction(rename_action)
@@ -424,6 +431,33 @@ class ScriptsBlock(QWidget):
                 parent=self.window()
             ).show_notification()
 
+    def run_on_hosts(self, item: QListWidgetItem) -> None:
+        """
+        Открывает окно параллельного запуска скрипта на нескольких Windows-хостах через WinRM.
+        """
+        script = item.data(Qt.UserRole)
+        script_path = script.get('path', script.get('full_name'))
+        dialog = ScriptFanOutDialog(
+            script['name'], "Windows", self.hostname,
+            lambda hostname, on_output, cancel: run_script_winrm(hostname, script_path, on_output, cancel),
+            parent=self
+        )
+        dialog.run_finished.connect(lambda results, name=script['name']: self.on_hosts_run_finished(name, results))
+        dialog.show()
+
+    def on_hosts_run_finished(self, script_name: str, results: dict) -> None:
+        """
+        Сообщает о результате запуска на нескольких хостах сигналом script_executed.
+        """
+        failed = [host for host, (code, _, error) in results.items() if error or code != 0]
+        status = f"error: {len(failed)} из {len(results)} хостов" if failed else "success"
+        self.script_executed.emit(script_name, status)
+
+    def close_session(self) -> None:
+        """Останавливает запуски скриптов на хостах (вызывается при закрытии вкладки)."""
+        for dialog in self.findChildren(ScriptFanOutDialog):
+            dialog.stop_run()
+
     def edit_script_dialog(self, item: QListWidgetItem) -> None:
         """
         Открывает скрипт в системном редакторе по умолчанию.
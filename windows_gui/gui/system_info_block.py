@@ -7,13 +7,14 @@ from PySide6.QtWidgets import (
     QSpinBox, QHBoxLayout, QStyle, QSizePolicy,
     QStyledItemDelegate, QFrame, QSpacerItem
 )
-from PySide6.QtCore import QTimer, Qt, QThread, Signal, QSize, QUrl
+from PySide6.QtCore import QTimer, Qt, QSize, QUrl
 from PySide6.QtGui import (
     QDesktopServices, QIcon, QFontMetrics, QColor, QPainter,
     QAction, QFont, QGuiApplication
 )
 
 from windows_gui.system_info import SystemInfo
+from windows_gui.gui.tab_loader import TabLoader
 from notifications import Notification
 
 logger = logging.getLogger(__name__)
@@ -65,21 +66,6 @@ class CopyableLabel(QLabel):
         super().mousePressEvent(event)
 
 
-class SystemInfoThread(QThread):
-    """
-    Поток для получения данных о системе, чтобы не блокировать основной GUI.
-    """
-    data_ready = Signal(dict)
-
-    def __init__(self, system_info: SystemInfo) -> None:
-        super().__init__()
-        self.system_info = system_info
-
-    def run(self) -> None:
-        info = self.system_info.get_system_info()
-        self.data_ready.emit(info)
-
-
 class ScriptItemDelegate(QStyledItemDelegate):
     """
     Делегат для отрисовки элемента списка скриптов с тегами (на будущее расширение функционала).
@@ -124,13 +110,15 @@ class SystemInfoBlock(QWidget):
     Уведомления о результате обновления показываются только при ручном обновлении.
     """
 
-    def __init__(self, hostname: str, parent=None) -> None:
+    def __init__(self, hostname: str, parent=None, loader: TabLoader = None) -> None:
         super().__init__(parent)
         self.hostname = hostname
         self.system_info = SystemInfo(hostname)
+        # Запросы выполняются в пуле вкладки параллельно с запросами других блоков
+        self.loader = loader if loader is not None else TabLoader(hostname, self)
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self.safe_update)
-        self.thread = None
+        self.timer.timeout.connect(self.auto_update)
+        self.loading = False
         self.manual_update = False  # Флаг: True, если обновление вызвано пользователем
 
         self.base_font = QFont("Arial", 10)
@@ -305,24 +293,34 @@ class SystemInfoBlock(QWidget):
         self.manual_update = True
         self.safe_update()
 
-    def safe_update(self) -> None:
+    def auto_update(self) -> None:
+        """Автообновление по таймеру; пока блок скрыт, запрос уступает очередь видимым блокам."""
+        self.safe_update(visible=self.isVisible())
+
+    def safe_update(self, visible: bool = True) -> None:
         """
-        Запускает обновление данных о системе в отдельном потоке.
-        Если предыдущий поток ещё не завершился, новая задача не запускается.
+        Запускает обновление данных о системе в пуле вкладки.
+        Если предыдущий запрос ещё не завершился, новая задача не запускается.
         При запуске обновления кнопка обновления блокируется.
+
+        :param visible: False для фонового обновления скрытого блока.
         """
-        if self.thread and self.thread.isRunning():
+        if self.loading:
             return
+        self.loading = True
         self.refresh_button.setEnabled(False)
-        self.thread = SystemInfoThread(self.system_info)
-        self.thread.data_ready.connect(self.update_info)
-        self.thread.start()
+        self.loader.submit(
+            "SystemInfoBlock", self.system_info.get_system_info, visible,
+            on_finished=[self.update_info],
+            on_error=[lambda message: self.update_info({"error": message})]
+        )
 
     def update_info(self, info: dict) -> None:
         """
         Обновляет элементы интерфейса на основе полученной информации.
         При возникновении ошибки уведомление об ошибке показывается только при ручном обновлении.
         """
+        self.loading = False
         self.refresh_button.setEnabled(True)
 
         if not isinstance(info, dict) or "error" in info:
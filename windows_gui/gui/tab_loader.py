@@ -0,0 +1,125 @@
+import logging
+import time
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from windows_gui.winrm_pool import WinRMSessionPool
+
+logger = logging.getLogger(__name__)
+
+
+class LoadTask(QRunnable, QObject):
+    """
+    Фоновый запрос блока вкладки. Результат передаётся сигналом finished,
+    текст ошибки – сигналом error.
+    """
+    finished = Signal(object)  # Результат функции
+    error = Signal(str)  # Текст ошибки
+    done = Signal(object)  # Задача завершена (для учёта в TabLoader)
+
+    def __init__(self, name: str, func: Callable[[], Any]) -> None:
+        QRunnable.__init__(self)
+        QObject.__init__(self)
+        self.name: str = name
+        self.func = func
+        self.elapsed: float = 0.0
+
+    def run(self) -> None:
+        started = time.monotonic()
+        try:
+            result = self.func()
+        except Exception as e:
+            logger.error(f"Ошибка в задаче {self.name}: {e}")
+            self.error.emit(str(e))
+        else:
+            self.finished.emit(result)
+        finally:
+            self.elapsed = time.monotonic() - started
+            self.done.emit(self)
+
+
+class TabLoader(QObject):
+    """
+    Загрузчик данных блоков одной Windows-вкладки.
+
+    Блоки ходят к хосту по разным протоколам (WinRM – информация о системе,
+    SMB/PsExec – RDP, RPC через qwinsta – активные сессии), поэтому их запросы
+    выполняются одновременно в собственном пуле вкладки: время заполнения
+    вкладки определяется самым медленным протоколом, а не суммой всех.
+    Запросы видимых блоков ставятся в очередь раньше фоновых автообновлений.
+    Согласование аутентификации WinRM начинается сразу при открытии вкладки
+    (warm_up) и используется всеми блоками через общую WinRM-сессию хоста.
+    """
+
+    MAX_THREADS: int = 4
+    VISIBLE_PRIORITY: int = 1
+    BACKGROUND_PRIORITY: int = 0
+
+    def __init__(self, hostname: str, parent: Optional[QObject] = None) -> None:
+        """
+        :param hostname: Имя хоста вкладки.
+        :param parent: Родительский объект (окно вкладки).
+        """
+        super().__init__(parent)
+        self.hostname: str = hostname
+        # Отдельный пул: глобальный используется подключением и другими вкладками
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(self.MAX_THREADS)
+        self.started_at: float = time.monotonic()
+        self.pending: int = 0
+        self.initial_load_logged: bool = False
+        self.slowest: Tuple[str, float] = ("", 0.0)
+
+    def submit(self, name: str, func: Callable[[], Any], visible: bool = True,
+               on_finished: Iterable[Callable[[Any], None]] = (),
+               on_error: Iterable[Callable[[str], None]] = ()) -> LoadTask:
+        """
+        Ставит запрос блока в очередь пула вкладки.
+
+        Обработчики подключаются до запуска задачи: быстрый запрос может
+        завершиться раньше, чем вызывающий код успел бы подключиться к сигналам.
+
+        :param name: Название задачи (для журнала).
+        :param func: Функция запроса, выполняется в потоке пула.
+        :param visible: False для фоновых автообновлений скрытого блока –
+                        такие задачи выполняются после запросов видимых блоков.
+        :param on_finished: Обработчики результата (сигнал finished).
+        :param on_error: Обработчики текста ошибки (сигнал error).
+        :return: Задача; результат приходит сигналами finished/error в GUI-поток.
+        """
+        task = LoadTask(name, func)
+        for callback in on_finished:
+            task.finished.connect(callback)
+        for callback in on_error:
+            task.error.connect(callback)
+        task.done.connect(self._on_task_done)
+        self.pending += 1
+        self.thread_pool.start(task, self.VISIBLE_PRIORITY if visible else self.BACKGROUND_PRIORITY)
+        return task
+
+    def warm_up(self) -> LoadTask:
+        """
+        Открывает WinRM-сессию хоста заранее, параллельно с построением блоков.
+        Блок информации о системе затем использует уже открытую сессию.
+        """
+        session = WinRMSessionPool.get_pool().get_session(self.hostname)
+        return self.submit("WinRM", session.open)
+
+    def close(self) -> None:
+        """Снимает с очереди задачи, которые ещё не начали выполняться."""
+        self.thread_pool.clear()
+
+    def _on_task_done(self, task: LoadTask) -> None:
+        """Учитывает завершение задачи и пишет в журнал время первой загрузки вкладки."""
+        self.pending -= 1
+        logger.debug(f"⏱️ {self.hostname}: {task.name} выполнена за {task.elapsed:.2f} с")
+        if task.elapsed > self.slowest[1]:
+            self.slowest = (task.name, task.elapsed)
+        if self.pending == 0 and not self.initial_load_logged:
+            self.initial_load_logged = True
+            name, elapsed = self.slowest
+            logger.info(
+                f"✅ Вкладка {self.hostname} загружена за {time.monotonic() - self.started_at:.1f} с "
+                f"(дольше всего: {name} – {elapsed:.1f} с)"
+            )
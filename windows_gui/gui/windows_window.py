@@ -7,10 +7,13 @@ from windows_gui.gui.commands_block import CommandsBlock
 from windows_gui.gui.rdp_block import RDPBlock
 from windows_gui.gui.active_users_block import ActiveUsers
 from windows_gui.gui.scripts_block import ScriptsBlock
-from notifications import Notification
+from windows_gui.gui.tab_loader import TabLoader
+from windows_gui.winrm_pool import WinRMSessionPool
+from lazy_block import LazyBlock
 
 import sys
 import logging
+from functools import partial
 
 # Инициализация логгера
 logger = logging.getLogger(__name__)
@@ -20,11 +23,29 @@ class WindowsWindow(QWidget):
     """
     Главное окно для управления Windows-компьютером.
     Объединяет блоки для мониторинга системы, выполнения команд, RDP и управления скриптами.
+    Блоки создаются при первом показе в области прокрутки (LazyBlock): открытие
+    вкладки отправляет на хост только запросы видимых блоков. Запросы блоков
+    выполняются одновременно в общем пуле вкладки (TabLoader).
     """
+    # Названия блоков для заглушек (как в настройках компоновки)
+    BLOCK_TITLES = {
+        "SystemInfoBlock": "Информация о системе",
+        "CommandsBlock": "Команды управления",
+        "RDPBlock": "Управление RDP",
+        "ActiveUsers": "Активные пользователи",
+        "ScriptsBlock": "Библиотека скриптов",
+    }
+    # Блоки, работающие через WinRM-сессию хоста
+    WINRM_BLOCKS = frozenset({"SystemInfoBlock"})
+
     def __init__(self, hostname: str, ip: str) -> None:
         super().__init__()
         self.hostname = hostname
         self.ip = ip
+        # WinRM-сессия хоста, общая для всех блоков вкладки (подключение ленивое)
+        self.winrm_session = WinRMSessionPool.get_pool().acquire(hostname)
+        # Пул запросов блоков вкладки
+        self.loader = TabLoader(hostname, self)
 
         self.setObjectName("mainWindow")
         self.setWindowTitle(f"Windows: {hostname}")
@@ -72,41 +93,39 @@ class WindowsWindow(QWidget):
         from settings import load_settings
         settings = load_settings()
 
-        # Порядок блоков по умолчанию
+        # Порядок блоков по умолчанию: имя блока и функция его создания
         default_order = [
-            ("SystemInfoBlock", SystemInfoBlock, [self.hostname]),
-            ("CommandsBlock", CommandsBlock, [self.hostname, self.ip]),
-            ("RDPBlock", RDPBlock, [self.hostname]),
-            ("ActiveUsers", ActiveUsers, [self.hostname]),
-            ("ScriptsBlock", ScriptsBlock, [self.hostname]),
+            ("SystemInfoBlock", partial(SystemInfoBlock, self.hostname, loader=self.loader)),
+            ("CommandsBlock", partial(CommandsBlock, self.hostname, self.ip)),
+            ("RDPBlock", partial(RDPBlock, self.hostname, loader=self.loader)),
+            ("ActiveUsers", partial(ActiveUsers, self.hostname, loader=self.loader)),
+            ("ScriptsBlock", partial(ScriptsBlock, self.hostname)),
         ]
 
         # Пытаемся загрузить сохранённую компоновку для Windows
         layout_config = settings.get("layout_windows")
         if layout_config:
-            # Создаем словарь соответствия: имя блока -> (класс, аргументы)
-            block_mapping = {name: (cls, args) for name, cls, args in default_order}
-            for block in layout_config:
-                block_name = block.get("name")
-                visible = block.get("visible", True)
-                if visible and block_name in block_mapping:
-                    cls, args = block_mapping[block_name]
-                    try:
-                        block_instance = cls(*args)
-                        layout.addWidget(block_instance)
-                    except Exception as e:
-                        logger.exception(f"Ошибка в {block_name}: {e}")
-                        Notification(f"Ошибка в {block_name}: {e}", "error", duration=3000, parent=self).show_notification()
+            # Создаем словарь соответствия: имя блока -> функция создания
+            block_mapping = dict(default_order)
+            blocks = [
+                (block.get("name"), block_mapping[block.get("name")])
+                for block in layout_config
+                if block.get("visible", True) and block.get("name") in block_mapping
+            ]
         else:
-            # Если настроек нет – создаем блоки в порядке по умолчанию
-            for block_name, block_class, args in default_order:
-                try:
-                    block_instance = block_class(*args)
-                    layout.addWidget(block_instance)
-                except Exception as e:
-                    error_msg = f"Ошибка в {block_name}: {e}"
-                    logger.exception(error_msg)
-                    Notification(error_msg, "error", duration=3000, parent=self).show_notification()
+            # Если настроек нет – используем порядок по умолчанию
+            blocks = default_order
+
+        # Аутентификация WinRM выполняется параллельно с построением блоков
+        if any(block_name in self.WINRM_BLOCKS for block_name, _ in blocks):
+            self.loader.warm_up()
+
+        for block_name, factory in blocks:
+            # Блок создаётся при первом показе; ошибки создания выводит LazyBlock
+            layout.addWidget(LazyBlock(
+                block_name, self.BLOCK_TITLES.get(block_name, block_name),
+                factory, self.scroll_area
+            ))
 
     def update_layout(self) -> None:
         """
@@ -122,15 +141,47 @@ class WindowsWindow(QWidget):
             item = layout.takeAt(0)
             widget = item.widget()
             if widget is not None:
+                self._close_block(widget)
                 widget.setParent(None)
                 widget.deleteLater()
         # Пересоздаем блоки по новым настройкам
         self.init_blocks(layout)
 
+    def close_session(self) -> None:
+        """
+        Закрывает удалённые сессии блоков и возвращает WinRM-сессию в пул перед закрытием окна.
+        Повторный вызов ничего не делает.
+        """
+        layout = self.content_widget.layout()
+        if layout is not None:
+            for i in range(layout.count()):
+                widget = layout.itemAt(i).widget()
+                if widget is not None:
+                    self._close_block(widget)
+        self.loader.close()
+        if self.winrm_session:
+            try:
+                WinRMSessionPool.get_pool().release(self.hostname)
+                logger.info(f"WinRM-сессия с {self.hostname} освобождена.")
+            except Exception as e:
+                logger.exception(f"Ошибка при освобождении WinRM-сессии: {e}")
+            finally:
+                self.winrm_session = None
+
+    @staticmethod
+    def _close_block(widget: QWidget) -> None:
+        """Закрывает удалённые сессии блока, если он их держит (например, службу PsExec в RDPBlock)."""
+        if hasattr(widget, "close_session"):
+            try:
+                widget.close_session()
+            except Exception as e:
+                logger.exception(f"Ошибка при закрытии сессии блока {type(widget).__name__}: {e}")
+
     def closeEvent(self, event) -> None:
         """
-        Обработка события закрытия окна.
+        Обработка события закрытия окна: WinRM-сессия возвращается в пул.
         """
+        self.close_session()
         event.accept()
 
 
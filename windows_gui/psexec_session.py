@@ -0,0 +1,133 @@
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Optional, Tuple
+
+from pypsexec.client import Client
+
+logger = logging.getLogger(__name__)
+
+
+class PsExecSession:
+    """
+    Долгоживущая PsExec-сессия с удалённым ПК.
+
+    Клиент pypsexec подключается и устанавливает службу один раз, после чего
+    команды выполняются по очереди в отдельном потоке. Если очередь простаивает
+    дольше idle_timeout, служба удаляется и соединение закрывается; следующая
+    команда подключится заново. close() удаляет службу после выполнения
+    уже поставленных в очередь команд.
+    """
+
+    IDLE_TIMEOUT: float = 2 * 60  # 120 секунд
+
+    def __init__(self, hostname: str, idle_timeout: float = IDLE_TIMEOUT) -> None:
+        """
+        :param hostname: Имя хоста или IP-адрес удалённого ПК.
+        :param idle_timeout: Время простоя (секунды), после которого служба удаляется.
+        """
+        self.hostname: str = hostname
+        self.idle_timeout: float = idle_timeout
+        self._client: Optional[Client] = None
+        self._queue: "queue.Queue[Optional[Tuple[str, str, Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed: bool = False
+
+    def run(self, arguments: str, executable: str = "cmd.exe",
+            timeout: Optional[float] = None) -> Tuple[bytes, bytes, int]:
+        """
+        Ставит команду в очередь и ждёт результата.
+
+        :param arguments: Аргументы исполняемого файла.
+        :param executable: Исполняемый файл на удалённом ПК.
+        :param timeout: Максимальное время ожидания результата (None – без ограничения).
+        :return: Кортеж (stdout, stderr, код возврата).
+        :raises Exception: Если сессия закрыта или команда завершилась ошибкой.
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise Exception(f"PsExec-сессия с {self.hostname} закрыта")
+            self._queue.put((executable, arguments, future))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._worker, name=f"PsExecSession-{self.hostname}", daemon=True
+                )
+                self._thread.start()
+        return future.result(timeout)
+
+    def close(self) -> None:
+        """
+        Закрывает сессию: после выполнения команд из очереди служба удаляется,
+        соединение закрывается. Повторный вызов ничего не делает.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread is not None:
+                self._queue.put(None)
+
+    def _worker(self) -> None:
+        """Поток выполнения команд из очереди."""
+        while True:
+            try:
+                item = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                # Отключаемся под блокировкой, чтобы новый поток не подхватил закрываемый клиент
+                with self._lock:
+                    if not self._queue.empty():
+                        continue
+                    logger.debug(f"PsExec-сессия с {self.hostname} простаивает, удаляем службу")
+                    self._disconnect()
+                    self._thread = None
+                return
+
+            if item is None:
+                self._disconnect()
+                with self._lock:
+                    self._thread = None
+                return
+
+            executable, arguments, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                client = self._connect()
+                future.set_result(client.run_executable(executable, arguments=arguments))
+            except Exception as e:
+                # После ошибки соединение может быть в неопределённом состоянии – переподключимся
+                logger.error(f"❌ Ошибка выполнения команды на {self.hostname}: {e}")
+                self._disconnect()
+                future.set_exception(e)
+
+    def _connect(self) -> Client:
+        """Подключается к хосту и устанавливает службу PsExec, если это ещё не сделано."""
+        if self._client is None:
+            logger.debug(f"🔌 Подключение к {self.hostname} и установка службы PsExec")
+            client = Client(self.hostname, encrypt=False)
+            client.connect()
+            try:
+                client.create_service()
+            except Exception:
+                client.disconnect()
+                raise
+            self._client = client
+        return self._client
+
+    def _disconnect(self) -> None:
+        """Удаляет службу PsExec и закрывает соединение."""
+        client, self._client = self._client, None
+        if client is None:
+            return
+        try:
+            client.remove_service()
+        except Exception as rem_err:
+            logger.error(f"❌ Ошибка при удалении службы: {rem_err}")
+        try:
+            client.disconnect()
+        except Exception as e:
+            logger.debug(f"Ошибка при отключении от {self.hostname}: {e}")
+        logger.debug(f"🔌 Соединение с {self.hostname} закрыто")
@@ -1,10 +1,22 @@
-from pypsexec.client import Client
+import re
 import threading
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+
+from windows_gui.psexec_session import PsExecSession
 
 logger = logging.getLogger(__name__)
 
+# Маркер конца шага пакетного выполнения: @@MTADMIN:STEP:<код возврата>@@
+STEP_MARKER = re.compile(r"@@MTADMIN:STEP:(-?\d+)@@")
+
+# Команды чтения настроек RDP
+RDP_STATUS_QUERY = 'reg query "HKLM\\SYSTEM\\CurrentControlSet\\Control\\Terminal Server" /v fDenyTSConnections'
+RDP_PORT_QUERY = (
+    'reg query "HKLM\\SYSTEM\\CurrentControlSet\\Control\\Terminal Server\\WinStations\\RDP-Tcp" /v PortNumber'
+)
+RDP_GROUP_NAMES = ["Remote Desktop Users", "Пользователи удаленного рабочего стола"]
+
 
 class RDPManagerSync:
     """
@@ -23,6 +35,23 @@ class RDPManagerSync:
         self.hostname: str = hostname
         self.lock = threading.Lock()
         self.refresh_lock = threading.Lock()  # Отдельный лок для метода refresh()
+        # Служба PsExec устанавливается один раз и живёт, пока блок открыт (или до простоя)
+        self.session = PsExecSession(hostname)
+
+    def _run_cmd(self, arguments: str) -> Tuple[bytes, bytes, int]:
+        """
+        Выполняет cmd.exe с заданными аргументами на удалённом ПК
+        через долгоживущую PsExec-сессию.
+
+        :param arguments: Аргументы командной строки cmd.exe.
+        :return: Кортеж (stdout, stderr, код возврата).
+        :raises Exception: При ошибке подключения или выполнения.
+        """
+        return self.session.run(arguments)
+
+    def close(self) -> None:
+        """Удаляет службу PsExec и закрывает соединение с удалённым ПК."""
+        self.session.close()
 
     def run_remote_command(self, command: str) -> str:
         """
@@ -32,13 +61,8 @@ class RDPManagerSync:
         :return: Результат выполнения команды (stdout, либо сообщение об ошибке).
         """
         logger.debug(f"🚀 Выполняю команду на {self.hostname}: {command}")
-        client = None
         try:
-            client = Client(self.hostname, encrypt=False)
-            client.connect()
-            client.create_service()
-
-            stdout, stderr, exit_code = client.run_executable("cmd.exe", arguments=f'/c {command}')
+            stdout, stderr, exit_code = self._run_cmd(f'/c {command}')
 
             if exit_code == 0:
                 result = stdout.decode("cp866").strip()
@@ -51,14 +75,74 @@ class RDPManagerSync:
         except Exception as e:
             logger.exception(f"❌ Ошибка выполнения команды: {e}")
             return f"Ошибка: {e}"
-        finally:
-            if client:
-                try:
-                    client.remove_service()
-                except Exception as rem_err:
-                    logger.error(f"❌ Ошибка при удалении службы: {rem_err}")
-                client.disconnect()
-                logger.debug(f"🔌 Соединение с {self.hostname} закрыто")
+
+    def run_batch(self, commands: List[str]) -> List[Dict[str, Any]]:
+        """
+        Выполняет несколько команд за одну установку службы PsExec.
+        Команды объединяются в один вызов cmd.exe; после каждой выводится маркер
+        с кодом возврата, по которым вывод разбивается на шаги.
+
+        :param commands: Список команд cmd.exe (без символов '!').
+        :return: Список результатов по шагам: {"command", "output", "exit_code", "ok"}.
+                 Если выполнить пакет не удалось, невыполненные шаги содержат ошибку пакета.
+        """
+        logger.debug(f"🚀 Пакетное выполнение на {self.hostname}: {commands}")
+        try:
+            stdout, stderr, exit_code = self._run_cmd(self.build_batch_arguments(commands))
+            output = stdout.decode("cp866")
+            missing_output = "Ошибка: шаг не выполнен"
+            if exit_code != 0:
+                # Пакет прерван (ошибка cmd.exe или PsExec) – шагам без маркера передаём её текст
+                error = stderr.decode("cp866").strip() or STEP_MARKER.split(output)[-1].strip()
+                missing_output = f"Ошибка: {error or f'код возврата {exit_code}'}"
+            results = self.parse_batch_output(commands, output, missing_output)
+        except Exception as e:
+            logger.exception(f"❌ Ошибка пакетного выполнения команд: {e}")
+            return [
+                {"command": command, "output": f"Ошибка: {e}", "exit_code": -1, "ok": False}
+                for command in commands
+            ]
+        logger.debug(f"✅ Результаты пакета: {results}")
+        return results
+
+    @staticmethod
+    def build_batch_arguments(commands: List[str]) -> str:
+        """
+        Формирует аргументы cmd.exe для пакетного выполнения команд.
+        Используется отложенное раскрытие переменных (/v:on), чтобы !ERRORLEVEL!
+        вычислялся после каждого шага, а не при разборе строки.
+
+        :param commands: Список команд.
+        :return: Строка аргументов для cmd.exe.
+        """
+        steps = [f"({command}) 2>&1 & echo @@MTADMIN:STEP:!ERRORLEVEL!@@" for command in commands]
+        return "/v:on /c " + " & ".join(steps)
+
+    @staticmethod
+    def parse_batch_output(commands: List[str], output: str,
+                           missing_output: str = "Ошибка: шаг не выполнен") -> List[Dict[str, Any]]:
+        """
+        Разбивает вывод пакетного выполнения на результаты отдельных шагов.
+
+        :param commands: Список выполненных команд.
+        :param output: Полный вывод cmd.exe.
+        :param missing_output: Текст ошибки для шагов, не дошедших до выполнения.
+        :return: Список результатов по шагам (недостающие шаги помечаются как ошибочные).
+        """
+        results: List[Dict[str, Any]] = []
+        # split() с группой возвращает [вывод0, код0, вывод1, код1, ..., хвост]
+        parts = STEP_MARKER.split(output)
+        for command, step_output, code in zip(commands, parts[0::2], parts[1::2]):
+            exit_code = int(code)
+            results.append({
+                "command": command,
+                "output": step_output.strip(),
+                "exit_code": exit_code,
+                "ok": exit_code == 0,
+            })
+        for command in commands[len(results):]:
+            results.append({"command": command, "output": missing_output, "exit_code": -1, "ok": False})
+        return results
 
     def refresh(self) -> Dict[str, Any]:
         """
@@ -70,10 +154,20 @@ class RDPManagerSync:
         logger.debug(f"🔄 refresh() вызван для {self.hostname}")
         try:
             with self.refresh_lock:
+                # Все чтения выполняются за одну установку службы PsExec
+                commands = [RDP_STATUS_QUERY, RDP_PORT_QUERY]
+                commands += [f'net localgroup "{group_name}"' for group_name in RDP_GROUP_NAMES]
+                results = self.run_batch(commands)
+                # Ошибку пакета или запроса реестра показываем как есть, а не как ошибку разбора вывода
+                failed = next((result for result in results[:2] if not result["ok"]), None)
+                if failed is not None:
+                    raise Exception(f"Не удалось прочитать настройки RDP: {failed['output']}")
                 status: Dict[str, Any] = {
-                    "enabled": self._get_rdp_status(),
-                    "port": self._get_rdp_port(),
-                    "users": self._get_rdp_users(),
+                    "enabled": self._parse_rdp_status(results[0]["output"]),
+                    "port": self._parse_rdp_port(results[1]["output"]),
+                    "users": self._parse_rdp_users(
+                        {group_name: result["output"] for group_name, result in zip(RDP_GROUP_NAMES, results[2:])}
+                    ),
                 }
             logger.debug(f"✅ refresh() завершён для {self.hostname}: {status}")
             return status
@@ -110,9 +204,15 @@ class RDPManagerSync:
 
         :return: True, если RDP включён, иначе False.
         """
-        output = self.run_remote_command(
-            'reg query "HKLM\\SYSTEM\\CurrentControlSet\\Control\\Terminal Server" /v fDenyTSConnections'
-        )
+        return self._parse_rdp_status(self.run_remote_command(RDP_STATUS_QUERY))
+
+    @staticmethod
+    def _parse_rdp_status(output: str) -> bool:
+        """
+        Разбирает вывод запроса fDenyTSConnections.
+
+        :return: True, если RDP включён, иначе False.
+        """
         logger.debug(f"Вывод проверки RDP: {output}")
         for line in output.splitlines():
             if "fDenyTSConnections" in line:
@@ -131,9 +231,16 @@ class RDPManagerSync:
         :return: Порт RDP (в десятичном виде).
         :raises Exception: Если не удалось определить порт.
         """
-        output = self.run_remote_command(
-            'reg query "HKLM\\SYSTEM\\CurrentControlSet\\Control\\Terminal Server\\WinStations\\RDP-Tcp" /v PortNumber'
-        )
+        return self._parse_rdp_port(self.run_remote_command(RDP_PORT_QUERY))
+
+    @staticmethod
+    def _parse_rdp_port(output: str) -> int:
+        """
+        Разбирает вывод запроса PortNumber.
+
+        :return: Порт RDP (в десятичном виде).
+        :raises Exception: Если не удалось определить порт.
+        """
         for line in output.splitlines():
             if "PortNumber" in line:
                 port_hex = line.split()[-1]
@@ -149,36 +256,62 @@ class RDPManagerSync:
         :return: Список пользователей RDP.
         :raises Exception: Если не удалось получить список.
         """
-        possible_group_names = ["Remote Desktop Users", "Пользователи удаленного рабочего стола"]
+        for group_name in RDP_GROUP_NAMES:
+            users = self._parse_group_members(group_name, self.run_remote_command(f'net localgroup "{group_name}"'))
+            if users is not None:
+                return users
 
-        for group_name in possible_group_names:
-            output = self.run_remote_command(f'net localgroup "{group_name}"')
-            if "Указанная локальная группа не существует" in output:
-                logger.debug(f"Группа {group_name} не существует, пробую следующий вариант.")
-                continue
+        raise Exception(
+            "Не удалось получить список пользователей RDP. Проверьте локализацию системы или права доступа.")
 
-            users: List[str] = []
-            in_users_section = False
-            for line in output.splitlines():
-                line = line.strip()
-                if line.startswith("Члены"):
-                    in_users_section = True
-                    continue
-                if in_users_section and set(line) == {"-"}:
-                    continue
-                if in_users_section and "Команда выполнена успешно" in line:
-                    break
-                if in_users_section and line:
-                    users.append(line)
-
-            if users or "Команда выполнена успешно" in output:
-                self.rdp_group_name = group_name
-                logger.debug(f"Получены пользователи RDP из группы {group_name}: {users}")
+    def _parse_rdp_users(self, outputs: Dict[str, str]) -> List[str]:
+        """
+        Выбирает список пользователей из вывода net localgroup для возможных названий RDP-группы.
+
+        :param outputs: Словарь {название группы: вывод net localgroup}.
+        :return: Список пользователей RDP.
+        :raises Exception: Если ни одна из групп не найдена.
+        """
+        for group_name, output in outputs.items():
+            users = self._parse_group_members(group_name, output)
+            if users is not None:
                 return users
 
         raise Exception(
             "Не удалось получить список пользователей RDP. Проверьте локализацию системы или права доступа.")
 
+    def _parse_group_members(self, group_name: str, output: str) -> Optional[List[str]]:
+        """
+        Разбирает вывод net localgroup и запоминает название существующей группы.
+
+        :param group_name: Название группы.
+        :param output: Вывод команды net localgroup.
+        :return: Список членов группы или None, если группа не существует.
+        """
+        if "Указанная локальная группа не существует" in output:
+            logger.debug(f"Группа {group_name} не существует, пробую следующий вариант.")
+            return None
+
+        users: List[str] = []
+        in_users_section = False
+        for line in output.splitlines():
+            line = line.strip()
+            if line.startswith("Члены"):
+                in_users_section = True
+                continue
+            if in_users_section and set(line) == {"-"}:
+                continue
+            if in_users_section and "Команда выполнена успешно" in line:
+                break
+            if in_users_section and line:
+                users.append(line)
+
+        if users or "Команда выполнена успешно" in output:
+            self.rdp_group_name = group_name
+            logger.debug(f"Получены пользователи RDP из группы {group_name}: {users}")
+            return users
+        return None
+
     def add_user(self, username: str) -> str:
         """
         Добавляет пользователя в группу RDP без удаления остальных.
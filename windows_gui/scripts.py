@@ -5,8 +5,14 @@ import subprocess
 import platform
 import sys
 import logging
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
+
+from pypsrp.complex_objects import PSInvocationState
+from pypsrp.powershell import PowerShell
+
+from windows_gui.winrm_pool import WinRMSessionPool
 # Убираем привязку к GUI – ошибки будем сообщать через исключения,
 # а GUI уже сможет отобразить их как нужно.
 # Если нужно, импорт можно добавить в GUI-слое.
@@ -14,6 +20,48 @@ from typing import List, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Признак строки с кодом возврата в выводе RUN_SCRIPT_WRAPPER
+EXIT_CODE_MARKER = "__MTADMIN_EXIT_CODE__="
+
+# Обёртка запуска скрипта библиотеки через WinRM: скрипт записывается во временный файл
+# хоста и запускается – .ps1 в том же runspace (exit N попадает в $LASTEXITCODE,
+# завершающая ошибка перехватывается), .bat/.cmd/.vbs – интерпретатором.
+# Вывод передаётся построчно, последней строкой – код возврата с EXIT_CODE_MARKER.
+RUN_SCRIPT_WRAPPER = r"""
+param([string]$Content, [string]$Extension)
+if ($Extension -eq '.ps1') {
+    # RunspacePool выделен под этот запуск: политика меняется только для него
+    Set-ExecutionPolicy -Scope Process -ExecutionPolicy Bypass -Force -ErrorAction SilentlyContinue
+}
+$Error.Clear()
+$global:LASTEXITCODE = 0
+$path = Join-Path $env:TEMP ("mtadmin_" + [guid]::NewGuid().ToString("N") + $Extension)
+Set-Content -LiteralPath $path -Value $Content -Encoding Default
+try {
+    if ($Extension -eq '.ps1') {
+        try {
+            & $path | Out-String -Stream
+            $code = if ($LASTEXITCODE) { $LASTEXITCODE } elseif ($Error.Count) { 1 } else { 0 }
+        } catch {
+            Write-Error -ErrorRecord $_
+            $code = 1
+        }
+    } elseif ($Extension -eq '.vbs') {
+        & cscript.exe //NoLogo $path | Out-String -Stream
+        $code = $LASTEXITCODE
+    } else {
+        & cmd.exe /c $path | Out-String -Stream
+        $code = $LASTEXITCODE
+    }
+} finally {
+    Remove-Item -LiteralPath $path -Force -ErrorAction SilentlyContinue
+}
+"#MARKER#$code"
+""".replace("#MARKER#", EXIT_CODE_MARKER)
+
+# Расширения, которые можно выполнить на удалённом хосте через WinRM
+REMOTE_SUPPORTED_EXT = {'.ps1', '.bat', '.cmd', '.vbs'}
+
 
 def get_project_root() -> Path:
     """
@@ -204,3 +252,79 @@ class ScriptsManager:
         except Exception as e:
             logger.error(f"Ошибка выполнения скрипта: {e}")
             raise RuntimeError(f"Ошибка выполнения скрипта: {e}") from e
+
+
+def read_script_text(script_path: str) -> str:
+    """
+    Читает текст скрипта: UTF-8 (в том числе с BOM), иначе – ANSI-кодировка Windows (cp1251).
+
+    :raises FileNotFoundError: если скрипт не найден.
+    """
+    data = Path(script_path).read_bytes()
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp1251", errors="replace")
+
+
+def run_script_winrm(hostname: str, script_path: str,
+                     on_output: Callable[[str, str], None],
+                     cancel: threading.Event) -> int:
+    """
+    Выполняет скрипт библиотеки на удалённом хосте в отдельной WinRM-сессии (WinRMSessionPool).
+    Вывод передаётся по мере поступления: on_output("stdout" | "stderr", текст).
+    Отмена проверяется между получениями очередной порции вывода.
+
+    Скрипт выполняется в отдельном RunspacePool (dedicated_runspace): общая сессия
+    хоста не занята на всё время выполнения, и её не закрывает отмена скрипта.
+
+    :param hostname: Имя или IP-адрес хоста.
+    :param script_path: Путь к скрипту (.ps1, .bat, .cmd, .vbs).
+    :param on_output: Обработчик вывода (вызывается в потоке выполнения).
+    :param cancel: Событие отмены; при установке выполнение на хосте останавливается.
+    :return: Код возврата скрипта.
+    :raises ValueError: если тип скрипта нельзя выполнить удалённо.
+    :raises Exception: при ошибке подключения, отмене, а также если конвейер PowerShell
+        прерван на хосте или не вернул код возврата.
+    """
+    ext = Path(script_path).suffix.lower()
+    if ext not in REMOTE_SUPPORTED_EXT:
+        raise ValueError(f"Скрипты {ext} нельзя выполнить на Windows-хосте")
+    content = read_script_text(script_path)
+
+    cancelled = False
+    with WinRMSessionPool.get_pool().dedicated_runspace(hostname) as runspace:
+        ps = PowerShell(runspace)
+        ps.add_script(RUN_SCRIPT_WRAPPER).add_parameter("Content", content).add_parameter("Extension", ext)
+        ps.begin_invoke()
+        exit_code: Optional[int] = None
+        last_error = ""
+        output_index = error_index = 0
+        while True:
+            for item in ps.output[output_index:]:
+                line = str(item)
+                if line.startswith(EXIT_CODE_MARKER):
+                    exit_code = int(line[len(EXIT_CODE_MARKER):] or 0)
+                else:
+                    on_output("stdout", line + "\n")
+            output_index = len(ps.output)
+            for record in ps.streams.error[error_index:]:
+                last_error = str(record)
+                on_output("stderr", f"{record}\n")
+            error_index = len(ps.streams.error)
+
+            if ps.state != PSInvocationState.RUNNING:
+                break
+            if cancel.is_set():
+                ps.stop()
+                cancelled = True
+                break
+            ps.poll_invoke()
+    if cancelled:
+        raise Exception("Выполнение остановлено")
+    # Без кода возврата обёртка не дошла до конца: успехом такой запуск не считается
+    if ps.state in (PSInvocationState.FAILED, PSInvocationState.STOPPED):
+        raise Exception(f"Скрипт прерван на хосте: {last_error or ps.state}")
+    if exit_code is None:
+        raise Exception(f"Скрипт завершился без кода возврата{': ' + last_error if last_error else ''}")
+    return exit_code
@@ -0,0 +1,127 @@
+import re
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Служебные учётные записи и идентификаторы, не отображаемые как пользователи
+EXCLUDED_USERNAMES = frozenset({
+    'SYSTEM', 'LOCAL SERVICE', 'pdqdeployment',
+    'NETWORK SERVICE', 'СИСТЕМА', '',
+    '65536'  # Фильтрация по ID
+})
+
+# Возможные заголовки столбцов (английская и русская локали Windows)
+USERNAME_HEADERS: Tuple[str, ...] = ('USERNAME', 'ПОЛЬЗОВАТЕЛЬ')
+SESSIONNAME_HEADERS: Tuple[str, ...] = ('SESSIONNAME', 'СЕАНС')
+STATE_HEADERS: Tuple[str, ...] = ('STATE', 'СТАТУС')
+LOGON_TIME_HEADERS: Tuple[str, ...] = ('LOGON TIME', 'ВРЕМЯ ВХОДА')
+
+_WORD_PATTERN = re.compile(r'\S+')
+
+
+class SessionTableLayout:
+    """
+    Разметка таблицы quser/qwinsta, вычисленная по строке заголовка:
+    срезы столбцов, которыми разбираются строки сессий.
+    """
+
+    def __init__(self, header_line: str) -> None:
+        """
+        :param header_line: Строка заголовка (без обрезки ведущих пробелов –
+                            первая позиция зарезервирована под маркер текущей сессии «>»).
+        :raises ValueError: Если не найдены обязательные столбцы.
+        """
+        matches = list(_WORD_PATTERN.finditer(header_line))
+        self._words: List[str] = [match.group() for match in matches]
+        self._starts: List[int] = [match.start() for match in matches]
+        self.user: slice = self._column(USERNAME_HEADERS)
+        self.session: slice = self._column(SESSIONNAME_HEADERS)
+        self.state: slice = self._column(STATE_HEADERS)
+        self.logon_time: Optional[slice] = self._column(LOGON_TIME_HEADERS, required=False)
+
+    def _column(self, possible_names: Sequence[str], required: bool = True) -> Optional[slice]:
+        """
+        Находит столбец по возможным именам (имя может состоять из нескольких слов).
+        Последний столбец не ограничивается справа.
+
+        :param possible_names: Возможные варианты имени столбца.
+        :param required: Если True, отсутствие столбца – ошибка.
+        :return: Срез столбца или None, если необязательный столбец не найден.
+        :raises ValueError: Если обязательный столбец не найден.
+        """
+        for name in possible_names:
+            parts = name.split()
+            for i in range(len(self._words) - len(parts) + 1):
+                if self._words[i:i + len(parts)] == parts:
+                    end_index = i + len(parts)
+                    end = self._starts[end_index] if end_index < len(self._starts) else None
+                    return slice(self._starts[i], end)
+        if required:
+            raise ValueError(f"Не найдена колонка: {list(possible_names)}")
+        return None
+
+
+@lru_cache(maxsize=32)
+def get_layout(header_line: str) -> SessionTableLayout:
+    """
+    Возвращает разметку таблицы для строки заголовка. Заголовок зависит только
+    от команды и локали, поэтому разметка вычисляется один раз и кэшируется.
+
+    :param header_line: Строка заголовка вывода quser/qwinsta.
+    :return: Разметка таблицы.
+    :raises ValueError: Если не найдены обязательные столбцы.
+    """
+    return SessionTableLayout(header_line)
+
+
+def get_session_type(session_name: str) -> str:
+    """
+    Определяет тип сессии по имени.
+
+    :param session_name: Имя сессии.
+    :return: Тип сессии: "RDP", "Локальный" или "Удалённый".
+    """
+    session_name = session_name.lower()
+    if 'rdp' in session_name or 'терминальная служба' in session_name:
+        return "RDP"
+    if 'console' in session_name or 'консоль' in session_name:
+        return "Локальный"
+    return "Удалённый"
+
+
+def parse_sessions(output: str, command: str) -> List[Dict[str, str]]:
+    """
+    Парсит вывод команды quser (локальная машина) или qwinsta (удалённый хост).
+
+    :param output: Вывод команды.
+    :param command: Команда: "quser" или "qwinsta".
+    :return: Список сессий: {"user", "logon_type", "status", "logon_time"}.
+    :raises ValueError: Если формат вывода не соответствует ожиданиям.
+    """
+    lines: List[str] = [line.rstrip() for line in output.splitlines() if line.strip()]
+    if not lines:
+        return []
+    try:
+        layout = get_layout(lines[0])
+    except ValueError as e:
+        raise ValueError(f"Неизвестный формат вывода {command}: {e}")
+
+    # В qwinsta у сессий без пользователя в столбец пользователя может попасть ID
+    skip_numeric = command == "qwinsta"
+    user_slice, session_slice, state_slice, logon_slice = (
+        layout.user, layout.session, layout.state, layout.logon_time
+    )
+    sessions: List[Dict[str, str]] = []
+    for line in lines[1:]:
+        username = line[user_slice].strip().lstrip('>')
+        if username in EXCLUDED_USERNAMES or (skip_numeric and username.isdigit()):
+            continue
+        sessions.append({
+            "user": username,
+            "logon_type": get_session_type(line[session_slice].strip().lstrip('>')),
+            "status": line[state_slice].strip(),
+            "logon_time": line[logon_slice].strip() if logon_slice else '',
+        })
+    return sessions
@@ -1,63 +1,69 @@
 import logging
 import json
-from typing import Optional, Dict, Any
+from typing import Dict, Any
 from pypsrp.powershell import PowerShell, RunspacePool
-from pypsrp.wsman import WSMan
+from database import db_manager
+from windows_gui.winrm_pool import WinRMSessionPool
 
 logger = logging.getLogger(__name__)
 
+# Ключи неизменяемых данных хоста, сохраняемых в кэше БД
+STATIC_KEYS = ("CPU_Model", "Cores", "Motherboard", "MAC_Address")
 
-class SystemInfo:
-    def __init__(self, hostname: str) -> None:
-        self.hostname = hostname
-
-    def _init_ps_session(self) -> Optional[RunspacePool]:
-        """
-        Инициализирует сессию PowerShell через WinRM.
-
-        :return: Экземпляр RunspacePool при успешном подключении или None при ошибке.
-        """
-        try:
-            wsman = WSMan(
-                server=self.hostname,
-                auth="negotiate",
-                ssl=False,
-                encryption="auto",
-                cert_validation=False,
-                connection_timeout=15
-            )
-            pool = RunspacePool(wsman)
-            pool.open()
-            return pool
-        except Exception as e:
-            logger.error(f"Ошибка подключения к {self.hostname}: {e}")
-            return None
-
-    def get_system_info(self) -> Dict[str, Any]:
-        """
-        Получает системную информацию с удалённого компьютера через PowerShell.
-
-        :return: Словарь с данными системы или с ключом "error" в случае ошибки.
-        """
-        session = self._init_ps_session()
-        if not session:
-            return {"error": "WinRM connection failed"}
-
-        ps_script = r"""
+# Шаблон скрипта: #STATIC# и #DYNAMIC# заменяются соответствующими частями.
+# Время загрузки (BootTime) возвращается всегда — по нему проверяется актуальность кэша.
+PS_SCRIPT_TEMPLATE = r"""
 $ErrorActionPreference = "Stop"
 try {
+    $result = @{}
+    $os = Get-CimInstance Win32_OperatingSystem
+    $result.BootTime = ([DateTimeOffset]$os.LastBootUpTime).ToUnixTimeSeconds()
+#STATIC#
+#DYNAMIC#
+    [PSCustomObject]$result | ConvertTo-Json -Depth 3 -Compress
+}
+catch {
+    [PSCustomObject]@{
+        Error   = $_.Exception.Message
+        Details = $_.ScriptStackTrace
+    } | ConvertTo-Json -Compress
+}
+"""
+
+PS_STATIC_PART = r"""
     # Информация о процессоре
     $cpu = Get-CimInstance Win32_Processor | Select-Object -First 1
-    $cpu_model = $cpu.Name
-    $cpu_load = if ($cpu.LoadPercentage) { $cpu.LoadPercentage } else { $null }
+    $result.CPU_Model = $cpu.Name
+    $result.Cores = $cpu.NumberOfLogicalProcessors
+
+    # Информация о материнской плате
+    $result.Motherboard = Get-CimInstance Win32_BaseBoard | Select-Object -ExpandProperty Product
+
+    # MAC-адреса
+    $macs = Get-CimInstance Win32_NetworkAdapterConfiguration |
+            Where-Object { $_.IPEnabled -eq $true } |
+            Select-Object -ExpandProperty MACAddress
+    $result.MAC_Address = ($macs -join ", ")
+"""
+
+PS_DYNAMIC_PART = r"""
+    # Загрузка процессора
+    $cpu_load = (Get-CimInstance Win32_Processor -Property LoadPercentage |
+                 Measure-Object -Property LoadPercentage -Average).Average
+    $result.CPU_Load = if ($cpu_load -ne $null) { [math]::Round($cpu_load) } else { $null }
 
     # Информация о памяти
-    $os = Get-CimInstance Win32_OperatingSystem
     $ram_total = if ($os.TotalVisibleMemorySize) { [math]::Round($os.TotalVisibleMemorySize/1MB, 2) } else { 0 }
     $ram_free = if ($os.FreePhysicalMemory) { [math]::Round($os.FreePhysicalMemory/1MB, 2) } else { 0 }
+    $result.RAM = @{
+        TotalGB     = $ram_total
+        FreeGB      = $ram_free
+        UsedGB      = [math]::Round($ram_total - $ram_free, 2)
+        UsedPercent = if ($ram_total -gt 0) { [math]::Round(($ram_total - $ram_free)/$ram_total*100, 2) } else { 0 }
+    }
 
     # Информация о дисках
-    $disks = Get-CimInstance Win32_LogicalDisk -Filter "DriveType=3" | ForEach-Object {
+    $result.Disks = Get-CimInstance Win32_LogicalDisk -Filter "DriveType=3" | ForEach-Object {
         $total = if ($_.Size) { [math]::Round($_.Size/1GB, 2) } else { 0 }
         $free = if ($_.FreeSpace) { [math]::Round($_.FreeSpace/1GB, 2) } else { 0 }
         [PSCustomObject]@{
@@ -69,46 +75,94 @@ try {
         }
     }
 
-    # Информация о материнской плате
-    $motherboard = Get-CimInstance Win32_BaseBoard | Select-Object -ExpandProperty Product
-
     # Время работы системы
-    $uptime_raw = (Get-CimInstance Win32_OperatingSystem).LastBootUpTime
-    $uptime_span = (Get-Date) - $uptime_raw
-    $uptime = "{0} д. {1} ч. {2} мин." -f $uptime_span.Days, $uptime_span.Hours, $uptime_span.Minutes
+    $uptime_span = (Get-Date) - $os.LastBootUpTime
+    $result.Uptime = "{0} д. {1} ч. {2} мин." -f $uptime_span.Days, $uptime_span.Hours, $uptime_span.Minutes
+"""
 
-    # MAC-адреса
-    $macs = Get-CimInstance Win32_NetworkAdapterConfiguration |
-            Where-Object { $_.IPEnabled -eq $true } |
-            Select-Object -ExpandProperty MACAddress
-    $mac = ($macs -join ", ")
 
-    # Подготовка результата
-    [PSCustomObject]@{
-        CPU = @{
-            Model = $cpu_model
-            Load  = $cpu_load
-            Cores = $cpu.NumberOfLogicalProcessors
-        }
-        RAM = @{
-            TotalGB     = $ram_total
-            FreeGB      = $ram_free
-            UsedGB      = [math]::Round($ram_total - $ram_free, 2)
-            UsedPercent = if ($ram_total -gt 0) { [math]::Round(($ram_total - $ram_free)/$ram_total*100, 2) } else { 0 }
+class SystemInfo:
+    def __init__(self, hostname: str) -> None:
+        self.hostname = hostname
+
+    def get_system_info(self) -> Dict[str, Any]:
+        """
+        Получает системную информацию с удалённого компьютера через PowerShell.
+        Неизменяемые данные (модель CPU, ядра, материнская плата, MAC-адрес) берутся
+        из кэша БД; при их отсутствии или после перезагрузки хоста запрашиваются заново.
+
+        :return: Словарь с данными системы или с ключом "error" в случае ошибки.
+        """
+        try:
+            with WinRMSessionPool.get_pool().runspace(self.hostname) as session:
+                return self._collect(session)
+        except Exception as e:
+            logger.error(f"Ошибка получения данных с {self.hostname} через WinRM: {e}")
+            return {"error": str(e)}
+
+    def _collect(self, session: RunspacePool) -> Dict[str, Any]:
+        """
+        Выполняет сбор данных в открытой сессии.
+
+        :param session: Открытый RunspacePool.
+        :return: Словарь с данными системы или с ключом "error".
+        """
+        facts = db_manager.get_host_facts(self.hostname)
+        data = self._run_script(session, self.build_script(static=facts is None))
+        if "error" in data:
+            return data
+
+        boot_time = data.get("BootTime")
+        if facts is None:
+            facts = self._extract_facts(data)
+            db_manager.save_host_facts(self.hostname, facts, boot_time)
+        elif db_manager.get_host_facts(self.hostname, boot_time) is None:
+            logger.info(f"🔄 Хост {self.hostname} был перезагружен, обновляем аппаратные данные")
+            static_data = self._run_script(session, self.build_script(static=True, dynamic=False))
+            if "error" in static_data:
+                return static_data
+            facts = self._extract_facts(static_data)
+            db_manager.save_host_facts(self.hostname, facts, boot_time)
+
+        return {
+            "CPU": {
+                "Model": facts.get("CPU_Model"),
+                "Load": data.get("CPU_Load"),
+                "Cores": facts.get("Cores"),
+            },
+            "RAM": data.get("RAM"),
+            "Disks": data.get("Disks"),
+            "Motherboard": facts.get("Motherboard"),
+            "Uptime": data.get("Uptime"),
+            "MAC_Address": facts.get("MAC_Address"),
         }
-        Disks       = $disks
-        Motherboard = $motherboard
-        Uptime      = $uptime
-        MAC_Address = $mac
-    } | ConvertTo-Json -Depth 3 -Compress
-}
-catch {
-    [PSCustomObject]@{
-        Error   = $_.Exception.Message
-        Details = $_.ScriptStackTrace
-    } | ConvertTo-Json -Compress
-}
-"""
+
+    @staticmethod
+    def build_script(static: bool = True, dynamic: bool = True) -> str:
+        """
+        Формирует PowerShell-скрипт сбора данных.
+
+        :param static: Включать запрос неизменяемых данных (Win32_Processor, Win32_BaseBoard, MAC).
+        :param dynamic: Включать запрос нагрузки CPU, памяти, дисков и uptime.
+        :return: Текст скрипта.
+        """
+        return (PS_SCRIPT_TEMPLATE
+                .replace("#STATIC#", PS_STATIC_PART if static else "")
+                .replace("#DYNAMIC#", PS_DYNAMIC_PART if dynamic else ""))
+
+    @staticmethod
+    def _extract_facts(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Выбирает из результата скрипта неизменяемые данные хоста."""
+        return {key: data.get(key) for key in STATIC_KEYS}
+
+    def _run_script(self, session: RunspacePool, ps_script: str) -> Dict[str, Any]:
+        """
+        Выполняет скрипт в открытой сессии и разбирает JSON-результат.
+
+        :param session: Открытый RunspacePool.
+        :param ps_script: Текст PowerShell-скрипта.
+        :return: Словарь с результатом или с ключом "error" в случае ошибки.
+        """
         json_str = ""
         try:
             ps = PowerShell(session)
@@ -131,13 +185,3 @@ catch {
             error_msg = f"Ошибка разбора JSON: {e}. Сырой вывод: {json_str}"
             logger.error(error_msg)
             return {"error": error_msg}
-
-        except Exception as e:
-            logger.error(f"Ошибка выполнения PowerShell-скрипта: {e}")
-            return {"error": str(e)}
-
-        finally:
-            try:
-                session.close()
-            except Exception as e:
-                logger.warning(f"Ошибка закрытия сессии: {e}")
@@ -0,0 +1,247 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from pypsrp.complex_objects import RunspacePoolState
+from pypsrp.powershell import PowerShell, RunspacePool
+from pypsrp.wsman import WSMan
+
+logger = logging.getLogger(__name__)
+
+
+class WinRMSession:
+    """
+    Открытый RunspacePool для одного Windows-хоста.
+    Доступ к пулу сериализуется блокировкой: блоки вкладки выполняют
+    скрипты по очереди в одном и том же runspace.
+    """
+
+    def __init__(self, hostname: str) -> None:
+        self.hostname: str = hostname
+        self.runspace: Optional[RunspacePool] = None
+        self.refs: int = 0
+        self.last_used: float = time.monotonic()
+        self.lock = threading.RLock()
+
+    def is_open(self) -> bool:
+        """Проверяет, что RunspacePool открыт."""
+        return self.runspace is not None and self.runspace.state == RunspacePoolState.OPENED
+
+    def open(self) -> RunspacePool:
+        """
+        Открывает RunspacePool, если он ещё не открыт или был закрыт сервером.
+
+        :return: Открытый RunspacePool.
+        :raises Exception: При ошибке подключения.
+        """
+        with self.lock:
+            self.last_used = time.monotonic()
+            if self.is_open():
+                return self.runspace
+            self.close()
+            logger.info(f"Открываем WinRM-сессию с {self.hostname}")
+            wsman = WSMan(
+                server=self.hostname,
+                auth="negotiate",
+                ssl=False,
+                encryption="auto",
+                cert_validation=False,
+                connection_timeout=15
+            )
+            runspace = RunspacePool(wsman)
+            runspace.open()
+            self.runspace = runspace
+            return runspace
+
+    def ping(self) -> bool:
+        """
+        Выполняет пустой скрипт, чтобы сервер не закрыл сессию по простою.
+
+        :return: True, если сессия отвечает.
+        """
+        with self.lock:
+            if not self.is_open():
+                return False
+            try:
+                ps = PowerShell(self.runspace)
+                ps.add_script("$null")
+                ps.invoke()
+                return True
+            except Exception as e:
+                logger.debug(f"WinRM-сессия с {self.hostname} не отвечает: {e}")
+                self.close()
+                return False
+
+    def close(self) -> None:
+        """Закрывает RunspacePool без участия пула."""
+        with self.lock:
+            if self.runspace is not None:
+                try:
+                    self.runspace.close()
+                except Exception as e:
+                    logger.debug(f"Ошибка закрытия WinRM-сессии {self.hostname}: {e}")
+            self.runspace = None
+
+
+class WinRMSessionPool:
+    """
+    Пул WinRM-сессий (RunspacePool), общий для всех Windows-вкладок.
+
+    Вместо нового WSMan-подключения и согласования аутентификации на каждое
+    обновление данных используется одна открытая сессия на хост.
+    Вкладка удерживает сессию через acquire()/release(); сессии без ссылок
+    закрываются после простоя, открытые сессии периодически «пингуются».
+    """
+
+    IDLE_TIMEOUT: float = 10 * 60  # 600 секунд
+    KEEPALIVE_INTERVAL: float = 60
+
+    _pool: Optional["WinRMSessionPool"] = None
+    _pool_lock = threading.Lock()
+
+    def __init__(self, idle_timeout: float = IDLE_TIMEOUT,
+                 keepalive_interval: float = KEEPALIVE_INTERVAL) -> None:
+        self.idle_timeout: float = idle_timeout
+        self.keepalive_interval: float = keepalive_interval
+        self._sessions: Dict[str, WinRMSession] = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._maintenance_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def get_pool(cls) -> "WinRMSessionPool":
+        """Возвращает общий для приложения пул WinRM-сессий."""
+        with cls._pool_lock:
+            if cls._pool is None:
+                cls._pool = cls()
+                cls._pool._start_maintenance()
+            return cls._pool
+
+    def get_session(self, hostname: str) -> WinRMSession:
+        """
+        Возвращает сессию хоста без изменения счётчика ссылок (подключение ленивое).
+
+        :param hostname: Имя или IP-адрес хоста.
+        :return: Экземпляр WinRMSession.
+        """
+        with self._lock:
+            session = self._sessions.get(hostname)
+            if session is None:
+                session = WinRMSession(hostname)
+                self._sessions[hostname] = session
+            session.last_used = time.monotonic()
+            return session
+
+    def acquire(self, hostname: str) -> WinRMSession:
+        """
+        Возвращает сессию хоста и увеличивает счётчик ссылок.
+        Каждому вызову acquire() должен соответствовать вызов release().
+        """
+        with self._lock:
+            session = self.get_session(hostname)
+            session.refs += 1
+            return session
+
+    def release(self, hostname: str) -> None:
+        """
+        Уменьшает счётчик ссылок. Сессия остаётся открытой до истечения idle_timeout.
+        """
+        with self._lock:
+            session = self._sessions.get(hostname)
+            if session is None:
+                return
+            session.refs = max(0, session.refs - 1)
+            session.last_used = time.monotonic()
+
+    @contextmanager
+    def runspace(self, hostname: str) -> Iterator[RunspacePool]:
+        """
+        Выдаёт открытый RunspacePool хоста на время выполнения скриптов.
+        При ошибке внутри блока сессия закрывается и будет переоткрыта
+        при следующем обращении.
+
+        :param hostname: Имя или IP-адрес хоста.
+        :raises Exception: Если подключиться к хосту не удалось.
+        """
+        session = self.get_session(hostname)
+        with session.lock:
+            runspace = session.open()
+            try:
+                yield runspace
+            except Exception:
+                logger.warning(f"Ошибка в WinRM-сессии с {hostname}, сессия будет переоткрыта")
+                session.close()
+                raise
+            finally:
+                session.last_used = time.monotonic()
+
+    @contextmanager
+    def dedicated_runspace(self, hostname: str) -> Iterator[RunspacePool]:
+        """
+        Открывает отдельный RunspacePool хоста для долгого выполнения (например,
+        скрипта библиотеки) и закрывает его по выходе из блока. Общая сессия хоста
+        при этом не блокируется: блоки вкладки продолжают обновляться.
+
+        :param hostname: Имя или IP-адрес хоста.
+        :raises Exception: Если подключиться к хосту не удалось.
+        """
+        session = WinRMSession(hostname)
+        try:
+            yield session.open()
+        finally:
+            session.close()
+
+    def keep_alive(self) -> None:
+        """Пингует открытые сессии, которые сейчас не заняты выполнением скриптов."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            if session.is_open() and session.lock.acquire(blocking=False):
+                try:
+                    session.ping()
+                finally:
+                    session.lock.release()
+
+    def evict_idle(self) -> List[str]:
+        """
+        Закрывает сессии без ссылок, простаивающие дольше idle_timeout.
+
+        :return: Список хостов, чьи сессии были закрыты.
+        """
+        now = time.monotonic()
+        evicted: List[WinRMSession] = []
+        with self._lock:
+            for hostname, session in list(self._sessions.items()):
+                if session.refs > 0 or now - session.last_used <= self.idle_timeout:
+                    continue
+                logger.info(f"Закрываем простаивающую WinRM-сессию с {hostname}")
+                evicted.append(self._sessions.pop(hostname))
+        # Закрываем вне блокировки пула: закрытие ждёт завершения выполняемых скриптов
+        for session in evicted:
+            session.close()
+        return [session.hostname for session in evicted]
+
+    def close_all(self) -> None:
+        """Закрывает все сессии пула (например, при выходе из приложения)."""
+        self._stop.set()
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def _start_maintenance(self) -> None:
+        """Запускает фоновый поток keep-alive и закрытия простаивающих сессий."""
+        self._maintenance_thread = threading.Thread(
+            target=self._maintenance_loop, name="WinRMSessionPool", daemon=True
+        )
+        self._maintenance_thread.start()
+
+    def _maintenance_loop(self) -> None:
+        while not self._stop.wait(self.keepalive_interval):
+            try:
+                self.evict_idle()
+                self.keep_alive()
+            except Exception as e:
+                logger.error(f"Ошибка обслуживания пула WinRM-сессий: {e}")